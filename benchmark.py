@@ -0,0 +1,245 @@
+import argparse
+import difflib
+import functools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+# ─── Make both modules importable, as the resident host does ──────────────────
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+for module_dir in ("easyocr_module", "point_object_module"):
+    sys.path.insert(0, os.path.join(ROOT_DIR, module_dir))
+
+from common.frame_source import open_source
+from common.model_host import get_model_host
+from common.metrics import get_metrics
+from common.inference import inference_config
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+# ─── Measurement helpers ──────────────────────────────────────────────────────
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        try:
+            import psutil
+            return psutil.Process().memory_info().peak_wset / 2**20
+        except (ImportError, AttributeError):
+            return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10  # bytes vs KiB
+
+def summarize(samples):
+    """Latency percentiles (ms) and throughput for one stage."""
+    if not samples:
+        return {"frames": 0}
+    ms = np.asarray(samples) * 1000.0
+    stats = {"frames": len(samples), "mean_ms": float(ms.mean()), "max_ms": float(ms.max()),
+             "fps": float(len(samples) / (ms.sum() / 1000.0)) if ms.sum() else None}
+    for p, v in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+        stats[f"p{p}_ms"] = float(v)
+    return stats
+
+def time_stage(fn, frames, warmup):
+    """Run ``fn`` on each frame; the first ``warmup`` calls are not recorded."""
+    samples = []
+    for i, frame in enumerate(frames):
+        start = time.perf_counter()
+        fn(frame)
+        if i >= warmup:
+            samples.append(time.perf_counter() - start)
+    return samples
+
+def time_batches(fn, frames, batch, warmup):
+    """Like time_stage for a batched call; samples are per-frame latency."""
+    samples = []
+    for i in range(0, len(frames), batch):
+        chunk = frames[i:i + batch]
+        start = time.perf_counter()
+        fn(chunk)
+        if i >= warmup:
+            samples.extend([(time.perf_counter() - start) / len(chunk)] * len(chunk))
+    return samples
+
+def load_frames(spec, count):
+    source = open_source(spec, loop=True)
+    if not source.isOpened():
+        raise SystemExit(f"Cannot open frame source {spec!r}")
+    frames = []
+    for frame in source:
+        frames.append(frame)
+        if len(frames) >= count:
+            break
+    source.release()
+    if not frames:
+        raise SystemExit(f"Frame source {spec!r} produced no frames")
+    return frames
+
+
+# ─── Pipelines ────────────────────────────────────────────────────────────────
+def bench_pointer(frames, warmup, batch):
+    from scripts.integration import ObjectPointer
+
+    pointer = ObjectPointer()
+    hand, detector = pointer.hand_tracker, pointer.object_detector
+    # First calls load the models; ModelHost records how long that took
+    hand.is_pointing(frames[0])
+    detector.detect_objects(frames[0])
+
+    return {
+        "hand_tracking": summarize(time_stage(hand.is_pointing, frames, warmup)),
+        "detection":     summarize(time_stage(detector.detect_objects, frames, warmup)),
+        "detection_batch": summarize(time_batches(detector.detect_objects_batch, frames, batch, warmup)),
+        "pointer_total": summarize(time_stage(pointer.find_pointed_object, frames, warmup)),
+    }
+
+def bench_ocr(frames, warmup, batch):
+    from ocr import extract_text
+
+    extract_text(frames[0])  # loads the reader
+    stats = summarize(time_stage(extract_text, frames, warmup))
+    if stats.get("fps"):
+        stats["pages_per_minute"] = stats["fps"] * 60
+    return {"ocr": stats}
+
+def parse_backends(spec):
+    """"torch,onnx-int8,openvino" -> inference configs, in order."""
+    configs = []
+    for name in spec.split(","):
+        backend, _, quant = name.strip().partition("-")
+        configs.append((name.strip(), inference_config(backend, int8=(quant == "int8") or None)))
+    return configs
+
+def match_detections(reference, candidate, iou=0.5):
+    """Share of reference boxes found again (same label, IoU >= ``iou``) and their mean IoU."""
+    from scripts.object_detection import box_iou
+
+    if not len(reference):
+        return None, None
+    if not len(candidate):
+        return 0.0, 0.0
+    overlap = box_iou(reference['bbox'], candidate['bbox'])
+    overlap[reference['label'][:, None] != candidate['label'][None, :]] = 0.0
+    best = overlap.max(axis=1)
+    found = best >= iou
+    return float(found.mean()), float(best[found].mean()) if found.any() else 0.0
+
+def bench_backends(frames, warmup, batch, configs=()):
+    """Detector and OCR recognizer on each backend: latency, and agreement with the first."""
+    from scripts.object_detection import ObjectDetector
+    from ocr import extract_lines
+    from ocr_runtime import load_reader
+
+    results = {}
+    reference = {}
+    for name, config in configs:
+        try:
+            detector = ObjectDetector(inference=config)
+            detector.detect_objects(frames[0])  # load (and export on first use)
+        except (ImportError, RuntimeError) as e:
+            results[f"detector:{name}"] = {"frames": 0, "error": str(e)}
+            continue
+        outputs = []
+        stats = summarize(time_stage(lambda f: outputs.append(detector.detect_objects(f)), frames, warmup))
+        reference.setdefault("detector", outputs)
+        pairs = [match_detections(r, c) for r, c in zip(reference["detector"], outputs)]
+        recall = [p[0] for p in pairs if p[0] is not None]
+        ious = [p[1] for p in pairs if p[1]]
+        stats["recall_vs_reference"] = float(np.mean(recall)) if recall else None
+        stats["mean_iou_vs_reference"] = float(np.mean(ious)) if ious else None
+        results[f"detector:{name}"] = stats
+
+    ocr_frames = frames[:max(warmup + 1, len(frames) // 10)]  # OCR is slow; a sample suffices
+    for name, config in configs:
+        try:
+            start = time.perf_counter()
+            reader = load_reader(config)
+            load_s = time.perf_counter() - start
+        except (ImportError, RuntimeError) as e:
+            results[f"ocr:{name}"] = {"frames": 0, "error": str(e)}
+            continue
+        texts = []
+        read = lambda f: texts.append(" ".join(line["text"] for line in extract_lines(f, reader=reader)))
+        stats = summarize(time_stage(read, ocr_frames, warmup))
+        reference.setdefault("ocr", texts)
+        agreement = [difflib.SequenceMatcher(None, r, t).ratio()
+                     for r, t in zip(reference["ocr"], texts) if r or t]
+        stats["text_agreement_vs_reference"] = float(np.mean(agreement)) if agreement else None
+        stats["load_s"] = load_s
+        results[f"ocr:{name}"] = stats
+    return results
+
+PIPELINES = {"pointer": bench_pointer, "ocr": bench_ocr, "backends": bench_backends}
+
+
+# ─── Reporting ────────────────────────────────────────────────────────────────
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(report, baseline):
+    """Print p50/p95 deltas against an earlier report."""
+    for pipeline, stages in report["results"].items():
+        for stage, stats in stages.items():
+            old = baseline.get("results", {}).get(pipeline, {}).get(stage) or {}
+            if not old.get("frames") or not stats.get("frames"):
+                continue  # skipped or failed (e.g. a backend not installed) on one side
+            for key in ("p50_ms", "p95_ms"):
+                if old.get(key) is None or stats.get(key) is None:
+                    continue
+                delta = (stats[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+                print(f"  {pipeline}.{stage}.{key}: {old[key]:.1f} -> {stats[key]:.1f} ({delta:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay frames through the pipelines and time them.")
+    parser.add_argument("pipelines", nargs="*", default=["pointer", "ocr"], choices=sorted(PIPELINES))
+    parser.add_argument("--source", default="synthetic",
+                        help="video file, image directory, camera index or synthetic[:WxH]")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=4, help="frames per batched inference call")
+    parser.add_argument("--out", default="bench_output.json")
+    parser.add_argument("--compare", default=None, help="earlier report to diff against")
+    parser.add_argument("--backends", default="torch,onnx,onnx-int8,openvino",
+                        help="inference backends for the 'backends' pipeline; the first is the reference")
+    args = parser.parse_args()
+
+    frames = load_frames(args.source, args.frames + args.warmup)
+    pipelines = dict(PIPELINES, backends=functools.partial(bench_backends,
+                                                           configs=parse_backends(args.backends)))
+    results = {name: pipelines[name](frames, args.warmup, args.batch) for name in args.pipelines}
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "source": str(args.source),
+        "frame_shape": list(frames[0].shape),
+        "results": results,
+        "model_load_s": get_model_host().load_times(),
+        "metrics": get_metrics().snapshot(),  # sub-stage timers (inference, NMS, ...)
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["results"], indent=2))
+    print(f"[Bench] Wrote {args.out}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Phrases the controller acts on; an offline recognizer decodes only these
+COMMAND_PHRASES = [
+    "start reader", "read text", "start read", "chart reader",
+    "capture",
+    "stop reader", "stop ocr",
+    "start pointer", "start object",
+    "stop pointer", "stop object",
+    "stop all", "stop",
+    "pause", "resume", "next sentence", "repeat", "read next page",
+    "exit", "quit",
+]
+PAGE_PREFIXES = ["read page"]  # followed by a page number
+TRANSLATE_PREFIXES = ["translate page"]  # followed by a page number, "to" and a language
+SEARCH_PREFIXES = ["find"]     # followed by free text; needs an open-vocabulary recognizer
+MAX_PAGE      = 200
+
+# Spoken language names and their translator codes (the same in Google and Argos)
+LANGUAGES = {"spanish": "es", "french": "fr", "german": "de", "italian": "it",
+             "portuguese": "pt", "hindi": "hi"}
+
+_UNITS = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+          "ten", "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen",
+          "seventeen", "eighteen", "nineteen"]
+_TENS  = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+_VALUES = {w: i for i, w in enumerate(_UNITS)}
+_VALUES.update({w: 10 * i for i, w in enumerate(_TENS) if w})
+
+
+def number_words(n):
+    """Spoken form of 0 <= n < 1000, e.g. 121 -> 'one hundred twenty one'."""
+    if n < 20:
+        return _UNITS[n]
+    if n < 100:
+        tens, units = divmod(n, 10)
+        return _TENS[tens] + (f" {_UNITS[units]}" if units else "")
+    hundreds, rest = divmod(n, 100)
+    return f"{_UNITS[hundreds]} hundred" + (f" {number_words(rest)}" if rest else "")
+
+
+def grammar_phrases(max_page=MAX_PAGE):
+    """Every phrase the command grammar accepts, numbers spelled out."""
+    phrases = list(COMMAND_PHRASES)
+    for prefix in PAGE_PREFIXES:
+        phrases += [f"{prefix} {number_words(n)}" for n in range(1, max_page + 1)]
+    for prefix in TRANSLATE_PREFIXES:
+        phrases += [f"{prefix} {number_words(n)} to {language}"
+                    for n in range(1, max_page + 1) for language in LANGUAGES]
+    return phrases + SEARCH_PREFIXES
+
+
+def normalize_command(text):
+    """Lower-case and turn spelled-out numbers into digits ('page twenty one' -> 'page 21')."""
+    out, current, in_number = [], 0, False
+    for word in text.lower().split():
+        if word in _VALUES:
+            current += _VALUES[word]
+            in_number = True
+        elif word == "hundred" and in_number:
+            current = max(current, 1) * 100
+        else:
+            if in_number:
+                out.append(str(current))
+                current, in_number = 0, False
+            out.append(word)
+    if in_number:
+        out.append(str(current))
+    return " ".join(out)
+
+
+class CommandGrammar:
+    """The accepted phrases plus a fast "is this a finished command" check.
+
+    ``is_complete`` is what lets a partial hypothesis dispatch early:
+    "capture" can go at once, "read page twenty" must wait in case "one"
+    follows. A bare search prefix is never complete.
+    """
+
+    def __init__(self, phrases=None):
+        self.phrases = phrases or grammar_phrases()
+        self._accepted = set(self.phrases)
+        self._extendable = set()
+        for phrase in self.phrases:
+            words = phrase.split()
+            for i in range(1, len(words)):
+                self._extendable.add(" ".join(words[:i]))
+        self._extendable.update(SEARCH_PREFIXES)
+
+    def is_complete(self, text):
+        text = " ".join(text.lower().split())
+        return text in self._accepted and text not in self._extendable
+
+    def is_open(self, text):
+        """A search prefix with its free-text argument missing (e.g. decoded as [unk])."""
+        return " ".join(text.lower().split()) in SEARCH_PREFIXES
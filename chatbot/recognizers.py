@@ -0,0 +1,150 @@
+import abc
+import json
+import os
+
+import speech_recognition as sr
+
+from chatbot.grammar import CommandGrammar, normalize_command
+
+BACKEND_ENV     = "SONIC_VISION_ASR"          # "auto", "vosk" or "google"
+VOSK_MODEL_ENV  = "SONIC_VISION_VOSK_MODEL"
+FALLBACK_ENV    = "SONIC_VISION_ASR_FALLBACK"  # "1" to try the cloud when offline decoding fails
+DEFAULT_VOSK_MODEL = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                  "models", "vosk-model-small-en-us-0.15")
+
+
+class RecognitionUnavailable(Exception):
+    """The backend could not run (no network, no model); not a heard command."""
+
+
+class Recognizer(abc.ABC):
+    """One utterance at a time: ``start``, feed ``accept`` chunks, then ``finish``.
+
+    Streaming backends return partial hypotheses from ``accept``; others
+    return None and only decode in ``finish``.
+    """
+
+    streaming = False
+
+    def start(self, sample_rate, sample_width):
+        self.sample_rate  = sample_rate
+        self.sample_width = sample_width
+        self._chunks = []
+
+    def accept(self, chunk):
+        self._chunks.append(chunk)
+        return None
+
+    @abc.abstractmethod
+    def finish(self):
+        """Decode the utterance; the command text, or "" if nothing was understood."""
+
+    def audio(self):
+        return sr.AudioData(b"".join(self._chunks), self.sample_rate, self.sample_width)
+
+
+class GoogleRecognizer(Recognizer):
+    """Cloud fallback: Google Web Speech over the network, full utterance only."""
+
+    def __init__(self, language="en-US"):
+        self.language = language
+        self._recognizer = sr.Recognizer()
+
+    def finish(self):
+        try:
+            return normalize_command(self._recognizer.recognize_google(self.audio(), language=self.language))
+        except sr.UnknownValueError:
+            return ""
+        except sr.RequestError as e:
+            raise RecognitionUnavailable(f"Google Speech Recognition unavailable: {e}") from e
+
+
+class VoskCommandRecognizer(Recognizer):
+    """On-device Kaldi decoding restricted to the controller's command grammar."""
+
+    streaming = True
+
+    def __init__(self, model_path=DEFAULT_VOSK_MODEL, grammar=None):
+        try:
+            import vosk
+        except ImportError as e:
+            raise RecognitionUnavailable("vosk is not installed") from e
+        if not os.path.isdir(model_path):
+            raise RecognitionUnavailable(f"Vosk model not found at {model_path}")
+        vosk.SetLogLevel(-1)
+        self._vosk    = vosk
+        self._model   = vosk.Model(model_path)
+        self.grammar  = grammar or CommandGrammar()
+        self._grammar_json = json.dumps(self.grammar.phrases + ["[unk]"])
+        self._rec     = None
+
+    def start(self, sample_rate, sample_width):
+        super().start(sample_rate, sample_width)
+        if self._rec is None or self._rec_rate != sample_rate:
+            self._rec = self._vosk.KaldiRecognizer(self._model, sample_rate, self._grammar_json)
+            self._rec_rate = sample_rate
+        else:
+            self._rec.Reset()
+        self._final = []
+
+    def accept(self, chunk):
+        super().accept(chunk)
+        if self._rec.AcceptWaveform(chunk):
+            text = self._clean(json.loads(self._rec.Result()).get("text", ""))
+            if text:
+                self._final.append(text)
+            return " ".join(self._final)
+        partial = self._clean(json.loads(self._rec.PartialResult()).get("partial", ""))
+        return " ".join(self._final + ([partial] if partial else []))
+
+    def finish(self):
+        text = self._clean(json.loads(self._rec.FinalResult()).get("text", ""))
+        if text:
+            self._final.append(text)
+        return normalize_command(" ".join(self._final))
+
+    @staticmethod
+    def _clean(text):
+        return " ".join(w for w in text.split() if w != "[unk]")
+
+
+class FallbackRecognizer(Recognizer):
+    """Offline first; the utterance goes to the cloud only if it decoded to
+    nothing, or to a search prefix whose free-text word the grammar cannot hold."""
+
+    def __init__(self, primary, fallback):
+        self.primary   = primary
+        self.fallback  = fallback
+        self.streaming = primary.streaming
+        self.grammar   = getattr(primary, "grammar", None)
+
+    def start(self, sample_rate, sample_width):
+        self.primary.start(sample_rate, sample_width)
+        self.fallback.start(sample_rate, sample_width)
+
+    def accept(self, chunk):
+        self.fallback.accept(chunk)
+        return self.primary.accept(chunk)
+
+    def finish(self):
+        text = self.primary.finish()
+        if text and not (self.grammar and self.grammar.is_open(text)):
+            return text
+        return self.fallback.finish() or text
+
+
+def create_recognizer(backend=None):
+    """Build the configured backend; "auto" prefers offline Vosk when its model exists."""
+    backend = backend or os.environ.get(BACKEND_ENV, "auto")
+    if backend == "google":
+        return GoogleRecognizer()
+    try:
+        offline = VoskCommandRecognizer(os.environ.get(VOSK_MODEL_ENV, DEFAULT_VOSK_MODEL))
+    except RecognitionUnavailable as e:
+        if backend == "vosk":
+            raise
+        print(f"[ASR] {e}; using Google Speech Recognition.")
+        return GoogleRecognizer()
+    if os.environ.get(FALLBACK_ENV) == "1":
+        return FallbackRecognizer(offline, GoogleRecognizer())
+    return offline
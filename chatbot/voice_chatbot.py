@@ -1,37 +1,245 @@
+import collections
+import queue
+import threading
+import time
+
+import numpy as np
 import speech_recognition as sr
 
-def listen_command(device_index=2, timeout=5, phrase_limit=5):
-    recognizer = sr.Recognizer()
+from chatbot.recognizers import create_recognizer, RecognitionUnavailable
+from common.metrics import get_metrics
 
-    try:
-        with sr.Microphone(device_index=device_index) as source:
-            recognizer.adjust_for_ambient_noise(source, duration=1)
+FRAME_SECONDS   = 0.03  # capture chunk
+PREROLL_SECONDS = 0.3   # audio kept from before speech onset
+HANGOVER        = 0.2   # trailing silence that ends an utterance
+MIN_SPEECH      = 0.15  # shorter bursts are clicks, not words
+START_RATIO     = 3.0   # speech starts this far above the noise floor...
+END_RATIO       = 2.0   # ...and ends when it falls back below this
+FLOOR_ADAPT     = 0.05  # EMA weight for background noise tracking
+FLOOR_QUANTILE  = 20    # percentile of a cut-off segment's levels taken as the new floor
+FLAT_VARIATION  = 0.15  # a segment this steady (std / mean level) is noise, not speech
+
+# Events on MicrophoneStream.events: (kind, payload, monotonic time)
+SPEECH_START  = "start"   # payload: (sample_rate, sample_width)
+SPEECH_AUDIO  = "audio"   # payload: raw chunk
+SPEECH_END    = "end"     # time is that of the last voiced chunk
+SPEECH_CANCEL = "cancel"  # burst too short to be a word
+
+
+class MicrophoneStream:
+    """Always-open microphone with energy-based voice-activity endpointing.
+
+    One thread reads fixed-size chunks for the life of the process, tracks
+    the noise floor on non-speech chunks (re-baselining it from any segment
+    that runs to the phrase limit, so a louder steady background cannot
+    hold the detector in speech), and streams each utterance (with
+    pre-roll) onto ``events`` as it is spoken, so a recognizer can decode
+    while the user is still talking. Nothing is lost between commands
+    because capture never stops for recognition.
+    """
+
+    def __init__(self, device_index=2, phrase_limit=5):
+        self.device_index = device_index
+        self.phrase_limit = phrase_limit
+        self.events       = queue.Queue()
+        self.noise_floor  = None
+        self.error        = None
+        self._ready       = threading.Event()
+        self._running     = True
+        self._metrics     = get_metrics()
+        self._thread      = threading.Thread(target=self._run, name="microphone", daemon=True)
+        self._thread.start()
+
+    def wait_ready(self, timeout=None):
+        return self._ready.wait(timeout)
+
+    def reopen(self):
+        """Open the device again after an error; ``events`` (and its reader) carry on."""
+        if self._thread.is_alive():
+            return
+        self.error = None
+        self._ready.clear()
+        self._thread = threading.Thread(target=self._run, name="microphone", daemon=True)
+        self._thread.start()
 
-            print("🎧 Listening for command...")
-            audio = recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_limit)
+    def close(self):
+        self._running = False
+        self._thread.join(timeout=1)
 
-        # Try recognizing using Google Web Speech API
+    @staticmethod
+    def _rms(chunk):
+        samples = np.frombuffer(chunk, dtype=np.int16).astype(np.float32)
+        return float(np.sqrt(np.mean(samples * samples))) if samples.size else 0.0
+
+    def _calibrate(self, stream, chunk_size, seconds=1.0):
+        # One-time baseline; after this the floor is tracked in the background
+        levels = [self._rms(stream.read(chunk_size)) for _ in range(max(1, int(seconds / FRAME_SECONDS)))]
+        self.noise_floor = max(float(np.median(levels)), 1.0)
+
+    def _emit(self, kind, payload=None, t=None):
+        self.events.put((kind, payload, t if t is not None else time.monotonic()))
+
+    def _run(self):
         try:
-            command = recognizer.recognize_google(audio, language="en-US").lower().strip()
-            print(f"🧠 Heard: {command}")
-            return command
+            mic = sr.Microphone(device_index=self.device_index)
+            with mic as source:
+                chunk_size = int(source.SAMPLE_RATE * FRAME_SECONDS)
+                self._calibrate(source.stream, chunk_size)
+                self._ready.set()
+                self._capture(source, chunk_size)
+        except OSError as mic_error:
+            print(f"🎙️ Microphone error: {mic_error}")
+            self._emit(SPEECH_CANCEL)  # drop an utterance the error cut short
+            self.error = mic_error
+            self._ready.set()
+
+    def _capture(self, source, chunk_size):
+        preroll = collections.deque(maxlen=max(1, int(PREROLL_SECONDS / FRAME_SECONDS)))
+        hangover_chunks = max(1, int(HANGOVER / FRAME_SECONDS))
+        min_chunks = max(1, int(MIN_SPEECH / FRAME_SECONDS))
+        max_chunks = int(self.phrase_limit / FRAME_SECONDS)
+
+        in_speech, length, silent, voiced, last_voiced_at = False, 0, 0, 0, 0.0
+        levels = []
+        while self._running:
+            chunk = source.stream.read(chunk_size)
+            level = self._rms(chunk)
+            now = time.monotonic()
+
+            if not in_speech:
+                if level > self.noise_floor * START_RATIO:
+                    in_speech, length, silent, voiced, last_voiced_at = True, 1, 0, 1, now
+                    levels = [level]
+                    self._emit(SPEECH_START, (source.SAMPLE_RATE, source.SAMPLE_WIDTH), now)
+                    for old in preroll:
+                        self._emit(SPEECH_AUDIO, old, now)
+                    self._emit(SPEECH_AUDIO, chunk, now)
+                    preroll.clear()
+                else:
+                    self.noise_floor += FLOOR_ADAPT * (level - self.noise_floor)
+                    self.noise_floor = max(self.noise_floor, 1.0)
+                    preroll.append(chunk)
+                continue
+
+            self._emit(SPEECH_AUDIO, chunk, now)
+            length += 1
+            levels.append(level)
+            if level > self.noise_floor * END_RATIO:
+                silent, voiced, last_voiced_at = 0, voiced + 1, now
+            else:
+                silent += 1
+
+            if silent >= hangover_chunks or length >= max_chunks:
+                steady = False
+                if length >= max_chunks:
+                    # Never fell silent: the background may have got louder. Take the
+                    # quiet end of the segment as the floor (pauses between words for
+                    # real speech, the new background for noise) so detection recovers.
+                    self.noise_floor = max(float(np.percentile(levels, FLOOR_QUANTILE)), 1.0)
+                    steady = float(np.std(levels)) < FLAT_VARIATION * float(np.mean(levels))
+                    self._metrics.inc("voice.floor_rebaselined")
+                if voiced >= min_chunks and not steady:
+                    self._emit(SPEECH_END, None, last_voiced_at)
+                    self._metrics.observe("voice.endpoint_delay", now - last_voiced_at)
+                else:
+                    self._emit(SPEECH_CANCEL)
+                in_speech = False
+
 
-        except sr.UnknownValueError:
-            print("❓ Didn't catch that. Try again.")
+class CommandListener:
+    """Decodes the microphone's speech events into command strings.
+
+    With a streaming (offline, grammar-constrained) backend a command is
+    queued as soon as a partial hypothesis is a complete command, before
+    the speaker has finished; otherwise it is queued at end of speech.
+    """
+
+    def __init__(self, stream, recognizer):
+        self.stream     = stream
+        self.recognizer = recognizer
+        self.grammar    = getattr(recognizer, "grammar", None)
+        self.commands   = queue.Queue()
+        self._metrics   = get_metrics()
+        self._thread    = threading.Thread(target=self._run, name="asr", daemon=True)
+        self._thread.start()
+
+    def _dispatch(self, text):
+        print(f"🧠 Heard: {text}")
+        self.commands.put(text)
+        return time.monotonic()
+
+    def _run(self):
+        # voice.dispatch_delay runs from the end of speech; negative when dispatched early
+        active, dispatched_at = False, None
+        while True:
+            kind, payload, t = self.stream.events.get()
+
+            if kind == SPEECH_START:
+                self.recognizer.start(*payload)
+                active, dispatched_at = True, None
+
+            elif kind == SPEECH_AUDIO and active and dispatched_at is None:
+                partial = self.recognizer.accept(payload)
+                if partial and self.recognizer.streaming and self.grammar and self.grammar.is_complete(partial):
+                    dispatched_at = self._dispatch(self.recognizer.finish())
+                    self._metrics.inc("voice.early_dispatch")
+
+            elif kind == SPEECH_CANCEL:
+                active = False
+
+            elif kind == SPEECH_END and active:
+                active = False
+                if dispatched_at is not None:
+                    self._metrics.observe("voice.dispatch_delay", dispatched_at - t)
+                    continue
+                try:
+                    text = self.recognizer.finish()
+                except RecognitionUnavailable as e:
+                    print(f"❌ {e}")
+                    continue
+                except Exception as e:
+                    print(f"🚨 Unexpected error: {e}")
+                    continue
+                if text:
+                    self._metrics.observe("voice.dispatch_delay", self._dispatch(text) - t)
+                else:
+                    print("❓ Didn't catch that. Try again.")
+
+
+# ─── Process-wide stream ──────────────────────────────────────────────────────
+_stream      = None
+_listener    = None
+_stream_lock = threading.Lock()
+
+def get_command_listener(device_index=2, phrase_limit=5):
+    global _stream, _listener
+    with _stream_lock:
+        if _stream is None:
+            _stream = MicrophoneStream(device_index, phrase_limit)
+            _listener = CommandListener(_stream, create_recognizer())
+        elif _stream.error:
+            _stream.reopen()  # the listener and its loaded recognizer stay
+        return _listener
+
+
+def listen_command(device_index=2, timeout=5, phrase_limit=5):
+    try:
+        listener = get_command_listener(device_index, phrase_limit)
+        stream = listener.stream
+        if not stream.wait_ready(timeout):
+            return ""
+        if stream.error:
+            time.sleep(1)  # back off before reopening the device
             return ""
 
-        except sr.RequestError as e:
-            print(f"❌ Could not request results from Google Speech Recognition service: {e}")
-            return "API unavailable"
+        print("🎧 Listening for command...")
+        return listener.commands.get(timeout=timeout)
 
-    except sr.WaitTimeoutError:
+    except queue.Empty:
         print("⏳ Timeout: No speech detected.")
         return ""
 
-    except OSError as mic_error:
-        print(f"🎙️ Microphone error: {mic_error}")
-        return ""
-
     except Exception as e:
         print(f"🚨 Unexpected error: {e}")
+        time.sleep(1)  # e.g. the configured ASR backend cannot load; don't spin
         return ""
@@ -0,0 +1,144 @@
+import hashlib
+import io
+import os
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+
+CACHE_DIR_ENV    = "SONIC_VISION_TTS_CACHE"  # directory, or "off"
+DEFAULT_DIR      = os.path.join(os.path.expanduser("~"), ".cache", "sonic-vision", "tts")
+MAX_MEMORY_BYTES = 32 * 2**20
+MAX_DISK_BYTES   = 256 * 2**20
+PLAY_CHUNK       = 1024  # frames per write; bounds how late an interrupt lands (~20 ms)
+
+
+def clip_key(text, voice, rate, lang):
+    """Stable file-name-safe key for a rendering of ``text``."""
+    raw = "\x1f".join(str(part) for part in (text, voice, rate, lang))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """Rendered speech clips (WAV bytes): an LRU in memory over a disk directory.
+
+    Every process that speaks shares the directory, so a phrase rendered
+    once by any of them is instant for all, across restarts. Writes go
+    through a temporary file and a rename, so readers never see half a clip.
+    """
+
+    def __init__(self, directory=DEFAULT_DIR, max_memory=MAX_MEMORY_BYTES, max_disk=MAX_DISK_BYTES):
+        self.directory  = directory
+        self.max_memory = max_memory
+        self.max_disk   = max_disk
+        self._memory    = OrderedDict()
+        self._bytes     = 0
+        self._lock      = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._prune_disk()
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.wav")
+
+    def get(self, key):
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+        try:
+            with open(self.path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        self._remember(key, data)
+        return data
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._memory:
+                return True
+        return os.path.exists(self.path(key))
+
+    def put(self, key, data):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.path(key))
+        except OSError:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+        self._remember(key, data)
+
+    def _remember(self, key, data):
+        with self._lock:
+            if key in self._memory:
+                self._bytes -= len(self._memory.pop(key))
+            self._memory[key] = data
+            self._bytes += len(data)
+            while self._bytes > self.max_memory and len(self._memory) > 1:
+                _, old = self._memory.popitem(last=False)
+                self._bytes -= len(old)
+
+    def _prune_disk(self):
+        # Oldest first once the directory outgrows its budget
+        try:
+            entries = [os.path.join(self.directory, n) for n in os.listdir(self.directory)]
+            files = sorted(((os.stat(p).st_mtime, os.stat(p).st_size, p) for p in entries
+                            if p.endswith(".wav")))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+
+class ClipPlayer:
+    """Plays WAV clips through PyAudio in small chunks, so playback can be cut off."""
+
+    def __init__(self):
+        import pyaudio  # already required for the microphone
+        self._pyaudio = pyaudio
+        self._pa = pyaudio.PyAudio()
+
+    def play(self, data, should_stop):
+        """Play ``data``; returns False if ``should_stop()`` cut it short."""
+        with wave.open(io.BytesIO(data), "rb") as clip:
+            stream = self._pa.open(format=self._pa.get_format_from_width(clip.getsampwidth()),
+                                   channels=clip.getnchannels(), rate=clip.getframerate(),
+                                   output=True)
+            try:
+                while True:
+                    if should_stop():
+                        return False
+                    frames = clip.readframes(PLAY_CHUNK)
+                    if not frames:
+                        return True
+                    stream.write(frames)
+            finally:
+                stream.stop_stream()
+                stream.close()
+
+    def close(self):
+        self._pa.terminate()
+
+
+def default_cache():
+    """The configured cache, or None when disabled or the directory is unusable."""
+    directory = os.environ.get(CACHE_DIR_ENV, DEFAULT_DIR)
+    if directory.lower() == "off":
+        return None
+    try:
+        return AudioCache(directory)
+    except OSError as e:
+        print(f"[TTS] Audio cache disabled: {e}")
+        return None
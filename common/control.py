@@ -0,0 +1,249 @@
+import itertools
+import os
+import queue
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+# ─── Command types ────────────────────────────────────────────────────────────
+CAPTURE   = "capture"
+STOP      = "stop"
+STATUS    = "status"
+READ_PAGE = "read_page"
+PING      = "ping"  # answered by the socket thread itself: liveness, not progress
+
+# Inference server only
+DETECT = "detect"
+OCR    = "ocr"
+
+# Resident host only
+ACTIVATE   = "activate"
+DEACTIVATE = "deactivate"
+
+AUTHKEY_ENV = "SONIC_VISION_AUTHKEY"
+
+
+def control_address(name):
+    """Local endpoint for a module: a Unix socket, or a named pipe on Windows."""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\sonicvision-{name}"
+    return os.path.join(tempfile.gettempdir(), f"sonicvision-{name}.sock")
+
+
+def key_path():
+    """Per-user key file next to the sockets, shared by every process of the user."""
+    uid = os.getuid() if hasattr(os, "getuid") else os.environ.get("USERNAME", "user")
+    return os.path.join(tempfile.gettempdir(), f"sonicvision-{uid}.key")
+
+
+def _authkey():
+    """The environment's key if set, else the per-user key file (created 0600 on first use)."""
+    key = os.environ.get(AUTHKEY_ENV)
+    if key:
+        return key.encode()
+    path = key_path()
+    for _ in range(100):
+        try:
+            with open(path, "rb") as f:
+                key = f.read().strip()
+            if key:
+                return key
+        except FileNotFoundError:
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".key")  # created 0600
+            with os.fdopen(fd, "wb") as f:
+                f.write(secrets.token_hex(16).encode())
+            try:
+                os.link(tmp, path)  # atomic: a concurrent first user's key wins
+            except FileExistsError:
+                pass
+            finally:
+                os.remove(tmp)
+            continue
+        time.sleep(0.01)  # created but not yet written
+    raise RuntimeError(f"Control key file {path} is empty")
+
+
+class Command:
+    """A request received by a module; answer it with ``reply``."""
+
+    def __init__(self, kind, args, msg_id, channel):
+        self.kind     = kind
+        self.args     = args
+        self.msg_id   = msg_id
+        self._channel = channel
+        self.replied  = False
+
+    def reply(self, ok=True, **data):
+        if self.replied:
+            return
+        self.replied = True
+        self._channel.send({"id": self.msg_id, "ok": ok, **data})
+
+    def __repr__(self):
+        return f"Command({self.kind!r}, {self.args!r})"
+
+
+class _Channel:
+    def __init__(self, conn):
+        self.conn = conn
+        self._send_lock = threading.Lock()
+
+    def send(self, msg):
+        try:
+            with self._send_lock:
+                self.conn.send(msg)
+        except (OSError, EOFError, ValueError):
+            pass  # peer went away; nothing to acknowledge to
+
+
+class _NullChannel:
+    def send(self, msg):
+        pass
+
+
+class CommandQueue:
+    """In-process command inbox with the same interface modules consume.
+
+    The module blocks on ``get`` (or checks ``stop_requested``) instead of
+    polling the filesystem, and acknowledges each command with ``reply``.
+    """
+
+    def __init__(self):
+        self._commands = queue.Queue()
+        self.stop_requested = threading.Event()
+        self._closed = False
+
+    def put(self, cmd):
+        if cmd.kind == STOP:
+            self.stop_requested.set()
+        self._commands.put(cmd)
+
+    def post(self, kind, **args):
+        """Queue a command that nobody waits on an acknowledgement for."""
+        self.put(Command(kind, args, None, _NullChannel()))
+
+    def get(self, timeout=None):
+        """Wait for the next command; returns None on timeout or after close."""
+        try:
+            return self._commands.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def __iter__(self):
+        while not self._closed:
+            cmd = self.get()
+            if cmd is not None:
+                yield cmd
+
+    def close(self):
+        self._closed = True
+        self._commands.put(None)
+
+
+class ControlServer(CommandQueue):
+    """Module side: accepts controller connections and queues their commands."""
+
+    def __init__(self, name):
+        super().__init__()
+        self.address = control_address(name)
+        if sys.platform != "win32" and os.path.exists(self.address):
+            os.remove(self.address)  # left over from a crashed run
+        self._listener = Listener(self.address, authkey=_authkey())
+        threading.Thread(target=self._accept_loop, name=f"control-{name}", daemon=True).start()
+
+    def close(self):
+        super().close()
+        try:
+            self._listener.close()
+        except OSError:
+            pass
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                if self._closed:
+                    return
+                continue  # failed handshake from a stray client
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        channel = _Channel(conn)
+        try:
+            while True:
+                msg = conn.recv()
+                if not isinstance(msg, dict) or "cmd" not in msg:
+                    channel.send({"id": None, "ok": False, "error": "malformed message"})
+                    continue
+                if msg["cmd"] == PING:
+                    channel.send({"id": msg.get("id"), "ok": True, "pid": os.getpid()})
+                    continue
+                self.put(Command(msg["cmd"], msg.get("args", {}), msg.get("id"), channel))
+        except (EOFError, OSError):
+            pass
+        finally:
+            conn.close()
+
+
+class ControlClient:
+    """Controller side (or a test stand-in): sends commands, waits for acks."""
+
+    def __init__(self, name):
+        self.name    = name
+        self.address = control_address(name)
+        self._conn   = None
+        self._ids    = itertools.count(1)
+        self._lock   = threading.Lock()
+
+    def connect(self, timeout=10.0):
+        """Retry until the module is listening; modules may still be loading models."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                self._conn = Client(self.address, authkey=_authkey())
+                return True
+            except AuthenticationError:
+                print(f"[Control] {self.name!r} rejected our key; is it running as another user "
+                      f"or with a different {AUTHKEY_ENV}?")
+                return False  # retrying will not help
+            except (FileNotFoundError, ConnectionRefusedError, OSError):
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(0.05)
+
+    @property
+    def connected(self):
+        return self._conn is not None
+
+    def request(self, kind, timeout=2.0, **args):
+        """Send a command and return the module's reply dict, or None."""
+        with self._lock:
+            if self._conn is None and not self.connect(timeout):
+                return None
+            msg_id = next(self._ids)
+            try:
+                self._conn.send({"id": msg_id, "cmd": kind, "args": args})
+                deadline = time.monotonic() + timeout
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not self._conn.poll(remaining):
+                        return None
+                    reply = self._conn.recv()
+                    if reply.get("id") == msg_id:
+                        return reply
+            except (EOFError, OSError, AuthenticationError):
+                self.close()
+                return None
+
+    def close(self):
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except OSError:
+                pass
+            self._conn = None
@@ -0,0 +1,260 @@
+import os
+import sys
+import threading
+import time
+import zlib
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from common.frame_source import open_source, DEFAULT_CAMERA
+from common.metrics import get_metrics
+
+DEFAULT_DEVICE = DEFAULT_CAMERA
+DEFAULT_SLOTS  = 8  # ~250 ms of history at 30 fps for slow consumers
+KEEP_OPEN      = False  # the resident host keeps cameras open across mode switches
+
+# Header words (int64) at the start of the shared segment
+_MAGIC, _LATEST, _SLOTS, _HEIGHT, _WIDTH, _CHANNELS, _OWNER, _CLOSED = range(8)
+_HEADER_WORDS = 8
+_MAGIC_VALUE  = 0x534F4E4943  # "SONIC"
+
+
+def _bus_name(device):
+    if isinstance(device, int) or str(device).isdigit():
+        return f"sonicvision-cam{device}"
+    return f"sonicvision-src{zlib.crc32(str(device).encode()):08x}"  # short: macOS caps names
+
+
+def _pid_alive(pid):
+    if sys.platform == "win32":
+        return True  # Windows frees the segment with its last handle; os.kill would kill
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class FrameBus:
+    """Latest-frame ring buffer in shared memory, fed by one capture thread.
+
+    Each slot holds one frame plus the sequence number and capture time
+    (``time.monotonic``, comparable across processes) written with it.
+    Consumers get read-only views of a slot (no copy); a view stays valid
+    for ``slots - 1`` frames, which ``is_current`` lets a slow reader check.
+    The process that opens the camera owns the bus; other processes attach
+    to the same segment by device number instead of reopening the device.
+    """
+
+    def __init__(self, device=DEFAULT_DEVICE, slots=DEFAULT_SLOTS):
+        # ``device`` is any frame_source spec: camera index, video, image dir, synthetic
+        self.device   = device
+        self.name     = _bus_name(device)
+        self.owner    = False
+        self._shm     = None
+        self._cap     = None
+        self._thread  = None
+        self._running = False
+        self._cond    = threading.Condition()
+        self._frames_counter = get_metrics().counter("capture.frames")
+
+        if not self._attach():
+            self._create(slots)
+
+    # ─── Setup ────────────────────────────────────────────────────────────────
+    def _attach(self):
+        try:
+            shm = shared_memory.SharedMemory(name=self.name)
+        except FileNotFoundError:
+            return False
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        if header[_MAGIC] != _MAGIC_VALUE or header[_CLOSED] or not _pid_alive(int(header[_OWNER])):
+            # Left behind by an owner that died; take it over
+            del header
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+            return False
+        if sys.platform != "win32":
+            # Attaching must not make this process unlink the owner's segment at exit
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, "shared_memory")
+        self._map(shm)
+        return True
+
+    def _create(self, slots):
+        self._cap = open_source(self.device, realtime=True, loop=True)
+        if not self._cap.isOpened():
+            self._cap.release()
+            raise RuntimeError(f"Unable to open camera {self.device}")
+        ret, first = self._cap.read()
+        if not ret:
+            self._cap.release()
+            raise RuntimeError(f"Camera {self.device} returned no frame")
+
+        h, w = first.shape[:2]
+        c = first.shape[2] if first.ndim == 3 else 1
+        size = self._frames_offset(slots) + slots * h * w * c
+        shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        header[:] = (_MAGIC_VALUE, -1, slots, h, w, c, os.getpid(), 0)
+        del header
+        self.owner = True
+        self._map(shm)
+        self._slot_seq[:] = -1
+        self._publish(first)
+
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name=f"camera-{self.device}", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _frames_offset(slots):
+        raw = 8 * (_HEADER_WORDS + 2 * slots)
+        return (raw + 63) // 64 * 64
+
+    def _map(self, shm):
+        self._shm = shm
+        self._header = np.ndarray((_HEADER_WORDS,), dtype=np.int64, buffer=shm.buf)
+        slots, h, w, c = (int(v) for v in self._header[_SLOTS:_CHANNELS + 1])
+        self.slots = slots
+        self.shape = (h, w, c) if c > 1 else (h, w)
+        self._slot_seq = np.ndarray((slots,), dtype=np.int64, buffer=shm.buf, offset=8 * _HEADER_WORDS)
+        self._slot_time = np.ndarray((slots,), dtype=np.float64, buffer=shm.buf,
+                                     offset=8 * (_HEADER_WORDS + slots))
+        self._frames = np.ndarray((slots, *self.shape), dtype=np.uint8, buffer=shm.buf,
+                                  offset=self._frames_offset(slots))
+
+    # ─── Producer ─────────────────────────────────────────────────────────────
+    def _publish(self, frame=None):
+        seq = int(self._header[_LATEST]) + 1
+        slot = seq % self.slots
+        self._slot_seq[slot] = -1  # mark as being written
+        target = self._frames[slot]
+        if frame is None:
+            ret, frame = self._cap.read(target)  # decodes straight into the slot
+            if not ret or frame.shape != target.shape:
+                return False
+        if frame.ctypes.data != target.ctypes.data:
+            target[...] = frame
+        self._slot_time[slot] = time.monotonic()
+        self._slot_seq[slot] = seq
+        self._header[_LATEST] = seq
+        with self._cond:
+            self._cond.notify_all()
+        self._frames_counter.inc()
+        return True
+
+    def _capture_loop(self):
+        while self._running:
+            if not self._publish():
+                print(f"[FrameBus] Camera {self.device} read failed.")
+                time.sleep(0.05)
+
+    # ─── Consumers ────────────────────────────────────────────────────────────
+    @property
+    def seq(self):
+        return int(self._header[_LATEST])
+
+    def _view(self, seq):
+        view = self._frames[seq % self.slots].view()
+        view.flags.writeable = False
+        return view
+
+    def latest(self):
+        """Return ``(seq, frame)`` for the newest frame, or ``(-1, None)``."""
+        seq = self.seq
+        if seq < 0:
+            return -1, None
+        return seq, self._view(seq)
+
+    def wait_next(self, after_seq, timeout=1.0):
+        """Block until a frame newer than ``after_seq`` is published."""
+        deadline = time.monotonic() + timeout
+        while not self.closed and self.seq <= after_seq:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return -1, None
+            if self.owner:
+                with self._cond:
+                    if self.seq <= after_seq:
+                        self._cond.wait(remaining)
+            else:
+                time.sleep(min(0.002, remaining))  # other process publishes; no shared condvar
+        if self.closed:
+            return -1, None
+        return self.latest()
+
+    def fresh(self, timeout=1.0):
+        """Return a frame captured after this call, without draining a buffer."""
+        return self.wait_next(self.seq, timeout)
+
+    def timestamp(self, seq):
+        """Capture time of ``seq``, or None once its slot has been reused."""
+        slot = seq % self.slots
+        t = float(self._slot_time[slot])
+        return t if int(self._slot_seq[slot]) == seq else None
+
+    def is_current(self, seq):
+        """True while the slot holding ``seq`` has not been overwritten."""
+        return int(self._slot_seq[seq % self.slots]) == seq
+
+    @property
+    def closed(self):
+        return self._shm is None or bool(self._header[_CLOSED])
+
+    def close(self):
+        if self._shm is None:
+            return
+        if self.owner:
+            self._running = False
+            self._header[_CLOSED] = 1
+            if self._thread:
+                self._thread.join(timeout=1)
+            self._cap.release()
+        del self._header, self._slot_seq, self._slot_time, self._frames
+        shm, self._shm = self._shm, None
+        try:
+            shm.close()
+        except BufferError:
+            pass  # a consumer still holds a view; the mapping goes with the process
+        if self.owner:
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+# ─── Process-wide registry ────────────────────────────────────────────────────
+def _normalize(device):
+    return int(device) if str(device).isdigit() else device
+
+_buses     = {}
+_refcounts = {}
+_bus_lock  = threading.Lock()
+
+def get_frame_bus(device=DEFAULT_DEVICE):
+    """Open (or attach to) the bus for ``device``; pair with ``release_frame_bus``."""
+    device = _normalize(device)
+    with _bus_lock:
+        bus = _buses.get(device)
+        if bus is None or bus.closed:
+            bus = _buses[device] = FrameBus(device)
+            _refcounts[device] = 0
+        _refcounts[device] += 1
+        return bus
+
+def release_frame_bus(device=DEFAULT_DEVICE):
+    device = _normalize(device)
+    with _bus_lock:
+        if device not in _buses:
+            return
+        _refcounts[device] -= 1
+        if _refcounts[device] <= 0 and not KEEP_OPEN:
+            _buses.pop(device).close()
+            del _refcounts[device]
@@ -0,0 +1,181 @@
+import abc
+import os
+import threading
+import time
+
+import cv2
+
+from common.metrics import get_metrics
+
+DISPLAY_ENV  = "SONIC_VISION_DISPLAY"  # "none", "window", or a .avi/.mp4/.mjpg file
+DEFAULT_FPS  = 15    # refresh cap for windows and the frame rate of recordings
+JPEG_QUALITY = 80
+
+
+class NullSink:
+    """Headless: frames are not rendered at all."""
+
+    failed = None  # the error that stopped rendering, if any
+
+    def submit(self, frame, overlay=None, valid=None):
+        pass
+
+    def close(self, timeout=None):
+        pass
+
+
+class FrameSink(NullSink, abc.ABC):
+    """Renders the latest submitted frame on its own thread, at most ``max_fps``.
+
+    ``submit`` never blocks: it replaces whatever frame is still waiting,
+    so a slow display or encoder drops frames instead of holding up
+    capture. The frame may be a read-only view (e.g. a FrameBus slot); it
+    is copied on the render thread and skipped if ``valid()`` says the
+    slot was overwritten meanwhile. ``draw(frame, overlay)`` then paints
+    the overlay snapshot submitted with it. If rendering raises (e.g. no
+    display to open a window on) the sink keeps running headless:
+    ``failed`` holds the error, ``submit`` discards frames and the
+    ``sink.failed`` metric is set.
+    """
+
+    def __init__(self, draw=None, max_fps=DEFAULT_FPS):
+        self.draw      = draw
+        self.interval  = 1.0 / max_fps
+        self._pending  = None
+        self._closed   = False
+        self._cond     = threading.Condition()
+        metrics = get_metrics()
+        self._rendered = metrics.counter("sink.frames")
+        self._dropped  = metrics.counter("sink.dropped")
+        self._failed   = metrics.counter("sink.failed")
+        self._timer    = metrics.timer("sink.render")
+        self._thread   = threading.Thread(target=self._run, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def submit(self, frame, overlay=None, valid=None):
+        if self.failed is not None:
+            return  # headless since rendering failed
+        with self._cond:
+            if self._pending is not None:
+                self._dropped.inc()
+            self._pending = (frame, overlay, valid)
+            self._cond.notify()
+
+    def close(self, timeout=None):
+        """Stop rendering; by default waits until the thread no longer touches a frame."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def _run(self):
+        next_at = 0.0
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._pending is not None or self._closed)
+                    if self._closed:
+                        break
+                # Hold off until the next refresh; newer frames replace this one meanwhile
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                with self._cond:
+                    frame, overlay, valid = self._pending
+                    self._pending = None
+                next_at = max(next_at, time.monotonic()) + self.interval  # the slot after this one
+
+                frame = frame.copy()  # the only copy: overlays are drawn on it
+                if valid is not None and not valid():
+                    self._dropped.inc()  # torn: the slot was reused while copying
+                    continue
+                with self._timer.time():
+                    if self.draw is not None:
+                        self.draw(frame, overlay)
+                    self.emit(frame)
+                self._rendered.inc()
+        except Exception as e:
+            self.failed = e
+            self._failed.inc()
+            with self._cond:
+                self._pending = None  # drop the reference to a bus view
+            print(f"[Sink] {type(self).__name__} failed ({e}); continuing headless.")
+        finally:
+            self.release()
+
+    @abc.abstractmethod
+    def emit(self, frame):
+        """Show or write one finished frame (render thread only)."""
+
+    def release(self):
+        pass
+
+
+class WindowSink(FrameSink):
+    # HighGUI calls stay on this thread (fine on Linux and Windows kiosks)
+    def __init__(self, title, draw=None, max_fps=DEFAULT_FPS):
+        self.title = title
+        super().__init__(draw, max_fps)
+
+    def emit(self, frame):
+        cv2.imshow(self.title, frame)
+        cv2.waitKey(1)
+
+    def release(self):
+        try:
+            cv2.destroyWindow(self.title)
+        except cv2.error:
+            pass  # never shown
+
+
+class VideoSink(FrameSink):
+    """Encoded recording (.avi as Motion-JPEG, .mp4 as MPEG-4) at ``max_fps``."""
+
+    FOURCC = {".avi": "MJPG", ".mp4": "mp4v"}
+
+    def __init__(self, path, draw=None, max_fps=DEFAULT_FPS):
+        self.path    = path
+        self.fps     = max_fps
+        self._writer = None
+        super().__init__(draw, max_fps)
+
+    def emit(self, frame):
+        if self._writer is None:  # frame size is only known now
+            fourcc = self.FOURCC.get(os.path.splitext(self.path)[1].lower(), "MJPG")
+            self._writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*fourcc), self.fps,
+                                           (frame.shape[1], frame.shape[0]))
+            if not self._writer.isOpened():
+                raise RuntimeError(f"cannot record to {self.path!r}")
+        self._writer.write(frame)
+
+    def release(self):
+        if self._writer is not None:
+            self._writer.release()
+
+
+class MjpegSink(FrameSink):
+    """Concatenated JPEG stream (.mjpg), playable by ffplay/VLC; cheap to write."""
+
+    def __init__(self, path, draw=None, max_fps=DEFAULT_FPS):
+        self._file = open(path, "wb")
+        super().__init__(draw, max_fps)
+
+    def emit(self, frame):
+        ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+        if ok:
+            self._file.write(jpeg.tobytes())
+
+    def release(self):
+        self._file.close()
+
+
+def open_sink(spec=None, title="Sonic Vision", draw=None, max_fps=DEFAULT_FPS):
+    """Sink for ``spec`` ("none", "window" or a file path); the environment by default."""
+    spec = spec or os.environ.get(DISPLAY_ENV, "window")
+    if spec.lower() in ("none", "headless", "off"):
+        return NullSink()
+    if spec.lower() == "window":
+        return WindowSink(title, draw, max_fps)
+    if os.path.splitext(spec)[1].lower() in (".mjpg", ".mjpeg"):
+        return MjpegSink(spec, draw, max_fps)
+    return VideoSink(spec, draw, max_fps)
@@ -0,0 +1,164 @@
+import abc
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+
+SOURCE_ENV     = "SONIC_VISION_SOURCE"
+DEFAULT_CAMERA = 1
+IMAGE_EXTS     = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
+
+class FrameSource(abc.ABC):
+    """Minimal cv2.VideoCapture-compatible interface: isOpened / read / release.
+
+    Anything that consumes a capture (the frame bus, the benchmark) accepts
+    these, so the pipelines can run from files or generated frames instead
+    of a camera. ``realtime`` paces reads to ``fps`` like a live device.
+    """
+
+    fps = 30.0
+
+    def __init__(self, realtime=False, loop=False):
+        self.realtime = realtime
+        self.loop     = loop
+        self._next_at = None
+
+    def isOpened(self):
+        return True
+
+    def read(self, out=None):
+        if self.realtime:
+            self._pace()
+        frame = self._next_frame()
+        if frame is None:
+            return False, None
+        if out is not None and out.shape == frame.shape:
+            out[...] = frame
+            return True, out
+        return True, frame
+
+    def release(self):
+        pass
+
+    def __iter__(self):
+        while True:
+            ok, frame = self.read()
+            if not ok:
+                return
+            yield frame
+
+    def _pace(self):
+        now = time.monotonic()
+        if self._next_at is not None and now < self._next_at:
+            time.sleep(self._next_at - now)
+        self._next_at = max(now, self._next_at or now) + 1.0 / self.fps
+
+    @abc.abstractmethod
+    def _next_frame(self):
+        """The next frame, or None when the source is exhausted."""
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, realtime=False, loop=False):
+        super().__init__(realtime, loop)
+        self.path = path
+        self._cap = cv2.VideoCapture(path)
+        self.fps  = self._cap.get(cv2.CAP_PROP_FPS) or FrameSource.fps
+
+    def isOpened(self):
+        return self._cap.isOpened()
+
+    def _next_frame(self):
+        ret, frame = self._cap.read()
+        if not ret and self.loop:
+            self._cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self._cap.read()
+        return frame if ret else None
+
+    def release(self):
+        self._cap.release()
+
+
+class ImageDirSource(FrameSource):
+    def __init__(self, path, realtime=False, loop=False, fps=FrameSource.fps):
+        super().__init__(realtime, loop)
+        self.fps   = fps
+        self.paths = sorted(p for p in glob.glob(os.path.join(path, "*"))
+                            if p.lower().endswith(IMAGE_EXTS))
+        self._i    = 0
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def _next_frame(self):
+        while self._i < len(self.paths) or (self.loop and self.paths):
+            if self._i >= len(self.paths):
+                self._i = 0
+            frame = cv2.imread(self.paths[self._i])
+            self._i += 1
+            if frame is not None:
+                return frame
+        return None
+
+
+class SyntheticSource(FrameSource):
+    """Deterministic frames with moving boxes and printed text lines."""
+
+    def __init__(self, width=640, height=480, frames=None, seed=0, realtime=False, loop=False):
+        super().__init__(realtime, loop)
+        self.width  = width
+        self.height = height
+        self.frames = frames
+        self._n     = 0
+        rng = np.random.default_rng(seed)
+        self._boxes  = rng.integers(0, min(width, height) // 2, size=(6, 4))
+        self._colors = rng.integers(0, 255, size=(6, 3))
+        self._speeds = rng.integers(-6, 7, size=(6, 2))
+
+    def _next_frame(self):
+        if self.frames is not None and self._n >= self.frames:
+            if not self.loop:
+                return None
+            self._n = 0
+        t = self._n
+        self._n += 1
+
+        frame = np.full((self.height, self.width, 3), 235, dtype=np.uint8)
+        for (x, y, w, h), color, (dx, dy) in zip(self._boxes, self._colors, self._speeds):
+            x1 = int(x + dx * t) % self.width
+            y1 = int(y + dy * t) % self.height
+            cv2.rectangle(frame, (x1, y1), (x1 + int(w) // 2 + 20, y1 + int(h) // 2 + 20),
+                          tuple(int(c) for c in color), -1)
+        for line in range(4):
+            cv2.putText(frame, f"Synthetic page line {line + 1} frame {t}", (20, 40 + 30 * line),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (20, 20, 20), 2)
+        return frame
+
+
+def default_source():
+    """Source spec from SONIC_VISION_SOURCE, falling back to the usual camera."""
+    return os.environ.get(SOURCE_ENV, DEFAULT_CAMERA)
+
+
+def open_source(spec=None, realtime=False, loop=False):
+    """Open a capture for ``spec``.
+
+    ``spec`` is a camera index, a video file, a directory of images, or
+    ``synthetic[:WxH]``.
+    """
+    if spec is None:
+        spec = default_source()
+    if isinstance(spec, int) or str(spec).isdigit():
+        return cv2.VideoCapture(int(spec))
+    spec = str(spec)
+    if spec.startswith("synthetic"):
+        width, height = 640, 480
+        if ":" in spec:
+            width, height = (int(v) for v in spec.split(":", 1)[1].lower().split("x"))
+        return SyntheticSource(width, height, realtime=realtime, loop=loop)
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, realtime=realtime, loop=loop)
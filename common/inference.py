@@ -0,0 +1,99 @@
+import os
+from collections import namedtuple
+
+BACKEND_ENV = "SONIC_VISION_BACKEND"  # "torch", "onnx" or "openvino"
+INT8_ENV    = "SONIC_VISION_INT8"     # "1"/"0" to force INT8 weights on or off
+THREADS_ENV = "SONIC_VISION_THREADS"  # intra-op threads per model; runtime default if unset
+BACKENDS    = ("torch", "onnx", "openvino")
+
+# How a model should run: which runtime, whether quantized (None: the model's
+# default), and how many threads
+InferenceConfig = namedtuple("InferenceConfig", "backend int8 threads")
+
+
+def inference_config(backend=None, int8=None, threads=None):
+    """The configured backend; arguments override the environment."""
+    backend = (backend or os.environ.get(BACKEND_ENV, "torch")).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend {backend!r}; expected one of {BACKENDS}")
+    if int8 is None and os.environ.get(INT8_ENV):
+        int8 = os.environ[INT8_ENV].lower() in ("1", "true", "yes")
+    if threads is None:
+        threads = int(os.environ.get(THREADS_ENV, 0)) or None
+    return InferenceConfig(backend, int8, threads)
+
+
+def set_torch_threads(threads):
+    if not threads:
+        return
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+
+def quantize_onnx(src, dst):
+    """Write an INT8 copy of the ONNX graph ``src`` (dynamic quantization, no calibration)."""
+    try:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+    except ImportError:
+        raise RuntimeError("INT8 quantization needs onnxruntime (pip install onnxruntime)")
+    quantize_dynamic(src, dst, weight_type=QuantType.QUInt8)
+    return dst
+
+
+class OnnxRunner:
+    """One ONNX graph behind a call taking and returning NumPy arrays.
+
+    ``backend`` "onnx" runs it with ONNX Runtime, "openvino" compiles the
+    same file with OpenVINO; both honour ``threads``.
+    """
+
+    def __init__(self, path, backend="onnx", threads=None):
+        self.path    = path
+        self.backend = backend
+        if backend == "openvino":
+            try:
+                import openvino as ov
+            except ImportError:
+                raise RuntimeError("The openvino backend needs OpenVINO (pip install openvino)")
+            core = ov.Core()
+            config = {"PERFORMANCE_HINT": "LATENCY"}
+            if threads:
+                config["INFERENCE_NUM_THREADS"] = threads
+            model = core.read_model(path)
+            self._compiled = core.compile_model(model, "CPU", config)
+            self.metadata = {}
+            self._run = self._run_openvino
+        else:
+            try:
+                import onnxruntime as ort
+            except ImportError:
+                raise RuntimeError("The onnx backend needs ONNX Runtime (pip install onnxruntime)")
+            options = ort.SessionOptions()
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if threads:
+                options.intra_op_num_threads = threads
+                options.inter_op_num_threads = 1
+            session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+            self.metadata = session.get_modelmeta().custom_metadata_map
+            name = session.get_inputs()[0].name
+            self._run = lambda x: session.run(None, {name: x})
+
+    def __call__(self, x):
+        return self._run(x)
+
+    def _run_openvino(self, x):
+        result = self._compiled(x)  # one inference; outputs are read from its result
+        return [result[i] for i in range(len(self._compiled.outputs))]
+
+
+def onnx_metadata(path):
+    """Custom metadata of an ONNX file (e.g. the class names an exporter wrote)."""
+    try:
+        import onnx
+    except ImportError:
+        return {}
+    model = onnx.load(path, load_external_data=False)
+    return {p.key: p.value for p in model.metadata_props}
@@ -0,0 +1,56 @@
+import os
+
+from common.control import ControlClient, DETECT, OCR, STATUS
+
+SERVER_NAME = "inference"
+SERVER_ENV  = "SONIC_VISION_INFERENCE_SERVER"  # "1": pointers and readers use the shared server
+CONNECT_TIMEOUT = 0.5  # seconds; a missing server should not stall a frame for long
+
+
+def use_inference_server():
+    return os.environ.get(SERVER_ENV, "").lower() in ("1", "true", "yes")
+
+
+class ServerUnavailable(Exception):
+    """No inference server answers: not running, gone, or it rejected our key."""
+
+
+class InferenceClient:
+    """One stream's connection to the inference server.
+
+    Requests block until answered, so a stream has at most one frame in
+    flight; results come back as the same arrays and dicts the local
+    models return. None means the server dropped the frame (the stream
+    fell behind), was busy, or did not answer within ``timeout``;
+    ServerUnavailable means there is no server to ask.
+    """
+
+    def __init__(self, stream, timeout=2.0, name=SERVER_NAME):
+        self.stream  = str(stream)
+        self.timeout = timeout
+        self._client = ControlClient(name)
+
+    def connect(self, timeout=10.0):
+        return self._client.connect(timeout)
+
+    def _request(self, kind, timeout, **args):
+        if not self._client.connected and not self._client.connect(CONNECT_TIMEOUT):
+            raise ServerUnavailable(f"no inference server at {self._client.address}")
+        reply = self._client.request(kind, timeout=timeout, **args)
+        if reply is None and not self._client.connected:
+            raise ServerUnavailable("lost the connection to the inference server")
+        return reply
+
+    def detect(self, frame, imgsz):
+        reply = self._request(DETECT, self.timeout, stream=self.stream, frame=frame, imgsz=imgsz)
+        return reply["detections"] if reply and reply["ok"] else None
+
+    def ocr(self, frame, timeout=30.0):
+        reply = self._request(OCR, timeout, stream=self.stream, frame=frame)
+        return reply["lines"] if reply and reply["ok"] else None
+
+    def status(self):
+        return self._request(STATUS, self.timeout)
+
+    def close(self):
+        self._client.close()
@@ -0,0 +1,191 @@
+import json
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+METRICS_ENV  = "SONIC_VISION_METRICS"           # file path or udp://host:port
+INTERVAL_ENV = "SONIC_VISION_METRICS_INTERVAL"  # seconds between dumps
+WINDOW       = 512                              # samples kept per timer
+
+
+class Counter:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n=1):
+        with self._lock:  # += is a read and a write; threads share counters
+            self.value += n
+
+
+class Gauge:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = None
+
+    def set(self, value):
+        self.value = value
+
+
+class Timer:
+    """Keeps the last WINDOW samples in a fixed ring; recording is O(1)."""
+
+    __slots__ = ("samples", "count", "total", "_i", "_lock")
+
+    def __init__(self):
+        self.samples = [0.0] * WINDOW
+        self.count   = 0
+        self.total   = 0.0
+        self._i      = 0
+        self._lock   = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.samples[self._i] = seconds
+            self._i = (self._i + 1) % WINDOW
+            self.count += 1
+            self.total += seconds
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def recent(self, n=WINDOW):
+        """The last ``n`` samples (seconds), newest first; at most WINDOW are kept."""
+        n = min(n, self.count, WINDOW)
+        if n <= 0:
+            return np.empty(0)
+        idx = (self._i - np.arange(1, n + 1)) % WINDOW
+        return np.asarray(self.samples)[idx]
+
+    def summary(self):
+        n = min(self.count, WINDOW)
+        if not n:
+            return {"count": 0}
+        ms = np.asarray(self.samples[:n]) * 1000.0
+        p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+        return {"count": self.count, "mean_ms": float(ms.mean()), "p50_ms": float(p50),
+                "p95_ms": float(p95), "p99_ms": float(p99), "max_ms": float(ms.max())}
+
+
+class MetricsRegistry:
+    """In-process counters, gauges and timers, cheap enough to leave on.
+
+    Counters and timers take their own uncontended lock per update, so
+    counts are exact across threads; only ``snapshot`` pays for
+    aggregation. Counter rates are computed between
+    consecutive snapshots.
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._gauges   = {}
+        self._timers   = {}
+        self._lock     = threading.Lock()
+        self._last     = (time.monotonic(), {})
+
+    def _get(self, table, name, factory):
+        metric = table.get(name)
+        if metric is None:
+            with self._lock:
+                metric = table.setdefault(name, factory())
+        return metric
+
+    def counter(self, name):
+        return self._get(self._counters, name, Counter)
+
+    def gauge(self, name):
+        return self._get(self._gauges, name, Gauge)
+
+    def timer(self, name):
+        return self._get(self._timers, name, Timer)
+
+    # Shorthands for call sites
+    def inc(self, name, n=1):
+        self.counter(name).inc(n)
+
+    def set(self, name, value):
+        self.gauge(name).set(value)
+
+    def observe(self, name, seconds):
+        self.timer(name).observe(seconds)
+
+    def time(self, name):
+        return self.timer(name).time()
+
+    def snapshot(self):
+        now = time.monotonic()
+        last_t, last_counts = self._last
+        elapsed = max(now - last_t, 1e-9)
+        counts = {k: c.value for k, c in list(self._counters.items())}
+        self._last = (now, counts)
+        return {
+            "time": time.time(),
+            "counters": {k: {"count": v, "rate_per_s": (v - last_counts.get(k, 0)) / elapsed}
+                         for k, v in counts.items()},
+            "gauges": {k: g.value for k, g in list(self._gauges.items())},
+            "timers": {k: t.summary() for k, t in list(self._timers.items())},
+        }
+
+
+class MetricsDumper:
+    """Writes a JSON snapshot per line to a file or UDP socket every ``interval`` s."""
+
+    def __init__(self, registry, target, interval=5.0):
+        self.registry = registry
+        self.target   = target
+        self.interval = interval
+        self._stop    = threading.Event()
+        self._sock    = None
+        if target.startswith("udp://"):
+            host, port = target[len("udp://"):].rsplit(":", 1)
+            self._addr = (host, int(port))
+            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._thread = threading.Thread(target=self._run, name="metrics", daemon=True)
+        self._thread.start()
+
+    def dump(self):
+        line = json.dumps({"pid": os.getpid(), **self.registry.snapshot()})
+        try:
+            if self._sock:
+                self._sock.sendto(line.encode(), self._addr)
+            else:
+                with open(self.target, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+        except OSError as e:
+            print(f"[Metrics] Dump failed: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.dump()
+
+    def close(self):
+        self._stop.set()
+        self.dump()
+
+
+# ─── Process-wide instance ────────────────────────────────────────────────────
+_registry      = None
+_registry_lock = threading.Lock()
+
+def get_metrics():
+    """The process registry; dumps start automatically when SONIC_VISION_METRICS is set."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+            target = os.environ.get(METRICS_ENV)
+            if target:
+                MetricsDumper(_registry, target, float(os.environ.get(INTERVAL_ENV, 5.0)))
+        return _registry
@@ -0,0 +1,137 @@
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+MAX_MODELS_ENV = "SONIC_VISION_MAX_MODELS"
+
+
+class ModelHost:
+    """Process-wide registry of heavy models, loaded lazily on first use.
+
+    Loaders are registered by name and only run on the first ``get``. With
+    ``max_models`` set, the least recently used models are dropped when a
+    new one is loaded, so small devices can keep just N models resident.
+    Models that are only useful together (a pipeline's detector and hand
+    graphs) share a ``group`` and are dropped as one, and a pinned group
+    (in use, or needed by an active pipeline) is never dropped; the limit
+    is exceeded rather than unloading a model someone is holding.
+    """
+
+    def __init__(self, max_models=None):
+        self.max_models  = max_models
+        self._loaders    = {}
+        self._groups     = {}  # model name -> group name
+        self._pins       = {}  # group name -> holders
+        self._models     = OrderedDict()
+        self._load_times = {}
+        self._lock       = threading.RLock()
+        self._loading    = {}
+
+    def register(self, name, loader, unloader=None, group=None):
+        with self._lock:
+            if name not in self._loaders:
+                self._loaders[name] = (loader, unloader)
+                self._groups[name]  = group or name
+
+    def pin(self, group):
+        """Keep ``group`` (a group or model name) resident until ``unpin``."""
+        with self._lock:
+            self._pins[group] = self._pins.get(group, 0) + 1
+
+    def unpin(self, group):
+        with self._lock:
+            if self._pins.get(group, 0) > 1:
+                self._pins[group] -= 1
+            else:
+                self._pins.pop(group, None)
+                self._evict()  # the limit may have been exceeded while it was held
+
+    @contextmanager
+    def use(self, name):
+        """``get(name)``, with its group pinned until the block ends."""
+        group = self._groups.get(name, name)
+        self.pin(group)
+        try:
+            yield self.get(name)
+        finally:
+            self.unpin(group)
+
+    def get(self, name):
+        with self._lock:
+            if name in self._models:
+                self._touch(name)
+                return self._models[name]
+            if name not in self._loaders:
+                raise KeyError(f"No loader registered for model {name!r}")
+            # Serialize loads of the same model without blocking other lookups
+            gate = self._loading.setdefault(name, threading.Lock())
+
+        with gate:
+            with self._lock:
+                if name in self._models:
+                    return self._models[name]
+                loader, _ = self._loaders[name]
+            start = time.perf_counter()
+            model = loader()
+            elapsed = time.perf_counter() - start
+            print(f"[ModelHost] Loaded {name} in {elapsed:.2f}s")
+
+            with self._lock:
+                self._models[name] = model
+                self._load_times[name] = elapsed
+                self._loading.pop(name, None)
+                self._touch(name)
+                self._evict(keep=self._groups[name])
+            return model
+
+    def unload(self, name):
+        with self._lock:
+            model = self._models.pop(name, None)
+            _, unloader = self._loaders.get(name, (None, None))
+        if model is not None:
+            if unloader:
+                unloader(model)
+            print(f"[ModelHost] Unloaded {name}")
+            del model
+            gc.collect()
+
+    def loaded(self):
+        with self._lock:
+            return list(self._models)
+
+    def load_times(self):
+        with self._lock:
+            return dict(self._load_times)
+
+    def _touch(self, name):
+        # The whole group counts as used, so its members age together
+        group = self._groups[name]
+        for member in [m for m in self._models if self._groups[m] == group]:
+            self._models.move_to_end(member)
+
+    def _evict(self, keep=None):
+        if not self.max_models:
+            return
+        while len(self._models) > self.max_models:
+            group = next((self._groups[m] for m in self._models
+                          if self._groups[m] != keep and self._groups[m] not in self._pins), None)
+            if group is None:
+                return  # everything left is in use
+            for member in [m for m in self._models if self._groups[m] == group]:
+                self.unload(member)
+
+
+# ─── Process-wide instance ────────────────────────────────────────────────────
+_host      = None
+_host_lock = threading.Lock()
+
+def get_model_host():
+    global _host
+    with _host_lock:
+        if _host is None:
+            limit = os.environ.get(MAX_MODELS_ENV)
+            _host = ModelHost(max_models=int(limit) if limit else None)
+        return _host
@@ -0,0 +1,211 @@
+import re
+import threading
+
+from common.metrics import get_metrics
+
+LOOKAHEAD       = 2    # sentences queued in the speech service: one playing, the next waiting (not pre-rendered)
+MAX_CHUNK_CHARS = 200  # OCR text often lacks punctuation; split run-ons at a space
+READING_GROUP   = "page-reading"
+RETRY_AFTER     = 0.25 # seconds before re-offering a sentence the full speech queue turned away
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;:])\s+")
+
+
+def split_sentences(text, max_chars=MAX_CHUNK_CHARS):
+    """Speakable chunks of ``text``: sentences, with run-ons cut at word boundaries."""
+    chunks = []
+    for sentence in _SENTENCE_END.split(" ".join(text.split())):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            chunks.append(sentence[:cut])
+            sentence = sentence[cut:].lstrip()
+        if sentence:
+            chunks.append(sentence)
+    return chunks
+
+
+class PageReader:
+    """Reads captured pages aloud sentence by sentence, with a bookmark.
+
+    A worker thread keeps ``LOOKAHEAD`` sentences queued in the speech
+    service, so the next one starts the moment the current one ends, and
+    runs on into the following page without a gap. Every control
+    (``pause``, ``resume``, ``next_sentence``, ``repeat``, ``next_page``)
+    only moves the bookmark and cuts the queued sentences, so it takes
+    effect at once; the worker refills from the bookmark. A sentence cut
+    off by an urgent message is read again from its start afterwards.
+
+    ``translate(sentences, lang)``, if given, lets ``read`` speak a page
+    in another language; sentences it fails on (None) are read as captured.
+    """
+
+    def __init__(self, store, feedback, translate=None):
+        self.store     = store
+        self.feedback  = feedback
+        self.translate = translate
+        self._lang     = None   # language of the page in _script, None as captured
+        self._cond     = threading.Condition()
+        self._script   = []     # (page, sentence index within page, text)
+        self._position = 0      # bookmark: index into _script being spoken
+        self._active   = False
+        self._paused   = False
+        self._epoch    = 0      # bumped whenever the queued sentences are discarded
+        self._metrics  = get_metrics()
+        self._thread   = threading.Thread(target=self._run, name="page-reader", daemon=True)
+        self._thread.start()
+
+    # ─── Controls ─────────────────────────────────────────────────────────────
+    def read(self, page, line=1, lang=None):
+        """Start page ``page`` at ``line``; returns False if it was never captured.
+
+        With ``lang`` the page is translated first (in the calling thread).
+        """
+        lines = self.store.page_lines(page)
+        if not lines and self.store.page_text(page) is None:
+            return False
+        script = self._page_script(page, lines, lang)
+        start = self._sentence_at_line(lines, line)
+        with self._cond:
+            self._script, self._position = script, min(start, max(len(script) - 1, 0))
+            self._active, self._paused = bool(script), False
+            self._lang = lang
+            self._restart()
+        return True
+
+    def pause(self):
+        with self._cond:
+            if self._active and not self._paused:
+                self._paused = True
+                self._restart()
+
+    def resume(self):
+        with self._cond:
+            self._paused = False
+            self._cond.notify_all()
+
+    def next_sentence(self):
+        with self._cond:
+            if self._script:
+                # Past the last sentence the worker moves on a page or says so
+                self._position += 1
+                self._active, self._paused = True, False
+                self._restart()
+
+    def repeat(self):
+        with self._cond:
+            if self._script:
+                self._position = min(self._position, len(self._script) - 1)
+                self._active, self._paused = True, False
+                self._restart()
+
+    def next_page(self):
+        return self.read(self.bookmark()[0] + 1, lang=self._lang) if self._script else False
+
+    def stop(self):
+        with self._cond:
+            self._active = False
+            self._restart()
+
+    def bookmark(self):
+        """(page, sentence) currently being read, both 1-based; (0, 0) before any page."""
+        with self._cond:
+            if not self._script:
+                return (0, 0)
+            page, index, _ = self._script[min(self._position, len(self._script) - 1)]
+            return (page, index + 1)
+
+    @property
+    def reading(self):
+        with self._cond:
+            return self._active and not self._paused
+
+    # ─── Internals ────────────────────────────────────────────────────────────
+    def _page_script(self, page, lines, lang=None):
+        sentences = split_sentences(" ".join(lines))
+        if lang and self.translate and sentences:
+            translated = self.translate(sentences, lang)
+            sentences = [t if t is not None else s for s, t in zip(sentences, translated)]
+        return [(page, i, text) for i, text in enumerate(sentences)]
+
+    @staticmethod
+    def _sentence_at_line(lines, line):
+        # Index of the first chunk that ends after the start of ``line``
+        if line <= 1:
+            return 0
+        offset = len(" ".join(" ".join(l.split()) for l in lines[:line - 1]))
+        end = -1
+        for i, chunk in enumerate(split_sentences(" ".join(lines))):
+            end += len(chunk) + 1
+            if end > offset:
+                return i
+        return 0
+
+    def _restart(self):
+        # Caller holds the lock: drop what is queued; the worker refills from the bookmark
+        self._epoch += 1
+        self.feedback.cancel_group(READING_GROUP)
+        self._cond.notify_all()
+
+    def _extend(self):
+        # Caller holds the lock: append the next page, if captured, for gapless reading.
+        # Translated pages stop at the end instead: translating here would stall the controls
+        if self._lang:
+            return False
+        page = self._script[-1][0] + 1
+        lines = self.store.page_lines(page)
+        if lines:
+            self._script.extend(self._page_script(page, lines))
+            return True
+        return False
+
+    def _run(self):
+        in_flight = []  # (utterance, script index), oldest first
+        epoch = None
+        while True:
+            with self._cond:
+                while not self._active or self._paused:
+                    in_flight, epoch = [], None
+                    self._cond.wait()
+                if epoch != self._epoch:
+                    in_flight, epoch = [], self._epoch
+                cursor = in_flight[-1][1] + 1 if in_flight else self._position
+                rejected = False
+                while len(in_flight) < LOOKAHEAD:
+                    if cursor >= len(self._script) and not self._extend():
+                        break
+                    text = self._script[cursor][2]
+                    utt = self.feedback.speak(text, group=READING_GROUP)
+                    if utt is None:
+                        rejected = True  # queue full, not the end of the page
+                        break
+                    in_flight.append((utt, cursor))
+                    cursor += 1
+                if not in_flight and rejected:
+                    self._metrics.inc("reader.rejected")
+                    self._cond.wait(RETRY_AFTER)  # a control wakes it early
+                    continue
+                if not in_flight:
+                    self._position = len(self._script) - 1
+                    self._active = False
+                    self.feedback.speak(f"End of page {self._script[-1][0]}.")
+                    continue
+                head, index = in_flight[0]
+
+            head.wait()
+            with self._cond:
+                if epoch != self._epoch:
+                    continue
+                in_flight.pop(0)
+                if head.cancelled:
+                    # Dropped as stale or evicted: requeue from the bookmark, in order
+                    self._restart()
+                    continue
+                if head.interrupted:
+                    # Cut off by an urgent message: say it again once that is over
+                    self._position = index
+                    self._metrics.inc("reader.interrupted")
+                    self._restart()
+                    continue
+                self._position = index + 1
+                self._metrics.inc("reader.sentences")
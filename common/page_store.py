@@ -0,0 +1,204 @@
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# One row per FTS match: page and line numbers are 1-based, as spoken
+SearchHit = namedtuple("SearchHit", "page line text")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    page        INTEGER PRIMARY KEY,
+    captured_at REAL NOT NULL,
+    confidence  REAL,
+    text        TEXT NOT NULL,
+    source      TEXT
+);
+CREATE TABLE IF NOT EXISTS lines (
+    id          INTEGER PRIMARY KEY,
+    page        INTEGER NOT NULL REFERENCES pages(page) ON DELETE CASCADE,
+    line_no     INTEGER NOT NULL,
+    text        TEXT NOT NULL,
+    confidence  REAL
+);
+CREATE INDEX IF NOT EXISTS lines_by_page ON lines(page, line_no);
+CREATE TABLE IF NOT EXISTS words (
+    line_id     INTEGER NOT NULL REFERENCES lines(id) ON DELETE CASCADE,
+    word_no     INTEGER NOT NULL,
+    text        TEXT NOT NULL,
+    confidence  REAL,
+    x0 INTEGER, y0 INTEGER, x1 INTEGER, y1 INTEGER
+);
+CREATE INDEX IF NOT EXISTS words_by_line ON words(line_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key         TEXT PRIMARY KEY,
+    value       TEXT
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts
+    USING fts5(text, content='lines', content_rowid='id', tokenize='unicode61');
+"""
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+class PageStore:
+    """Captured pages in one SQLite file, with a full-text index over lines.
+
+    The OCR module appends pages as they are captured; the controller
+    reads and searches the same file from its own process (WAL mode lets
+    both do so concurrently). Each page keeps its capture time and mean
+    OCR confidence, each line its text and confidence, and each word its
+    bounding box in frame pixels. A page may name its ``source`` (e.g. a
+    bulk job) so that job's pages can be replaced as a whole.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(_SCHEMA)
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(pages)")]
+            if "source" not in columns:  # store written before pages had a source
+                self._conn.execute("ALTER TABLE pages ADD COLUMN source TEXT")
+            try:
+                self._conn.executescript(_FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError:  # SQLite built without FTS5
+                self.fts = False
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ─── Writing ──────────────────────────────────────────────────────────────
+    def add_page(self, lines, captured_at=None, meta=None, source=None):
+        """Append a page and return its number.
+
+        ``lines`` is a list of dicts with ``text``, ``confidence`` and
+        ``words``; each word a dict with ``text``, ``confidence`` and
+        ``bbox`` (x0, y0, x1, y1). ``meta`` entries are written in the
+        same transaction, e.g. a bulk job's progress marker.
+        """
+        captured_at = captured_at or time.time()
+        text = "\n".join(line["text"] for line in lines)
+        confs = [line["confidence"] for line in lines if line.get("confidence") is not None]
+        confidence = sum(confs) / len(confs) if confs else None
+
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO pages (page, captured_at, confidence, text, source) "
+                "VALUES ((SELECT COALESCE(MAX(page), 0) + 1 FROM pages), ?, ?, ?, ?)",
+                (captured_at, confidence, text, source))
+            page = self._conn.execute("SELECT page FROM pages WHERE rowid = ?",
+                                      (cur.lastrowid,)).fetchone()[0]
+            for line_no, line in enumerate(lines, start=1):
+                cur = self._conn.execute(
+                    "INSERT INTO lines (page, line_no, text, confidence) VALUES (?, ?, ?, ?)",
+                    (page, line_no, line["text"], line.get("confidence")))
+                line_id = cur.lastrowid
+                if self.fts:
+                    self._conn.execute("INSERT INTO lines_fts (rowid, text) VALUES (?, ?)",
+                                       (line_id, line["text"]))
+                self._conn.executemany(
+                    "INSERT INTO words (line_id, word_no, text, confidence, x0, y0, x1, y1) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(line_id, i, w["text"], w.get("confidence"), *map(int, w["bbox"]))
+                     for i, w in enumerate(line.get("words", []), start=1)])
+            self._write_meta(meta or {})
+        return page
+
+    def set_meta(self, entries):
+        with self._lock, self._conn:
+            self._write_meta(entries)
+
+    def _write_meta(self, entries):
+        self._conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                               [(k, str(v)) for k, v in entries.items()])
+
+    def delete_pages(self, source):
+        """Remove every page added with ``source``; returns how many there were."""
+        with self._lock, self._conn:
+            if self.fts:
+                self._conn.execute(
+                    "INSERT INTO lines_fts (lines_fts, rowid, text) "
+                    "SELECT 'delete', l.id, l.text FROM lines l JOIN pages p ON p.page = l.page "
+                    "WHERE p.source = ?", (source,))
+            # Lines and words go with their pages (ON DELETE CASCADE)
+            return self._conn.execute("DELETE FROM pages WHERE source = ?", (source,)).rowcount
+
+    def clear(self):
+        with self._lock, self._conn:
+            if self.fts:
+                self._conn.execute("INSERT INTO lines_fts (lines_fts) VALUES ('delete-all')")
+            self._conn.execute("DELETE FROM words")
+            self._conn.execute("DELETE FROM lines")
+            self._conn.execute("DELETE FROM pages")
+            self._conn.execute("DELETE FROM meta")
+
+    # ─── Reading ──────────────────────────────────────────────────────────────
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def page_text(self, page):
+        """Whole page as one string, or None if it was never captured."""
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM pages WHERE page = ?", (page,)).fetchone()
+        return row[0] if row else None
+
+    def page_lines(self, page):
+        with self._lock:
+            rows = self._conn.execute("SELECT text FROM lines WHERE page = ? ORDER BY line_no",
+                                      (page,)).fetchall()
+        return [r[0] for r in rows]
+
+    def page_info(self, page):
+        """Capture time and mean confidence for a page, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT captured_at, confidence FROM pages WHERE page = ?",
+                                     (page,)).fetchone()
+        return {"captured_at": row[0], "confidence": row[1]} if row else None
+
+    def words(self, page, line):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT w.text, w.confidence, w.x0, w.y0, w.x1, w.y1 FROM words w "
+                "JOIN lines l ON l.id = w.line_id WHERE l.page = ? AND l.line_no = ? "
+                "ORDER BY w.word_no", (page, line)).fetchall()
+        return [{"text": t, "confidence": c, "bbox": (x0, y0, x1, y1)}
+                for t, c, x0, y0, x1, y1 in rows]
+
+    def search(self, query, limit=5):
+        """Lines matching every word of ``query`` (prefix match), best first."""
+        tokens = _TOKEN.findall(query.lower())
+        if not tokens:
+            return []
+        with self._lock:
+            if self.fts:
+                match = " ".join(f'"{t}"*' for t in tokens)
+                rows = self._conn.execute(
+                    "SELECT l.page, l.line_no, l.text FROM lines_fts "
+                    "JOIN lines l ON l.id = lines_fts.rowid "
+                    "WHERE lines_fts MATCH ? ORDER BY bm25(lines_fts), l.page, l.line_no LIMIT ?",
+                    (match, limit)).fetchall()
+            else:
+                where = " AND ".join("lower(text) LIKE ?" for _ in tokens)
+                rows = self._conn.execute(
+                    f"SELECT page, line_no, text FROM lines WHERE {where} "
+                    "ORDER BY page, line_no LIMIT ?",
+                    [f"%{t}%" for t in tokens] + [limit]).fetchall()
+        return [SearchHit(*row) for row in rows]
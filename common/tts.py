@@ -0,0 +1,338 @@
+import collections
+import heapq
+import itertools
+import os
+import tempfile
+import threading
+import time
+import wave
+
+import pyttsx3
+
+from common.audio_cache import ClipPlayer, clip_key, default_cache
+from common.metrics import get_metrics
+
+# ─── Priorities (lower value is spoken first) ──────────────────────────────────
+URGENT = 0   # barges in on whatever is playing
+HIGH   = 1
+NORMAL = 2
+LOW    = 3
+
+DEFAULT_RATE   = 150
+DEFAULT_VOLUME = 1.0
+MAX_PENDING    = 16
+MAX_CACHED_CHARS = 80  # longer text (page sentences) is rarely repeated: synthesized live, never rendered
+
+
+class Utterance:
+    def __init__(self, text, priority, seq, key=None, max_age=None, rate=None, group=None, lang=None):
+        self.text      = text
+        self.priority  = priority
+        self.seq       = seq
+        self.key       = key
+        self.group     = group
+        self.lang      = lang
+        self.max_age   = max_age
+        self.rate      = rate
+        self.created   = time.monotonic()
+        self.cancelled   = False
+        self.interrupted = False  # cut off part-way by an URGENT barge-in
+        self.done        = threading.Event()
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def is_stale(self, now=None):
+        if self.max_age is None:
+            return False
+        return ((now or time.monotonic()) - self.created) > self.max_age
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class SpeechService:
+    """One long-lived pyttsx3 engine fed by a bounded priority queue.
+
+    Utterances sharing a ``key`` coalesce: queueing a new one drops the pending
+    one, so only the latest label is announced. ``max_age`` drops utterances
+    that waited too long, and URGENT utterances interrupt the current one.
+    A ``group`` queues several utterances in order (no coalescing) that can
+    be cancelled together, as page reading does with its sentences.
+
+    Short phrases are rendered to WAV once (while the engine is idle) into
+    an audio cache; later they play straight from the clip, skipping
+    synthesis. ``prewarm`` renders known phrases ahead of time.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, volume=DEFAULT_VOLUME, max_pending=MAX_PENDING, cache=None):
+        self.rate        = rate
+        self.volume      = volume
+        self.max_pending = max_pending
+        self.cache       = cache if cache is not None else default_cache()
+        self._heap       = []
+        self._renders    = collections.deque()  # (text, rate, lang) to render when idle
+        self._player     = None
+        self._voice      = None
+        self._seq        = itertools.count()
+        self._cond       = threading.Condition()
+        self._current    = None
+        self._interrupt  = False
+        self._barge_in   = False  # the pending interrupt is an URGENT barge-in, not a cancel
+        self._cut        = False  # the engine was stopped mid-utterance
+        self._closed     = False
+        self._metrics    = get_metrics()
+        self._thread     = threading.Thread(target=self._run, name="tts", daemon=True)
+        self._thread.start()
+
+    # ─── Public API ───────────────────────────────────────────────────────────
+    def speak(self, text, priority=NORMAL, key=None, max_age=None, rate=None, group=None, lang=None):
+        """Queue ``text`` and return its Utterance, or None if it was rejected."""
+        if not text:
+            return None
+        with self._cond:
+            if self._closed:
+                return None
+            utt = Utterance(text, priority, next(self._seq), key, max_age, rate, group, lang)
+
+            if key is not None:
+                dropped = self._cancel_pending(lambda u: u.key == key)
+                if dropped:
+                    self._metrics.inc("tts.coalesced", dropped)
+
+            self._prune()
+            if len(self._heap) >= self.max_pending:
+                # Evict the least important pending item, or reject this one
+                worst = max(self._heap)
+                if utt < worst:
+                    worst.cancelled = True
+                    worst.done.set()
+                    self._prune()
+                else:
+                    self._metrics.inc("tts.rejected")
+                    return None
+
+            heapq.heappush(self._heap, utt)
+            if self._current is not None and priority == URGENT and utt < self._current:
+                self._interrupt = True
+                self._barge_in  = True
+                self._metrics.inc("tts.barge_in")
+            self._cond.notify()
+            return utt
+
+    def prewarm(self, texts, rate=None, lang=None):
+        """Render ``texts`` into the audio cache in the background, when idle."""
+        if self.cache is None:
+            return
+        with self._cond:
+            for text in texts:
+                self._queue_render(text, rate, lang)
+            self._cond.notify()
+
+    def cancel(self, key):
+        """Drop pending utterances with ``key`` and cut off a playing one."""
+        with self._cond:
+            self._cancel_pending(lambda u: u.key == key)
+            if self._current is not None and self._current.key == key:
+                self._interrupt = True
+
+    def cancel_group(self, group):
+        """Drop every pending utterance in ``group`` and cut off a playing one."""
+        with self._cond:
+            self._cancel_pending(lambda u: u.group == group)
+            if self._current is not None and self._current.group == group:
+                self._interrupt = True
+
+    def stop(self):
+        """Silence the engine and discard everything queued."""
+        with self._cond:
+            self._cancel_pending(lambda u: True)
+            if self._current is not None:
+                self._interrupt = True
+
+    def flush(self, timeout=None):
+        """Block until the queue is empty and nothing is playing."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._heap or self._current is not None:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=2.0):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def is_busy(self):
+        with self._cond:
+            return bool(self._heap) or self._current is not None
+
+    # ─── Queue internals (caller holds the lock) ──────────────────────────────
+    def _queue_render(self, text, rate, lang):
+        job = (text, rate, lang)
+        if self.cache is not None and text and len(text) <= MAX_CACHED_CHARS and job not in self._renders:
+            self._renders.append(job)
+
+    def _cancel_pending(self, match):
+        dropped = 0
+        for u in self._heap:
+            if match(u) and not u.cancelled:
+                u.cancelled = True
+                u.done.set()
+                dropped += 1
+        self._prune()
+        return dropped
+
+    def _prune(self):
+        live = [u for u in self._heap if not u.cancelled]
+        if len(live) != len(self._heap):
+            self._heap = live
+            heapq.heapify(self._heap)
+
+    def _next(self):
+        with self._cond:
+            while True:
+                while not self._heap and not self._renders and not self._closed:
+                    self._cond.wait()
+                if not self._heap:
+                    if self._closed:
+                        return None
+                    return self._renders.popleft()  # idle: render a clip for later
+                utt = heapq.heappop(self._heap)
+                if utt.cancelled:
+                    continue
+                if utt.is_stale():
+                    utt.cancelled = True
+                    utt.done.set()
+                    self._metrics.inc("tts.stale")
+                    continue
+                self._metrics.observe("tts.queue_delay", time.monotonic() - utt.created)
+                self._current   = utt
+                self._interrupt = False
+                self._barge_in  = False
+                return utt
+
+    # ─── Worker ───────────────────────────────────────────────────────────────
+    def _init_engine(self):
+        try:
+            engine = pyttsx3.init()
+            engine.setProperty('rate', self.rate)
+            engine.setProperty('volume', self.volume)
+            engine.connect('started-word', self._on_word)
+            self._voice = engine.getProperty('voice')
+            return engine
+        except Exception as e:
+            print(f"[TTS Error]: {e}")
+            return None
+
+    def _init_player(self):
+        if self.cache is None:
+            return
+        try:
+            self._player = ClipPlayer()
+        except Exception as e:  # no PyAudio or no output device: synthesize every time
+            print(f"[TTS] Clip playback unavailable, audio cache disabled: {e}")
+            self.cache = None
+
+    def _clip_key(self, text, rate, lang):
+        return clip_key(text, self._voice, rate or self.rate, lang or "en")
+
+    def _on_word(self, name, location, length):
+        # Runs on the engine's loop, the only safe place to call engine.stop()
+        if self._interrupt:
+            self._cut = True
+            self._engine.stop()
+
+    def _say(self, utt):
+        """Speak ``utt``; returns False if it was cut off before the end."""
+        clip = None
+        if self.cache is not None:
+            key = self._clip_key(utt.text, utt.rate, utt.lang)
+            clip = self.cache.get(key)
+            self._metrics.inc("tts.cache_hits" if clip else "tts.cache_misses")
+        if clip:
+            return self._player.play(clip, lambda: self._interrupt)
+        if self._engine is None:
+            self._engine = self._init_engine()
+        if self._engine is None:
+            return True
+        self._cut = False
+        self._engine.setProperty('rate', utt.rate or self.rate)
+        self._engine.say(utt.text)
+        self._engine.runAndWait()
+        if self._cut:
+            return False
+        with self._cond:
+            self._queue_render(utt.text, utt.rate, utt.lang)
+        return True
+
+    def _render(self, text, rate, lang):
+        if self.cache is None or self._engine is None:
+            return
+        key = self._clip_key(text, rate, lang)
+        if key in self.cache:
+            return
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        try:
+            with self._metrics.time("tts.render"):
+                self._engine.setProperty('rate', rate or self.rate)
+                self._engine.save_to_file(text, path)
+                self._engine.runAndWait()
+            with open(path, "rb") as f:
+                data = f.read()
+            with wave.open(path, "rb"):
+                pass  # some platform drivers write AIFF; only cache real WAV
+            self.cache.put(key, data)
+        except (wave.Error, EOFError) as e:
+            print(f"[TTS] Engine does not render WAV ({e}); audio cache disabled.")
+            self.cache = None
+        except Exception as e:
+            print(f"[TTS Error]: {e}")
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _run(self):
+        self._engine = self._init_engine()
+        self._init_player()
+        while True:
+            item = self._next()
+            if item is None:
+                break
+            if not isinstance(item, Utterance):
+                self._render(*item)
+                continue
+            utt = item
+            finished = True
+            try:
+                finished = self._say(utt)
+            except Exception as e:
+                print(f"[TTS Error]: {e}")
+                self._engine = None
+            finally:
+                with self._cond:
+                    utt.interrupted = not finished and self._barge_in
+                    self._current   = None
+                    self._interrupt = False
+                    self._barge_in  = False
+                    self._cond.notify_all()
+                utt.done.set()
+
+
+# ─── Process-wide instance ────────────────────────────────────────────────────
+_service      = None
+_service_lock = threading.Lock()
+
+def get_speech_service():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = SpeechService()
+        return _service
@@ -1,187 +1,422 @@
 import os
 import sys
-import subprocess
-import time
 import re
-import threading
+import time
+import asyncio
+import argparse
 
 from chatbot.voice_chatbot import listen_command
+from chatbot.grammar import LANGUAGES
+from easyocr_module.translator import get_translator, TranslationUnavailable
 from point_object_module.scripts.audio_feedback import AudioFeedback
+from common.tts import URGENT, HIGH
+from common.page_store import PageStore
+from common.page_reader import PageReader
+from common.control import ControlClient, CAPTURE, STOP, STATUS, PING, ACTIVATE, DEACTIVATE
 
 # ─── Constants & Paths ─────────────────────────────────────────────────────────
-OCR_DIR           = "easyocr_module"
-POINT_DIR         = "point_object_module"
-OCR_CAPTURE_FILE  = os.path.join(OCR_DIR,   "capture_trigger.txt")
-OCR_STOP_FILE     = os.path.join(OCR_DIR,   "stop_ocr.txt")
-POINT_STOP_FILE   = os.path.join(".",       "stop_pointer.txt")
-PAGE_FOLDER       = "pages"
+ROOT_DIR           = os.path.dirname(os.path.abspath(__file__))
+OCR_DIR            = os.path.join(ROOT_DIR, "easyocr_module")
+POINT_DIR          = os.path.join(ROOT_DIR, "point_object_module")
+PAGE_DB            = os.path.join(OCR_DIR, "pages", "pages.db")  # whatever the working directory
+STOP_ACK_TIMEOUT   = 5   # seconds to acknowledge a stop
+STOP_EXIT_TIMEOUT  = 5   # seconds to exit after acknowledging, before kill
+HOST_NAME          = "host"
+HOST_START_TIMEOUT = 30  # seconds; first start imports torch
+HEALTH_INTERVAL    = 3   # seconds between liveness pings
+HEALTH_FAILURES    = 3   # consecutive missed pings before a module counts as hung
+MAX_RESTARTS       = 3   # automatic restarts allowed per RESTART_WINDOW
+RESTART_WINDOW     = 60  # seconds
 
-# ─── Reader Thread State ───────────────────────────────────────────────────────
-_current_reader = None
-_reader_lock    = threading.Lock()
+# Fixed prompts, rendered into the audio cache at startup
+PROMPTS = (
+    "Controller active.", "Starting reader.", "Starting pointer.", "Capturing image now.",
+    "Text reader is not ready yet.", "Text reader is not running. Please start reader first.",
+    "Stopping pointer before starting reader.", "Stopping reader before starting pointer.",
+    "Object detection is already running.", "All modules stopped.", "Exiting controller.",
+    "Say find, followed by a word.", "Text reader is not running.", "Object detection is not running.",
+    "Translation is not available.",
+)
+
+# ─── Resident Mode (set from the command line) ────────────────────────────────
+RESIDENT_MODE      = False
+MAX_MODELS         = None
 
 # ─── Globals ───────────────────────────────────────────────────────────────────
-running_processes = {}
-audio_feedback    = AudioFeedback()
+audio_feedback     = AudioFeedback()
+page_store         = PageStore(PAGE_DB)
+page_reader        = PageReader(page_store, audio_feedback,
+                                translate=lambda text, lang: get_translator().translate_sentences(text, lang))
+modules            = {}  # "ocr" / "point" -> ModuleProcess or HostedPipeline
 
 # ─── TTS Helpers ───────────────────────────────────────────────────────────────
-def speak(msg: str):
-    audio_feedback.speak(msg)
+def speak(msg: str, priority=HIGH):
+    # Ahead of queued page reading; URGENT cuts off whatever is playing
+    audio_feedback.speak(msg, priority=priority)
 
-def tts_stop():
-    if hasattr(audio_feedback, "stop"):
-        audio_feedback.stop()
-    elif hasattr(audio_feedback, "engine") and hasattr(audio_feedback.engine, "stop"):
-        audio_feedback.engine.stop()
+# ─── Module Supervision ────────────────────────────────────────────────────────
+class ModuleProcess:
+    """Supervises one module subprocess.
+
+    Spawns it, notices exit the moment it happens, pings it over the
+    control channel, stops it gracefully with a timeout before killing,
+    and restarts it (with backoff) if it crashes or hangs.
+    """
+
+    def __init__(self, name, argv, cwd=None, label=None, auto_restart=True):
+        self.name         = name
+        self.argv         = argv
+        self.cwd          = cwd
+        self.label        = label or name
+        self.auto_restart = auto_restart
+        self.proc         = None
+        self.client       = ControlClient(name)
+        self.probe        = ControlClient(name)  # own connection, never queued behind a slow command
+        self._stopping    = False
+        self._restarts    = []
+        self._lock        = asyncio.Lock()
+        self._tasks       = []
+        self._restarting  = None  # task waiting out the backoff before a respawn
+
+    @property
+    def running(self):
+        return self.proc is not None and self.proc.returncode is None
+
+    async def send(self, kind, timeout=2.0, **args):
+        """Request/ack over the control channel without blocking the event loop."""
+        return await asyncio.to_thread(self.client.request, kind, timeout, **args)
+
+    async def start(self):
+        async with self._lock:
+            if self.running:
+                return False
+            await self._spawn()
+            return True
+
+    async def _spawn(self):
+        self._stopping = False
+        self.client.close()
+        self.probe.close()
+        self.proc = await asyncio.create_subprocess_exec(sys.executable, *self.argv, cwd=self.cwd)
+        self._tasks = [asyncio.create_task(self._watch(self.proc)),
+                       asyncio.create_task(self._health(self.proc))]
+
+    async def stop(self):
+        async with self._lock:
+            # A crashed module waiting to be restarted counts as running: cancel the restart
+            restart, self._restarting = self._restarting, None
+            if restart is not None and not restart.done():
+                restart.cancel()
+                if not self.running:
+                    return True
+            if not self.running:
+                return False
+            self._stopping = True
+            proc = self.proc
+            if await self.send(STOP, timeout=STOP_ACK_TIMEOUT) is None:
+                print(f"[Controller] {self.label} did not acknowledge stop; terminating.")
+                proc.terminate()
+            try:
+                await asyncio.wait_for(proc.wait(), STOP_EXIT_TIMEOUT)
+            except asyncio.TimeoutError:
+                print(f"[Controller] {self.label} did not exit; killing.")
+                proc.kill()
+                await proc.wait()
+            self.client.close()
+            self.probe.close()
+            return True
+
+    async def _watch(self, proc):
+        code = await proc.wait()
+        if self._stopping or proc is not self.proc:
+            return
+        print(f"[Controller] {self.label} exited unexpectedly with code {code}.")
+        await self._restart(f"{self.label} stopped unexpectedly.")
+
+    async def _health(self, proc):
+        # Until the first answer the module may still be importing models
+        failures, answered = 0, False
+        started = time.monotonic()
+        while proc.returncode is None and not self._stopping:
+            await asyncio.sleep(HEALTH_INTERVAL)
+            if proc.returncode is not None or self._stopping:
+                return
+            if await asyncio.to_thread(self.probe.request, PING, 2.0):
+                failures, answered = 0, True
+            elif answered or time.monotonic() - started > HOST_START_TIMEOUT:
+                failures += 1
+            if failures >= HEALTH_FAILURES:
+                print(f"[Controller] {self.label} is not responding; killing.")
+                proc.kill()  # _watch sees the exit and restarts
+                return
 
-# ─── Single‑Page Read Worker & Control ─────────────────────────────────────────
-def _read_page_worker(n: int):
-    path = os.path.join(OCR_DIR, PAGE_FOLDER, f"page{n}.txt")
-    if not os.path.exists(path):
+    async def _restart(self, reason):
+        now = time.monotonic()
+        self._restarts = [t for t in self._restarts if now - t < RESTART_WINDOW]
+        if not self.auto_restart or len(self._restarts) >= MAX_RESTARTS:
+            speak(f"{reason} Please start it again.", URGENT)
+            return
+        self._restarts.append(now)
+        speak(f"{reason} Restarting.", URGENT)
+        self._restarting = asyncio.current_task()  # stop() cancels it
+        try:
+            await asyncio.sleep(len(self._restarts))  # simple linear backoff
+            async with self._lock:
+                if self._restarting is asyncio.current_task() and not self.running:
+                    await self._spawn()
+        finally:
+            if self._restarting is asyncio.current_task():
+                self._restarting = None
+
+
+class HostedPipeline:
+    """Same interface as ModuleProcess for a pipeline inside the resident host."""
+
+    def __init__(self, name, host, label=None):
+        self.name    = name
+        self.host    = host
+        self.label   = label or name
+        self.active  = False
+
+    @property
+    def running(self):
+        return self.active and self.host.running
+
+    async def send(self, kind, timeout=2.0, **args):
+        return await self.host.send(kind, timeout, pipeline=self.name, **args)
+
+    async def start(self):
+        if self.running:
+            return False
+        await self.host.start()
+        reply = await self.host.send(ACTIVATE, timeout=HOST_START_TIMEOUT, pipeline=self.name)
+        self.active = bool(reply and reply.get("ok"))
+        return self.active
+
+    async def stop(self):
+        if not self.running:
+            self.active = False
+            return False
+        self.active = False
+        await self.send(STOP, timeout=STOP_ACK_TIMEOUT)
+        await self.host.send(DEACTIVATE, timeout=STOP_ACK_TIMEOUT + STOP_EXIT_TIMEOUT, pipeline=self.name)
+        return True
+
+    async def check(self):
+        """Re-activate the pipeline if the host reports it died."""
+        if not self.running:
+            return
+        reply = await self.host.send(STATUS, timeout=2.0)
+        if reply and self.name not in reply.get("active", []):
+            speak(f"{self.label} stopped unexpectedly. Restarting.", URGENT)
+            await self.host.send(ACTIVATE, timeout=HOST_START_TIMEOUT, pipeline=self.name)
+
+
+def build_modules():
+    if RESIDENT_MODE:
+        argv = ["resident_host.py"] + (["--max-models", str(MAX_MODELS)] if MAX_MODELS else [])
+        host = ModuleProcess(HOST_NAME, argv, cwd=ROOT_DIR, label="Model host")
+        return {"ocr": HostedPipeline("ocr", host, "Text reader"),
+                "point": HostedPipeline("point", host, "Object detection")}, host
+    return {"ocr": ModuleProcess("ocr", ["easyocr_main.py"], cwd=OCR_DIR, label="Text reader"),
+            "point": ModuleProcess("point", ["point_detection_main.py"], cwd=POINT_DIR,
+                                   label="Object detection")}, None
+
+# ─── Page Reading ──────────────────────────────────────────────────────────────
+def start_read_page(n: int, line: int = 1):
+    if not page_reader.read(n, line):
+        page_reader.stop()
         speak(f"Page {n} not found.")
+
+async def read_translated_page(n: int, language: str):
+    speak(f"Translating page {n} to {language}.")
+    try:
+        # Translation may go over the network; the command loop keeps listening
+        found = await asyncio.to_thread(page_reader.read, n, 1, LANGUAGES[language])
+    except TranslationUnavailable as e:
+        print(f"[Controller] {e}")
+        speak("Translation is not available.")
         return
-    with open(path, "r", encoding="utf-8") as f:
-        text = f.read().strip()
-    if not text:
-        speak(f"Page {n} is empty.")
-    else:
-        speak(text)
-
-def start_read_page(n: int):
-    global _current_reader
-    with _reader_lock:
-        if _current_reader and _current_reader.is_alive():
-            tts_stop()
-            _current_reader.join()
-        _current_reader = threading.Thread(
-            target=_read_page_worker,
-            args=(n,),
-            daemon=True
-        )
-        _current_reader.start()
-
-# ─── Pages Cleanup ─────────────────────────────────────────────────────────────
-def clear_pages():
-    folder = os.path.join(OCR_DIR, PAGE_FOLDER)
-    if os.path.isdir(folder):
-        for fn in os.listdir(folder):
-            if fn.startswith("page") and fn.endswith(".txt"):
-                try:
-                    os.remove(os.path.join(folder, fn))
-                except OSError:
-                    pass
-
-# ─── Process Launchers ─────────────────────────────────────────────────────────
-def run_easyocr():
-    return subprocess.Popen([sys.executable, "easyocr_main.py"], cwd=OCR_DIR)
-
-def run_point_detector():
-    return subprocess.Popen([sys.executable, "point_detection_main.py"], cwd=POINT_DIR)
-
-# ─── Process Stoppers ──────────────────────────────────────────────────────────
-def stop_easyocr(silent=False):
-    p = running_processes.get("ocr")
-    if not p or p.poll() is not None:
-        if not silent:
-            speak("Text reader is not running.")
-        return
-    open(OCR_STOP_FILE, "w").write("stop")
-    p.wait()
-    del running_processes["ocr"]
-    if os.path.exists(OCR_STOP_FILE):
-        os.remove(OCR_STOP_FILE)
-
-def stop_point_detector(silent=False):
-    p = running_processes.get("point")
-    if not p or p.poll() is not None:
-        if not silent:
-            speak("Object detection is not running.")
+    if not found:
+        page_reader.stop()
+        speak(f"Page {n} not found.")
+
+async def read_next_page():
+    page, _ = page_reader.bookmark()
+    if not await asyncio.to_thread(page_reader.next_page):  # translates if the page was
+        speak(f"Page {page + 1} not found." if page else "No page is being read.")
+
+# ─── Page Search ───────────────────────────────────────────────────────────────
+async def find(query: str):
+    hits = await asyncio.to_thread(page_store.search, query, 1)
+    if not hits:
+        speak(f"{query} not found.")
         return
-    open(POINT_STOP_FILE, "w").write("stop")
-    p.wait()
-    del running_processes["point"]
-    if os.path.exists(POINT_STOP_FILE):
-        os.remove(POINT_STOP_FILE)
-        
-def stop_all(silent=False):
-    stop_easyocr(silent=True)
-    stop_point_detector(silent=True)
+    hit = hits[0]
+    speak(f"Found {query} on page {hit.page}, line {hit.line}.")
+    start_read_page(hit.page, hit.line)
+
+# ─── Module Commands ───────────────────────────────────────────────────────────
+async def stop_module(name, silent=False):
+    module = modules[name]
+    if not await module.stop() and not silent:
+        speak(f"{module.label} is not running.")
+
+async def stop_all(silent=False):
+    await asyncio.gather(stop_module("ocr", silent=True), stop_module("point", silent=True))
     if not silent:
         speak("All modules stopped.")
 
+async def start_reader():
+    # stop pointer if running
+    if modules["point"].running:
+        speak("Stopping pointer before starting reader.")
+        await stop_module("point")
+    # clear old pages
+    page_reader.stop()
+    await asyncio.to_thread(page_store.clear)
+    # launch the OCR module
+    speak("Starting reader.")
+    await modules["ocr"].start()
+
+async def capture():
+    if not modules["ocr"].running:
+        speak("Text reader is not running. Please start reader first.")
+        return
+    if await modules["ocr"].send(CAPTURE) is not None:
+        speak("Capturing image now.")
+    else:
+        speak("Text reader is not ready yet.")
+
+async def start_pointer():
+    if modules["ocr"].running:
+        speak("Stopping reader before starting pointer.")
+        await stop_module("ocr", silent=True)
+    if not modules["point"].running:
+        speak("Starting pointer.")
+        await modules["point"].start()
+    else:
+        speak("Object detection is already running.")
+
+# ─── Command Dispatch ──────────────────────────────────────────────────────────
+def route(cmd):
+    """Map a recognized phrase to a coroutine (or None to exit, False to ignore)."""
+    m = re.search(r"translate page (\d+) to (\w+)", cmd)
+    if m and m.group(2) in LANGUAGES:
+        return read_translated_page(int(m.group(1)), m.group(2))
+    m = re.search(r"read page (\d+)", cmd)
+    if m:
+        start_read_page(int(m.group(1)))
+        return False
+    if cmd == "read next page":
+        return read_next_page()
+    if cmd == "stop":
+        # Silence: end page reading and drop everything queued or playing
+        page_reader.stop()
+        audio_feedback.stop()
+        return False
+    if cmd == "pause":
+        page_reader.pause()
+        return False
+    if cmd == "resume":
+        page_reader.resume()
+        return False
+    if cmd == "next sentence":
+        page_reader.next_sentence()
+        return False
+    if cmd == "repeat":
+        page_reader.repeat()
+        return False
+    m = re.match(r"find (.+)", cmd)
+    if m:
+        return find(m.group(1))
+    if cmd == "find":
+        speak("Say find, followed by a word.")
+        return False
+
+    if any(phrase in cmd for phrase in ("start reader", "read text", "start read", "chart reader")):
+        return start_reader()
+    if "capture" in cmd:
+        return capture()
+    if "stop reader" in cmd or "stop ocr" in cmd:
+        return stop_module("ocr")
+    if any(phrase in cmd for phrase in ("start pointer", "start object")):
+        return start_pointer()
+    if any(phrase in cmd for phrase in ("stop pointer", "stop object")):
+        return stop_module("point")
+    if cmd == "stop all":
+        return stop_all()
+    if cmd in ("exit", "quit"):
+        return None
+    return False
+
+async def _run_serialized(lock, coro):
+    # Lifecycle commands apply in the order spoken, but in the background
+    async with lock:
+        try:
+            await coro
+        except Exception as e:
+            print(f"[Controller] Command failed: {e}")
+
+async def voice_input(commands: asyncio.Queue):
+    # listen_command blocks on the microphone stream, so it lives in a thread
+    while True:
+        cmd = await asyncio.to_thread(listen_command)
+        if cmd:
+            await commands.put(cmd)
+
+async def pipeline_health(host):
+    while True:
+        await asyncio.sleep(HEALTH_INTERVAL)
+        for module in modules.values():
+            if isinstance(module, HostedPipeline):
+                await module.check()
+
 # ─── Main Controller Loop ─────────────────────────────────────────────────────
-def main():
+async def main():
+    global modules
+    modules, host = build_modules()
     speak("Controller active.")
+    audio_feedback.prewarm(PROMPTS)
 
-    while True:
-        cmd = listen_command()
-        if not cmd:
-            time.sleep(0.3)
-            continue
-
-        cmd = cmd.lower().strip()
-        print(f"Command received: '{cmd}'")
-
-        m = re.search(r"read page (\d+)", cmd)
-        if m:
-            start_read_page(int(m.group(1)))
-            continue
-
-        # ─── Start Reader ──────────────────────────────────────
-        if any(phrase in cmd for phrase in ("start reader", "read text", "start read", "chart reader")):
-            # stop pointer if running
-            if "point" in running_processes:
-                speak("Stopping pointer before starting reader.")
-                stop_point_detector()
-            # clear old pages
-            clear_pages()
-            # launch the OCR module
-            speak("Starting reader.")
-            running_processes["ocr"] = run_easyocr()
-            continue
-
-        # ─── Capture Image ─────────────────────────────────────
-        if "capture" in cmd:
-            if "ocr" in running_processes:
-                speak("Capturing image now.")
-                open(OCR_CAPTURE_FILE, "w").write("go")
-            else:
-                speak("Text reader is not running. Please start reader first.")
-            continue
-
-        # ─── Stop Reader ───────────────────────────────────────
-        if "stop reader" in cmd or "stop ocr" in cmd:
-            stop_easyocr()
-            continue
-
-        # ─── Pointer Controls ──────────────────────────────────
-        if any(phrase in cmd for phrase in ("start pointer", "start object")):
-            if "ocr" in running_processes:
-                speak("Stopping reader before starting pointer.")
-                stop_easyocr(silent=True)
-            if "point" not in running_processes:
-                speak("Starting pointer.")
-                running_processes["point"] = run_point_detector()
-            else:
-                speak("Object detection is already running.")
-            continue
-
-        if any(phrase in cmd for phrase in ("stop pointer", "stop object")):
-            stop_point_detector()
-            continue
-
-        # ─── Stop All & Exit ───────────────────────────────────
-        if cmd in ("stop all"):
-            stop_all()
-            continue
-
-        if cmd in ("exit", "quit"):
-            stop_all(silent=True)
-            speak("Exiting controller.")
-            time.sleep(2)
-            break
-
-        time.sleep(0.3)
+    commands = asyncio.Queue()
+    lifecycle_lock = asyncio.Lock()
+    pending = set()  # the loop only holds weak references to tasks
+    background = [asyncio.create_task(voice_input(commands))]
+    if host:
+        background.append(asyncio.create_task(pipeline_health(host)))
+
+    try:
+        while True:
+            cmd = (await commands.get()).lower().strip()
+            print(f"Command received: '{cmd}'")
+
+            action = route(cmd)
+            if action is None:
+                break
+            if action:
+                task = asyncio.create_task(_run_serialized(lifecycle_lock, action))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+    finally:
+        for task in background:
+            task.cancel()
+        async with lifecycle_lock:
+            await stop_all(silent=True)
+            if host:
+                await host.stop()
+        page_reader.stop()
+        speak("Exiting controller.")
+        await asyncio.to_thread(audio_feedback.flush, 3)
+        page_store.close()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Voice controller for the reader and pointer.")
+    parser.add_argument("--resident", action="store_true",
+                        help="keep models warm in one host process across mode switches")
+    parser.add_argument("--max-models", type=int, default=None,
+                        help="with --resident, keep at most N models loaded")
+    args = parser.parse_args()
+    RESIDENT_MODE = args.resident
+    MAX_MODELS    = args.max_models
+    asyncio.run(main())
@@ -0,0 +1,220 @@
+import os
+import re
+import sys
+import time
+import argparse
+import collections
+import multiprocessing
+
+import cv2
+import numpy as np
+
+# ─── Ensure module and shared packages are importable ─────────────────────────
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(script_dir))  # shared `common` package
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)
+
+from ocr       import extract_lines
+from ocr_cache import diff_image, changed_pixels, SAME_PAGE_FRACTION
+from common.frame_source import IMAGE_EXTS, VideoFileSource
+from common.page_store import PageStore
+from common.inference import THREADS_ENV, set_torch_threads
+
+# ─── Constants ────────────────────────────────────────────────────────────────
+BULK_DB          = os.path.join(script_dir, "pages", "bulk.db")  # not the live-capture store the controller clears
+VIDEO_EXTS       = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+PDF_DPI          = 200
+MOTION_THRESHOLD = 2.0   # mean grey-level change per frame while the page is at rest
+STABLE_FRAMES    = 8     # still frames in a row before a page counts as settled
+MIN_SHARPNESS    = 40.0  # variance of the Laplacian; blurrier settled pages are skipped
+IN_FLIGHT        = 2     # pages queued per worker; bounds memory for video sources
+PROGRESS_EVERY   = 1.0   # seconds between progress lines
+
+# ─── Page Sources ─────────────────────────────────────────────────────────────
+def natural_key(path):
+    """Sort key with numbers compared as numbers: page2 before page10."""
+    return [int(part) if part.isdigit() else part.lower()
+            for part in re.split(r"(\d+)", os.path.basename(path))]
+
+def image_pages(folder):
+    """Paths of page images in ``folder`` (e.g. a PDF exported page by page)."""
+    return sorted((os.path.join(folder, name) for name in os.listdir(folder)
+                   if name.lower().endswith(IMAGE_EXTS)), key=natural_key)
+
+def pdf_pages(path, dpi=PDF_DPI):
+    try:
+        import fitz  # PyMuPDF; optional, only for reading PDFs directly
+    except ImportError:
+        raise SystemExit("Reading a PDF needs PyMuPDF (pip install pymupdf); "
+                         "or pass a folder of page images exported from it.")
+    with fitz.open(path) as doc:
+        for page in doc:
+            pix = page.get_pixmap(dpi=dpi)
+            pixels = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+            code = cv2.COLOR_RGBA2BGR if pix.n == 4 else cv2.COLOR_RGB2BGR
+            yield cv2.cvtColor(pixels, code) if pix.n in (3, 4) else cv2.cvtColor(pixels, cv2.COLOR_GRAY2BGR)
+
+def sharpness(gray):
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+
+class PageTurnSelector:
+    """Picks one frame per page from a video of pages being turned.
+
+    Frames are compared with their predecessor at low resolution; once
+    the picture has held still for ``stable_frames`` the page has
+    settled, and when motion resumes (the next turn) the sharpest frame
+    of that still run is emitted, unless it shows the same page as the
+    last one emitted.
+    """
+
+    def __init__(self, stable_frames=STABLE_FRAMES, motion_threshold=MOTION_THRESHOLD,
+                 min_sharpness=MIN_SHARPNESS):
+        self.stable_frames    = stable_frames
+        self.motion_threshold = motion_threshold
+        self.min_sharpness    = min_sharpness
+        self._previous        = None
+        self._still           = 0
+        self._best            = None  # (sharpness, frame, small) of the current still run
+        self._last_page       = None  # small image of the last page emitted
+
+    def feed(self, frame):
+        """Return the chosen frame of a page that just ended, or None."""
+        small, _ = diff_image(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY))
+        previous, self._previous = self._previous, small
+        if previous is not None and previous.shape == small.shape:
+            motion = float(cv2.absdiff(small, previous).mean())
+        else:
+            motion = float("inf")
+
+        if motion < self.motion_threshold:
+            self._still += 1
+            score = sharpness(small)
+            if self._best is None or score > self._best[0]:
+                self._best = (score, frame.copy(), small)
+            return None
+        return self._end_run()
+
+    def finish(self):
+        return self._end_run()
+
+    def _end_run(self):
+        best, settled = self._best, self._still >= self.stable_frames
+        self._best, self._still = None, 0
+        if best is None or not settled or best[0] < self.min_sharpness:
+            return None
+        score, frame, small = best
+        if self._last_page is not None and self._last_page.shape == small.shape:
+            mask, _ = changed_pixels(self._last_page, small)
+            if mask.mean() < SAME_PAGE_FRACTION:
+                return None  # held still twice on the same page
+        self._last_page = small
+        return frame
+
+def video_pages(path, selector=None):
+    selector = selector or PageTurnSelector()
+    source = VideoFileSource(path)
+    if not source.isOpened():
+        raise SystemExit(f"Cannot open video {path!r}")
+    try:
+        for frame in source:
+            page = selector.feed(frame)
+            if page is not None:
+                yield page
+        page = selector.finish()
+        if page is not None:
+            yield page
+    finally:
+        source.release()
+
+def open_pages(source):
+    """(pages, total) for a folder, PDF or video; total is None when unknown up front."""
+    if os.path.isdir(source):
+        paths = image_pages(source)
+        return paths, len(paths)
+    ext = os.path.splitext(source)[1].lower()
+    if ext == ".pdf":
+        return pdf_pages(source), None
+    if ext in VIDEO_EXTS:
+        return video_pages(source), None
+    raise SystemExit(f"Unsupported source {source!r}: expected an image folder, PDF or video")
+
+# ─── Worker Pool ──────────────────────────────────────────────────────────────
+def _init_worker(threads):
+    # Each worker loads its own reader; split the cores between them
+    cv2.setNumThreads(1)
+    os.environ[THREADS_ENV] = str(threads)  # ONNX Runtime / OpenVINO sessions too
+    set_torch_threads(threads)
+
+def _ocr_page(page):
+    frame = cv2.imread(page) if isinstance(page, str) else page
+    if frame is None:
+        return None
+    return extract_lines(frame)
+
+# ─── Main ─────────────────────────────────────────────────────────────────────
+def run(source, db=BULK_DB, workers=None, restart=False):
+    """OCR every page of ``source`` into the page store, in order; resumable."""
+    pages, total = open_pages(source)
+    workers = workers or os.cpu_count() or 1
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    store = PageStore(db)
+    job = f"bulk:{os.path.abspath(source)}"
+    done = int(store.get_meta(job, 0))
+    if restart and done:
+        removed = store.delete_pages(job)
+        store.set_meta({job: 0})
+        print(f"[Bulk] Restarting {source}: removed {removed} earlier pages.")
+        done = 0
+    elif done:
+        print(f"[Bulk] Resuming {source} after {done} pages.")
+
+    started = time.perf_counter()
+    last_report = started
+    recognized = empty = 0
+    pending = collections.deque()
+
+    def collect():
+        nonlocal recognized, empty, last_report
+        index, result = pending.popleft()
+        lines = result.get()
+        if lines:
+            store.add_page(lines, meta={job: index + 1}, source=job)
+            recognized += 1
+        else:
+            store.set_meta({job: index + 1})  # nothing readable; don't retry it on resume
+            empty += 1
+        now = time.perf_counter()
+        if now - last_report >= PROGRESS_EVERY:
+            last_report = now
+            of = f"/{total}" if total else ""
+            rate = (recognized + empty) / (now - started)
+            print(f"[Bulk] {index + 1}{of} pages, {empty} without text, {rate:.2f} pages/s")
+
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(threads,)) as pool:
+        for index, page in enumerate(pages):
+            if index < done:
+                continue
+            pending.append((index, pool.apply_async(_ocr_page, (page,))))
+            if len(pending) >= workers * IN_FLIGHT:
+                collect()
+        while pending:
+            collect()
+
+    elapsed = time.perf_counter() - started
+    processed = recognized + empty
+    rate = processed / elapsed if elapsed else 0.0
+    print(f"[Bulk] Done: {recognized} pages saved, {empty} without text, "
+          f"{elapsed:.1f}s, {rate:.2f} pages/s with {workers} workers.")
+    store.close()
+    return {"pages": recognized, "empty": empty, "seconds": elapsed, "pages_per_second": rate}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OCR a folder of page images, a PDF or a page-turning video.")
+    parser.add_argument("source", help="image folder (e.g. a PDF page dump), .pdf file or video")
+    parser.add_argument("--db", default=BULK_DB, help="page store to append to")
+    parser.add_argument("--workers", type=int, default=None, help="OCR processes (default: CPU cores)")
+    parser.add_argument("--restart", action="store_true", help="ignore earlier progress on this source")
+    args = parser.parse_args()
+    run(args.source, args.db, args.workers, args.restart)
@@ -1,14 +1,17 @@
-import cv2
+from common.frame_bus import get_frame_bus, release_frame_bus
+from common.frame_source import default_source
 
-def open_camera():
-    cap = cv2.VideoCapture(1)
-    return cap if cap.isOpened() else None
+def open_camera(source=None):
+    try:
+        return get_frame_bus(source if source is not None else default_source())
+    except RuntimeError:
+        return None
 
-def capture_frame(cap):
-    # Read multiple frames to flush buffer (optional but helps ensure freshness)
-    for _ in range(5):
-        ret, frame = cap.read()
-    if ret:
-        return frame
-    else:
-        return None
\ No newline at end of file
+def capture_frame(bus):
+    # Wait for a frame taken after the request instead of flushing a buffer
+    seq, frame = bus.fresh(timeout=1.0)
+    # OCR holds the frame for seconds, far longer than a ring slot lives
+    return frame.copy() if frame is not None else None
+
+def close_camera(bus):
+    release_frame_bus(bus.device)
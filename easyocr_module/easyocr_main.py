@@ -1,61 +1,110 @@
 import os
 import sys
-import time
+import argparse
 import cv2
 
-# ─── Ensure we’re in module directory ─────────────────────────────────────────
+# ─── Ensure module and shared packages are importable ─────────────────────────
 script_dir = os.path.dirname(os.path.abspath(__file__))
-os.chdir(script_dir)
+sys.path.insert(0, os.path.dirname(script_dir))  # shared `common` package
+if script_dir not in sys.path:
+    sys.path.insert(0, script_dir)  # imported from the resident host
 
-from camera import open_camera, capture_frame
-from ocr    import extract_text
-from speech import speak_text
+from camera import open_camera, capture_frame, close_camera
+from ocr_cache import CaptureOcr
+from remote_ocr import RemoteOcr
+from speech import speak_text, prewarm_text
+from translator import translate_text, TranslationUnavailable
+from common.control import ControlServer, CAPTURE, STOP, STATUS, READ_PAGE
+from common.inference_client import use_inference_server
+from common.page_store import PageStore
 
 # ─── Constants ────────────────────────────────────────────────────────────────
-CAPTURE_FILE = "capture_trigger.txt"
-STOP_FILE    = "stop_ocr.txt"
-PAGE_FOLDER  = "pages"
+PAGE_FOLDER  = os.path.join(script_dir, "pages")
+PAGE_DB      = os.path.join(PAGE_FOLDER, "pages.db")
+PREWARM_PAGES = 30  # "Page N saved." rendered ahead for the next N captures
+PROMPTS      = (
+    "Book Reader active", "Text reader stopped.", "Failed to capture frame. Check camera.",
+    "No text detected. Please adjust the camera.",
+)
 
-# ─── Setup ─────────────────────────────────────────────────────────────────────
-os.makedirs(PAGE_FOLDER, exist_ok=True)
-cap = open_camera()
-if not cap:
-    speak_text("Unable to access the camera. Exiting.", "en")
-    sys.exit(1)
+# ─── Main Loop ────────────────────────────────────────────────────────────────
+def main(commands=None, source=None):
+    """Run the book reader until a stop command arrives.
 
-speak_text("Book Reader active", "en")
-page_counter = 1
+    ``commands`` is the inbox to serve; standalone runs open their own
+    control socket, the resident host passes an in-process queue.
+    ``source`` is a frame_source spec; the configured camera by default.
+    """
+    store = PageStore(PAGE_DB)
+    page_ocr = RemoteOcr() if use_inference_server() else CaptureOcr()  # one reader for every station
+    cap = open_camera(source)
+    if not cap:
+        speak_text("Unable to access the camera. Exiting.", "en", wait=True)
+        store.close()
+        return 1
 
-# ─── Main Loop ────────────────────────────────────────────────────────────────
-while True:
-    # stop trigger
-    if os.path.exists(STOP_FILE):
-        speak_text("Text reader stopped.", "en")
-        os.remove(STOP_FILE)
-        break
-
-    # capture trigger
-    if os.path.exists(CAPTURE_FILE):
-        os.remove(CAPTURE_FILE)
-        print(f"[OCR] Capturing frame for Page {page_counter}…")
-        frame = capture_frame(cap)
-        if frame is None:
-            speak_text("Failed to capture frame. Check camera.", "en")
+    control = commands or ControlServer("ocr")
+    speak_text("Book Reader active", "en")
+    page_counter = store.count() + 1
+    prewarm_text(list(PROMPTS) + [f"Page {n} saved." for n in range(page_counter, page_counter + PREWARM_PAGES)])
+
+    for cmd in control:
+        if cmd.kind == STOP:
+            cmd.reply()
+            speak_text("Text reader stopped.", "en", wait=True)
+            break
+
+        if cmd.kind == STATUS:
+            cmd.reply(pages=page_counter - 1)
+            continue
+
+        if cmd.kind == READ_PAGE:
+            n = int(cmd.args.get("page", 0))
+            text = store.page_text(n)
+            lang = cmd.args.get("lang")
+            if text is not None and lang:
+                try:
+                    cmd.reply(page=n, text=translate_text(text, lang), lang=lang)
+                except TranslationUnavailable as e:
+                    cmd.reply(ok=False, error=str(e))
+            elif text is not None:
+                cmd.reply(page=n, text=text)
+            else:
+                cmd.reply(ok=False, error=f"Page {n} not found.")
             continue
 
-        text = extract_text(frame)
-        if text:
-            fn = os.path.join(PAGE_FOLDER, f"page{page_counter}.txt")
-            with open(fn, "w", encoding="utf-8") as f:
-                f.write(text)
-            print(f"[OCR] Saved text to {fn}")
-            speak_text(f"Page {page_counter} saved.", "en")
-            page_counter += 1
-        else:
-            speak_text("No text detected. Please adjust the camera.", "en")
-
-    time.sleep(0.2)
-
-# ─── Cleanup ───────────────────────────────────────────────────────────────────
-cap.release()
-cv2.destroyAllWindows()
+        if cmd.kind == CAPTURE:
+            cmd.reply(page=page_counter)  # acknowledge before the slow OCR pass
+            print(f"[OCR] Capturing frame for Page {page_counter}…")
+            frame = capture_frame(cap)
+            if frame is None:
+                speak_text("Failed to capture frame. Check camera.", "en")
+                continue
+
+            lines = page_ocr.extract_lines(frame)
+            if lines:
+                page = store.add_page(lines)
+                print(f"[OCR] Saved page {page} ({len(lines)} lines) to {PAGE_DB}")
+                speak_text(f"Page {page} saved.", "en")
+                page_counter = page + 1
+            else:
+                speak_text("No text detected. Please adjust the camera.", "en")
+            continue
+
+        cmd.reply(ok=False, error=f"Unknown command {cmd.kind!r}")
+
+    # ─── Cleanup ───────────────────────────────────────────────────────────────
+    if commands is None:
+        control.close()
+    if isinstance(page_ocr, RemoteOcr):
+        page_ocr.close()
+    close_camera(cap)
+    store.close()
+    cv2.destroyAllWindows()
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Voice-triggered book reader.")
+    parser.add_argument("--source", default=None,
+                        help="camera index, video file, image directory or synthetic[:WxH]")
+    sys.exit(main(source=parser.parse_args().source))
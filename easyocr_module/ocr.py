@@ -1,13 +1,163 @@
 import cv2
-import easyocr
+import numpy as np
 
-# Initialize OCR reader
-reader = easyocr.Reader(['en', 'hi'], recog_network='english_g2')
+from common.metrics import get_metrics
+from common.model_host import get_model_host
+from common.inference import inference_config
+from ocr_runtime import load_reader
 
-def extract_text(frame):
+TILE_SIZE        = 1280  # px; detection runs on native-resolution tiles up to this side
+TILE_OVERLAP     = 96    # px shared by neighbouring tiles, so no line is cut in both
+RECOGNIZE_BATCH  = 16    # line crops per recognizer forward pass
+MODEL_HEIGHT     = 64    # px; easyocr's recognizer input height
+MERGE_OVERLAP    = 0.5   # vertical overlap at which touching boxes are one line
+
+metrics = get_metrics()
+
+# Initialize OCR reader lazily through the shared model host; the recognizer's
+# backend follows SONIC_VISION_BACKEND/_INT8/_THREADS
+get_model_host().register("easyocr", lambda: load_reader(inference_config()), group="ocr")
+
+def group_lines(words):
+    """Group word dicts into reading-order lines by vertical overlap."""
+    lines = []
+    for word in sorted(words, key=lambda w: (w["bbox"][1] + w["bbox"][3]) / 2):
+        x0, y0, x1, y1 = word["bbox"]
+        centre = (y0 + y1) / 2
+        for line in lines:
+            if line["y0"] <= centre <= line["y1"]:
+                line["words"].append(word)
+                line["y0"], line["y1"] = min(line["y0"], y0), max(line["y1"], y1)
+                break
+        else:
+            lines.append({"words": [word], "y0": y0, "y1": y1})
+
+    out = []
+    for line in lines:
+        line_words = sorted(line["words"], key=lambda w: w["bbox"][0])
+        chars = sum(len(w["text"]) for w in line_words) or 1
+        out.append({
+            "text":       " ".join(w["text"] for w in line_words),
+            # Weighted by length: a confident long word outweighs a doubtful "a"
+            "confidence": sum(w["confidence"] * len(w["text"]) for w in line_words) / chars,
+            "words":      line_words,
+        })
+    return out
+
+def preprocess(frame):
+    """Full-resolution grayscale: the image detection tiles and line crops come from."""
     # Convert frame to grayscale for better OCR accuracy
-    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    resized = cv2.resize(gray, (640, 480))
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+def tiles(shape, size=TILE_SIZE, overlap=TILE_OVERLAP):
+    """(x0, y0, x1, y1) tiles covering an image of ``shape`` with ``overlap`` px shared."""
+    h, w = shape[:2]
+
+    def starts(extent):
+        if extent <= size:
+            return [0]
+        # Fewest tiles that keep the overlap, spread evenly
+        count = int(np.ceil((extent - overlap) / (size - overlap)))
+        return [int(round(s)) for s in np.linspace(0, extent - size, count)]
+
+    return [(x, y, min(x + size, w), min(y + size, h)) for y in starts(h) for x in starts(w)]
+
+def _same_line(a, b):
+    # Boxes that touch horizontally and share most of their height: a line
+    # cut by a tile edge, or seen whole in one tile and in part in the next
+    if min(a[2], b[2]) < max(a[0], b[0]):
+        return False
+    iy = min(a[3], b[3]) - max(a[1], b[1])
+    smaller = min(a[3] - a[1], b[3] - b[1])
+    return smaller > 0 and iy / smaller >= MERGE_OVERLAP
+
+def detect_lines(reader, image):
+    """Text-line boxes (x0, x1, y0, y1, as easyocr's horizontal_list) for ``image``.
 
-    result = reader.readtext(resized)
-    return " ".join([entry[1] for entry in result]) if result else None
+    Each tile is detected at native resolution, so small print survives
+    on large frames; pieces of a line split across tiles are merged.
+    """
+    boxes = []
+    for x0, y0, x1, y1 in tiles(image.shape):
+        tile = image[y0:y1, x0:x1]
+        horizontal, free = reader.detect(tile, canvas_size=max(tile.shape[:2]), mag_ratio=1.0)
+        for bx0, bx1, by0, by1 in horizontal[0]:
+            boxes.append((bx0 + x0, by0 + y0, bx1 + x0, by1 + y0))
+        for points in free[0]:  # rotated text: keep its bounding box
+            xs = [p[0] + x0 for p in points]
+            ys = [p[1] + y0 for p in points]
+            boxes.append((min(xs), min(ys), max(xs), max(ys)))
+
+    merged = []
+    for box in sorted(boxes):
+        for i, kept in enumerate(merged):
+            if _same_line(box, kept):
+                merged[i] = (min(box[0], kept[0]), min(box[1], kept[1]),
+                             max(box[2], kept[2]), max(box[3], kept[3]))
+                break
+        else:
+            merged.append(box)
+    h, w = image.shape[:2]
+    return [[max(int(x0), 0), min(int(x1), w), max(int(y0), 0), min(int(y1), h)]
+            for x0, y0, x1, y1 in merged]
+
+def recognize_lines(reader, image, boxes):
+    """[points, text, confidence] for each line box, RECOGNIZE_BATCH crops per pass.
+
+    easyocr's ``recognize`` runs one box per forward pass on CPU whatever
+    its ``batch_size``, so the crops are cut here and handed to its
+    ``get_text`` in batches, sorted by width so each batch pads little.
+    """
+    from easyocr.utils import get_image_list
+    from easyocr.recognition import get_text
+
+    crops, _ = get_image_list(boxes, [], image, model_height=MODEL_HEIGHT)
+    crops.sort(key=lambda item: item[1].shape[1])
+    ignore_char = "".join(set(reader.character) - set(reader.lang_char))
+    result = []
+    for i in range(0, len(crops), RECOGNIZE_BATCH):
+        batch = crops[i:i + RECOGNIZE_BATCH]
+        width = int(np.ceil(max(crop.shape[1] / crop.shape[0] for _, crop in batch))) * MODEL_HEIGHT
+        result += get_text(reader.character, MODEL_HEIGHT, width, reader.recognizer, reader.converter,
+                           batch, ignore_char, decoder="greedy", beamWidth=5, batch_size=len(batch),
+                           contrast_ths=0.1, adjust_contrast=0.5, filter_ths=0.003, workers=0,
+                           device=reader.device)
+    return result
+
+def read_words(image, origin=(0, 0), reader=None):
+    """Recognize ``image`` (full resolution, or a crop of it at ``origin``)
+    into word dicts with frame-pixel boxes."""
+    if reader is None:
+        with get_model_host().use("easyocr") as reader:
+            return read_words(image, origin, reader)
+    ox, oy = origin
+
+    with metrics.time("ocr.detect"):
+        boxes = detect_lines(reader, image)
+    if not boxes:
+        return []
+    with metrics.time("ocr.recognize_lines"):
+        # Crops come from the native-resolution image
+        result = recognize_lines(reader, image, boxes)
+    metrics.inc("ocr.lines", len(boxes))
+
+    words = []
+    for points, text, confidence in result:
+        if not text.strip():
+            continue
+        points = np.asarray(points, dtype=np.float32)
+        words.append({
+            "text":       text,
+            "confidence": float(confidence),
+            "bbox":       (int(points[:, 0].min() + ox), int(points[:, 1].min() + oy),
+                           int(points[:, 0].max() + ox), int(points[:, 1].max() + oy)),
+        })
+    return words
+
+def extract_lines(frame, reader=None):
+    """OCR a frame into lines of words with confidences and frame-pixel boxes."""
+    return group_lines(read_words(preprocess(frame), reader=reader))
+
+def extract_text(frame):
+    lines = extract_lines(frame)
+    return " ".join(line["text"] for line in lines) if lines else None
@@ -0,0 +1,226 @@
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from common.metrics import get_metrics
+from ocr import preprocess, read_words, group_lines
+
+DIFF_WIDTH         = 640     # px; pages are hashed and diffed at this width
+HASH_SIZE          = 16      # dHash grid: 256-bit fingerprint
+MAX_HASH_DISTANCE  = 24      # prefilter only; candidates are verified pixel-wise
+CACHE_SIZE         = 32      # pages remembered
+DIFF_THRESHOLD     = 1.5     # std devs of the page's own contrast; ignores exposure changes
+DIFF_DILATE        = 15      # px at DIFF_WIDTH; joins changed pixels into text regions
+MIN_REGION_AREA    = 150     # px; smaller changes are noise, not text
+SAME_PAGE_FRACTION = 0.0002  # changed pixels below this: the same page
+FULL_OCR_FRACTION  = 0.5     # above this a full pass beats many crops
+REGION_PAD         = 8       # px of context around each changed region
+
+
+def dhash(image, size=HASH_SIZE):
+    """Difference hash of a grayscale image as an int; near-duplicates differ in few bits."""
+    small = cv2.resize(image, (size + 1, size), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def diff_image(image, width=DIFF_WIDTH):
+    """``image`` scaled to ``width`` (aspect kept) and the factor back to full size."""
+    factor = image.shape[1] / width
+    if factor <= 1:
+        return image, 1.0
+    size = (width, int(round(image.shape[0] / factor)))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA), factor
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def changed_pixels(previous, current):
+    """Pixels of ``current`` that differ from ``previous`` once the small
+    camera shift between them is cancelled.
+
+    Both images are contrast-normalized, so a change in exposure is not a
+    change in content. Returns the mask (uint8, 1 = changed) and the
+    shift (dx, dy) that carries ``previous`` onto ``current``.
+    """
+    a = previous.astype(np.float32)
+    b = current.astype(np.float32)
+    a = (a - a.mean()) / max(float(a.std()), 1.0)
+    b = (b - b.mean()) / max(float(b.std()), 1.0)
+    (dx, dy), _ = cv2.phaseCorrelate(a, b)
+    h, w = b.shape
+    a = cv2.warpAffine(a, np.float32([[1, 0, dx], [0, 1, dy]]), (w, h), borderMode=cv2.BORDER_REPLICATE)
+    mask = (np.abs(b - a) > DIFF_THRESHOLD).astype(np.uint8)
+    # Erode away one-pixel edge residue left by sub-pixel alignment
+    return cv2.erode(mask, np.ones((3, 3), np.uint8)), (dx, dy)
+
+
+def shift_words(words, dx, dy):
+    """Copies of ``words`` with boxes moved by (dx, dy) frame pixels."""
+    if abs(dx) < 0.5 and abs(dy) < 0.5:
+        return list(words)
+    return [dict(w, bbox=(int(w["bbox"][0] + dx), int(w["bbox"][1] + dy),
+                          int(w["bbox"][2] + dx), int(w["bbox"][3] + dy))) for w in words]
+
+
+class OcrCache:
+    """Bounded LRU of OCR results keyed by perceptual hash.
+
+    The hash only shortlists candidates; a candidate is a hit when the
+    aligned pixel diff against its stored image shows no changed text,
+    so a re-capture of the same page under different light or slightly
+    moved still hits, while a page with one new word does not.
+    """
+
+    def __init__(self, capacity=CACHE_SIZE, max_distance=MAX_HASH_DISTANCE):
+        self.capacity     = capacity
+        self.max_distance = max_distance
+        self._entries     = OrderedDict()  # hash -> (diff image, words)
+
+    def lookup(self, key, image):
+        """Return (words, shift in ``image`` pixels) for the same page, or None."""
+        candidates = sorted((hamming(stored, key), stored) for stored in self._entries)
+        for distance, stored in candidates:
+            if distance > self.max_distance:
+                break
+            cached_image, words = self._entries[stored]
+            if cached_image.shape != image.shape:
+                continue
+            mask, shift = changed_pixels(cached_image, image)
+            if mask.mean() < SAME_PAGE_FRACTION:
+                self._entries.move_to_end(stored)
+                return words, shift
+        return None
+
+    def store(self, key, image, words):
+        self._entries[key] = (image, words)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+
+class CaptureOcr:
+    """OCR for successive captures: cached duplicates, incremental changes.
+
+    A capture of a page already in the cache returns its words without
+    running the reader. Otherwise, with ``incremental`` on, the frame is
+    diffed against the previous capture and only the changed regions are
+    re-recognized; words outside them are reused.
+    """
+
+    def __init__(self, cache=None, incremental=True):
+        self.cache       = cache if cache is not None else OcrCache()
+        self.incremental = incremental
+        self._previous   = None  # (diff image, factor, words) of the last capture
+        self._metrics    = get_metrics()
+
+    def extract_lines(self, frame):
+        image = preprocess(frame)
+        small, factor = diff_image(image)
+        key = dhash(small)
+
+        hit = self.cache.lookup(key, small)
+        if hit is not None:
+            self._metrics.inc("ocr.cache_hits")
+            words, (dx, dy) = hit
+            words = shift_words(words, dx * factor, dy * factor)
+        else:
+            self._metrics.inc("ocr.cache_misses")
+            with self._metrics.time("ocr.recognize"):
+                words = self._recognize(image, small, factor)
+            self.cache.store(key, small, words)
+
+        self._previous = (small, factor, words)
+        return group_lines(words)
+
+    def reset(self):
+        self._previous = None
+        self.cache.clear()
+
+    def _recognize(self, image, small, factor):
+        if not self.incremental or self._previous is None:
+            return read_words(image)
+        prev_small, prev_factor, prev_words = self._previous
+        if prev_small.shape != small.shape or prev_factor != factor:
+            return read_words(image)
+
+        mask, (dx, dy) = changed_pixels(prev_small, small)
+        changed = cv2.dilate(mask, np.ones((DIFF_DILATE, DIFF_DILATE), np.uint8))
+        fraction = float(changed.mean())
+        self._metrics.set("ocr.changed_fraction", fraction)
+        if fraction > FULL_OCR_FRACTION:
+            return read_words(image)
+
+        prev_words = shift_words(prev_words, dx * factor, dy * factor)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(changed)
+        sh, sw = small.shape[:2]
+        # Padded as they will be cropped, so a word is kept only if no crop touches it
+        regions = [(max(x - REGION_PAD, 0), max(y - REGION_PAD, 0),
+                    min(x + w + REGION_PAD, sw), min(y + h + REGION_PAD, sh))
+                   for x, y, w, h, area in stats[1:count] if area >= MIN_REGION_AREA]
+        if not regions:
+            return prev_words
+
+        boxes = [tuple(c / factor for c in word["bbox"]) for word in prev_words]  # to diff pixels
+        regions = _cover(_merge(regions), boxes)
+        kept = [word for word, box in zip(prev_words, boxes)
+                if not any(_overlaps(box, r) for r in regions)]
+
+        self._metrics.inc("ocr.incremental")
+        h, w = image.shape[:2]
+        words = kept
+        for x0, y0, x1, y1 in regions:
+            # Regions were found at diff scale; the crop is read at full resolution
+            x0, y0 = max(int(x0 * factor), 0), max(int(y0 * factor), 0)
+            x1, y1 = min(int(np.ceil(x1 * factor)), w), min(int(np.ceil(y1 * factor)), h)
+            words = words + read_words(image[y0:y1, x0:x1], origin=(x0, y0))
+        return words
+
+def _overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+def _merge(regions):
+    """Union overlapping rectangles so no text is recognized twice."""
+    regions = list(regions)
+    merged = True
+    while merged:
+        merged = False
+        out = []
+        for r in regions:
+            for i, o in enumerate(out):
+                if _overlaps(r, o):
+                    out[i] = (min(r[0], o[0]), min(r[1], o[1]), max(r[2], o[2]), max(r[3], o[3]))
+                    merged = True
+                    break
+            else:
+                out.append(r)
+        regions = out
+    return regions
+
+
+def _cover(regions, boxes):
+    """Grow ``regions`` over every box they touch and merge them, until stable.
+
+    A changed word is re-read whole, and growing one region can make it
+    touch another word or region, so this repeats until nothing changes.
+    """
+    grown = True
+    while grown:
+        grown = False
+        for i, r in enumerate(regions):
+            for box in boxes:
+                if _overlaps(box, r) and not (r[0] <= box[0] and r[1] <= box[1]
+                                              and box[2] <= r[2] and box[3] <= r[3]):
+                    r = (min(r[0], box[0]), min(r[1], box[1]), max(r[2], box[2]), max(r[3], box[3]))
+                    grown = True
+            regions[i] = r
+        if grown:
+            regions = _merge(regions)
+    return regions
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+
+from common.inference import OnnxRunner, quantize_onnx, set_torch_threads
+
+LANGUAGES     = ['en', 'hi']
+RECOG_NETWORK = 'english_g2'
+MODEL_DIR     = os.path.join(os.path.expanduser("~"), ".cache", "sonic-vision", "models")
+EXPORT_WIDTH  = 256  # width of the dummy line used for tracing; the graph is dynamic in it
+
+
+def export_recognizer(reader, path):
+    """Trace easyocr's recognizer (CRNN) to ONNX with dynamic batch and line width."""
+    import torch
+
+    class ImageOnly(torch.nn.Module):
+        # The CRNN ignores easyocr's ``text`` argument; the graph takes the image only
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, image):
+            return self.model(image, None)
+
+    model = getattr(reader.recognizer, "module", reader.recognizer)  # unwrap DataParallel
+    dummy = torch.zeros(1, 1, getattr(reader, "imgH", 64), EXPORT_WIDTH)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(ImageOnly(model.eval()).cpu(), dummy, path, opset_version=17,
+                          input_names=["image"], output_names=["preds"],
+                          dynamic_axes={"image": {0: "batch", 3: "width"},
+                                        "preds": {0: "batch", 1: "steps"}})
+    return path
+
+def onnx_recognizer(runner):
+    """A torch module that easyocr can call in place of its recognizer."""
+    import torch
+
+    class OnnxRecognizer(torch.nn.Module):
+        def forward(self, image, text=None):
+            preds = runner(np.ascontiguousarray(image.detach().cpu().numpy(), dtype=np.float32))[0]
+            return torch.from_numpy(np.asarray(preds))
+
+    return OnnxRecognizer()
+
+def load_reader(config):
+    """easyocr Reader whose recognizer runs on ``config``'s backend.
+
+    The CRAFT text detector stays on torch. On torch the recognizer is
+    easyocr's dynamically quantized (INT8) CPU model unless INT8 is
+    switched off; on ONNX Runtime or OpenVINO it is an exported graph,
+    quantized only when INT8 is on. If export or loading fails the torch
+    recognizer is kept.
+    """
+    import easyocr  # heavy (torch); only pay for it when OCR is first used
+    set_torch_threads(config.threads)
+    if config.backend == "torch":
+        quantize = True if config.int8 is None else config.int8
+        return easyocr.Reader(LANGUAGES, recog_network=RECOG_NETWORK, quantize=quantize)
+
+    # Export from float weights; the quantized torch model does not trace
+    reader = easyocr.Reader(LANGUAGES, recog_network=RECOG_NETWORK, quantize=False)
+    path = os.path.join(MODEL_DIR, f"{RECOG_NETWORK}.onnx")
+    try:
+        if not os.path.exists(path):
+            print(f"[OCR] Exporting the {RECOG_NETWORK} recognizer to ONNX...")
+            export_recognizer(reader, path)
+        if config.int8:
+            int8_path = os.path.join(MODEL_DIR, f"{RECOG_NETWORK}_int8.onnx")
+            if not os.path.exists(int8_path):
+                quantize_onnx(path, int8_path)
+            path = int8_path
+        reader.recognizer = onnx_recognizer(OnnxRunner(path, config.backend, config.threads))
+    except Exception as e:  # exporters and runtimes raise their own types; all mean "use torch"
+        print(f"[OCR] {config.backend} recognizer unavailable ({e}); using torch.")
+    return reader
@@ -0,0 +1,53 @@
+import os
+import time
+
+from ocr_cache import CaptureOcr
+from common.inference_client import InferenceClient, ServerUnavailable
+from common.metrics import get_metrics
+
+RETRY_AFTER = 10.0  # seconds on the local reader before trying the server again
+
+
+class RemoteOcr:
+    """Page OCR through the shared inference server, with CaptureOcr as fallback.
+
+    Pages go to the server's OCR worker, so a reader station never loads
+    EasyOCR itself while the server answers. With no server to ask, or a
+    page the server dropped, the page is read locally; the local reader
+    (and its duplicate cache) is only loaded then.
+    """
+
+    def __init__(self, stream=None, local=None):
+        self.client = InferenceClient(stream or f"ocr-{os.getpid()}")
+        self.local  = local
+        self._local_until = 0.0
+        self._misses = get_metrics().counter("ocr.remote_misses")
+
+    def _use_local(self, error):
+        if not self._local_until:
+            print(f"[OCR] {error}; reading locally.")
+        self._local_until = time.monotonic() + RETRY_AFTER
+
+    def _read_locally(self, frame):
+        if self.local is None:
+            self.local = CaptureOcr()
+        return self.local.extract_lines(frame)
+
+    def extract_lines(self, frame):
+        if time.monotonic() < self._local_until:
+            return self._read_locally(frame)
+        try:
+            lines = self.client.ocr(frame)
+        except ServerUnavailable as e:
+            self._use_local(e)
+            return self._read_locally(frame)
+        if self._local_until:
+            print("[OCR] Inference server is back.")
+            self._local_until = 0.0
+        if lines is None:
+            self._misses.inc()  # dropped or timed out; the user is waiting on this page
+            return self._read_locally(frame)
+        return lines
+
+    def close(self):
+        self.client.close()
@@ -1,13 +1,14 @@
-import pyttsx3
+from common.tts import get_speech_service, NORMAL
 
-def speak_text(text, lang="en"):
-    # Initialize the TTS engine
-    engine = pyttsx3.init()
+SPEECH_RATE = 130  # Speed of speech
 
-    # Set properties like rate and volume
-    engine.setProperty('rate', 130)  # Speed of speech
-    engine.setProperty('volume', 1)  # Volume level (0.0 to 1.0)
+def speak_text(text, lang="en", priority=NORMAL, wait=False):
+    # Queue on the shared engine; only block when the caller needs it finished
+    utt = get_speech_service().speak(text, priority=priority, rate=SPEECH_RATE, lang=lang)
+    if wait and utt is not None:
+        utt.wait()
+    return utt
 
-    # Speak the text
-    engine.say(text)
-    engine.runAndWait()  # This is blocking, will wait until the speech is done
+def prewarm_text(texts, lang="en"):
+    # Render fixed prompts ahead of time so their first use plays instantly
+    get_speech_service().prewarm(texts, rate=SPEECH_RATE, lang=lang)
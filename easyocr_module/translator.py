@@ -1,4 +1,221 @@
-from deep_translator import GoogleTranslator
+import abc
+import os
+import sqlite3
+import threading
+
+from common.page_reader import split_sentences
+
+BACKEND_ENV   = "SONIC_VISION_TRANSLATOR"        # "auto", "google", "offline" or "identity"
+CACHE_ENV     = "SONIC_VISION_TRANSLATION_CACHE"
+DEFAULT_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "sonic-vision", "translations.db")
+BATCH_SIZE    = 20  # sentences per backend request
+
+
+class TranslationUnavailable(Exception):
+    """The backend could not run (no network, no language package)."""
+
+
+# ─── Backends ─────────────────────────────────────────────────────────────────
+class Backend(abc.ABC):
+    """Translates a list of sentences into ``target``; one request per call.
+
+    A sentence the backend could not translate comes back as None.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    def translate_batch(self, sentences, target):
+        """Translations in ``sentences`` order, None where one failed."""
+
+
+class GoogleBackend(Backend):
+    name = "google"
+
+    def __init__(self, source="auto"):
+        from deep_translator import GoogleTranslator
+        self._translator = GoogleTranslator
+        self.source = source
+
+    def translate_batch(self, sentences, target):
+        try:
+            translator = self._translator(source=self.source, target=target)
+            return list(translator.translate_batch(sentences))
+        except Exception as e:  # deep_translator raises per-failure types; all mean "not now"
+            raise TranslationUnavailable(f"Google Translate unavailable: {e}") from e
+
+
+class OfflineBackend(Backend):
+    """On-device translation with Argos Translate's installed language packages."""
+
+    name = "offline"
+
+    def __init__(self, source="en"):
+        try:
+            from argostranslate import translate
+        except ImportError as e:
+            raise TranslationUnavailable("argostranslate is not installed") from e
+        self._translate = translate
+        self.source = source
+
+    def translate_batch(self, sentences, target):
+        languages = {lang.code: lang for lang in self._translate.get_installed_languages()}
+        if self.source not in languages or target not in languages:
+            raise TranslationUnavailable(f"No offline package for {self.source}->{target}")
+        translation = languages[self.source].get_translation(languages[target])
+        if translation is None:
+            raise TranslationUnavailable(f"No offline package for {self.source}->{target}")
+        return [translation.translate(s) for s in sentences]
+
+
+class IdentityBackend(Backend):
+    """Stand-in that returns the text unchanged: air-gapped devices and tests."""
+
+    name = "identity"
+
+    def translate_batch(self, sentences, target):
+        return list(sentences)
+
+
+class FallbackBackend(Backend):
+    """Primary first; the fallback gets the batch if the primary cannot run,
+    or just the sentences the primary failed on."""
+
+    def __init__(self, primary, fallback):
+        self.primary  = primary
+        self.fallback = fallback
+        self.name     = f"{primary.name}+{fallback.name}"
+
+    def translate_batch(self, sentences, target):
+        try:
+            translated = self.primary.translate_batch(sentences, target)
+        except TranslationUnavailable as e:
+            print(f"[Translate] {e}; using {self.fallback.name}.")
+            return self.fallback.translate_batch(sentences, target)
+        failed = [i for i, t in enumerate(translated) if t is None]
+        if failed:
+            try:
+                retried = self.fallback.translate_batch([sentences[i] for i in failed], target)
+            except TranslationUnavailable:
+                return translated
+            for i, t in zip(failed, retried):
+                translated[i] = t
+        return translated
+
+
+# ─── Cache ────────────────────────────────────────────────────────────────────
+class TranslationCache:
+    """Sentence translations in SQLite, keyed by (sentence, target language)."""
+
+    def __init__(self, path=DEFAULT_CACHE):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS translations ("
+                               "sentence TEXT NOT NULL, target TEXT NOT NULL, "
+                               "translation TEXT NOT NULL, PRIMARY KEY (sentence, target))")
+
+    def lookup(self, sentences, target):
+        """Cached translations for ``sentences`` as a dict; misses are absent."""
+        found = {}
+        unique = list(dict.fromkeys(sentences))
+        with self._lock:
+            for i in range(0, len(unique), 500):  # SQLite's bound-parameter limit
+                chunk = unique[i:i + 500]
+                marks = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT sentence, translation FROM translations "
+                    f"WHERE target = ? AND sentence IN ({marks})", [target] + chunk).fetchall()
+                found.update(rows)
+        return found
+
+    def store(self, pairs, target):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO translations (sentence, target, translation) VALUES (?, ?, ?)",
+                [(s, target, t) for s, t in pairs])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# ─── Service ──────────────────────────────────────────────────────────────────
+class TranslationService:
+    """Sentence-level translation: cached sentences are free, the rest go in batches.
+
+    Sentences the backend failed on come back as None and are not
+    cached, so the next request asks again.
+    """
+
+    def __init__(self, backend, cache=None, batch_size=BATCH_SIZE):
+        self.backend    = backend
+        self.cache      = cache
+        self.batch_size = batch_size
+
+    def translate_sentences(self, sentences, target):
+        cached = self.cache.lookup(sentences, target) if self.cache else {}
+        missing = [s for s in dict.fromkeys(sentences) if s not in cached]
+        for i in range(0, len(missing), self.batch_size):
+            batch = missing[i:i + self.batch_size]
+            translated = self.backend.translate_batch(batch, target)
+            pairs = [(s, t) for s, t in zip(batch, translated) if t is not None]
+            if self.cache and not isinstance(self.backend, IdentityBackend):
+                self.cache.store(pairs, target)
+            cached.update(pairs)
+        return [cached.get(s) for s in sentences]
+
+    def translate(self, text, target):
+        """``text`` in ``target``; sentences that failed are left in the original."""
+        sentences = split_sentences(text)
+        if not sentences:
+            return ""
+        translated = self.translate_sentences(sentences, target)
+        return " ".join(t if t is not None else s for s, t in zip(sentences, translated))
+
+
+def create_backend(backend=None):
+    """Build the configured backend; "auto" prefers Google and falls back offline."""
+    backend = backend or os.environ.get(BACKEND_ENV, "auto")
+    if backend == "identity":
+        return IdentityBackend()
+    if backend == "offline":
+        return OfflineBackend()
+    try:
+        online = GoogleBackend()
+    except ImportError:
+        if backend == "google":
+            raise
+        online = None
+    if backend == "google":
+        return online
+    try:
+        offline = OfflineBackend()
+    except TranslationUnavailable as e:
+        print(f"[Translate] {e}; no offline fallback.")
+        offline = None
+    if online and offline:
+        return FallbackBackend(online, offline)
+    if online or offline:
+        return online or offline
+    print("[Translate] No translation backend available; text is read untranslated.")
+    return IdentityBackend()
+
+
+# ─── Process-wide service ─────────────────────────────────────────────────────
+_service      = None
+_service_lock = threading.Lock()
+
+def get_translator():
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = TranslationService(create_backend(),
+                                          TranslationCache(os.environ.get(CACHE_ENV, DEFAULT_CACHE)))
+        return _service
+
 
 def translate_text(text, target_lang):
-    return GoogleTranslator(source="auto", target=target_lang).translate(text)
+    return get_translator().translate(text, target_lang)
@@ -0,0 +1,288 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+# ─── Make both modules importable, as the resident host does ──────────────────
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+for module_dir in ("easyocr_module", "point_object_module"):
+    sys.path.insert(0, os.path.join(ROOT_DIR, module_dir))
+
+from common.control import ControlServer, DETECT, OCR, STATUS, STOP
+from common.inference_client import InferenceClient, SERVER_NAME
+from common.metrics import get_metrics
+
+MAX_BATCH    = 8      # frames per detector call
+BATCH_WINDOW = 0.008  # seconds to wait for more frames after the first one arrives
+MAX_PENDING  = 2      # queued requests per stream; older ones are dropped for newer
+MAX_QUEUED   = 64     # queued requests overall; beyond this new streams are refused
+
+metrics = get_metrics()
+
+
+# ─── Scheduling ───────────────────────────────────────────────────────────────
+class FairQueue:
+    """Per-stream FIFOs, served round-robin, bounded per stream and overall.
+
+    A stream that sends faster than it is served loses its oldest frames
+    (for live video the newest frame is the one worth answering), so one
+    busy camera cannot crowd out the others. ``take`` gathers a batch:
+    it waits for a first request, then up to ``window`` seconds for more,
+    taking at most one request per stream per pass.
+    """
+
+    def __init__(self, per_stream=MAX_PENDING, total=MAX_QUEUED):
+        self.per_stream = per_stream
+        self.total      = total
+        self._streams   = OrderedDict()  # stream -> deque, in service order
+        self._size      = 0
+        self._cond      = threading.Condition()
+        self.dropped    = {}
+
+    def put(self, stream, item):
+        """Queue ``item``; returns what it displaced (to be refused), or None."""
+        with self._cond:
+            queue = self._streams.setdefault(stream, deque())
+            if len(queue) >= self.per_stream:
+                displaced = queue.popleft()
+                self.dropped[stream] = self.dropped.get(stream, 0) + 1
+            elif self._size >= self.total:
+                self.dropped[stream] = self.dropped.get(stream, 0) + 1
+                return item
+            else:
+                displaced = None
+                self._size += 1
+            queue.append(item)
+            self._cond.notify()
+            return displaced
+
+    def take(self, limit, window, key=None, timeout=0.5):
+        """Up to ``limit`` items sharing ``key(item)``; [] if none came within ``timeout``."""
+        with self._cond:
+            if not self._size and not self._cond.wait_for(lambda: self._size, timeout):
+                return []
+            deadline = time.monotonic() + window
+            batch = []
+            while len(batch) < limit:
+                if not self._take_round(batch, limit, key):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            return batch
+
+    def _take_round(self, batch, limit, key):
+        taken = False
+        for stream in list(self._streams):
+            queue = self._streams[stream]
+            if len(batch) >= limit:
+                break
+            if not queue or (key and batch and key(queue[0]) != key(batch[0])):
+                continue
+            batch.append(queue.popleft())
+            self._size -= 1
+            self._streams.move_to_end(stream)  # served: to the back of the line
+            taken = True
+        return taken
+
+    def depth(self):
+        with self._cond:
+            return {stream: len(queue) for stream, queue in self._streams.items() if queue}
+
+
+# ─── Server ───────────────────────────────────────────────────────────────────
+class InferenceServer:
+    """Detector and OCR models loaded once, shared by every client stream.
+
+    Detection requests from all streams are batched into one detector
+    call (same input size per batch); OCR pages are served one at a time
+    on their own worker, round-robin between streams, so a long page
+    never delays the pointers' frames.
+    """
+
+    def __init__(self, max_batch=MAX_BATCH, window=BATCH_WINDOW):
+        from scripts.object_detection import ObjectDetector
+
+        self.max_batch  = max_batch
+        self.window     = window
+        self.detector   = ObjectDetector()
+        self.detections = FairQueue()
+        self.pages      = FairQueue(per_stream=1)
+        self.served     = {}
+        self.stopping   = threading.Event()
+        self.server     = ControlServer(SERVER_NAME)
+        self._batches   = metrics.counter("server.batches")
+        self._frames    = metrics.counter("server.frames")
+
+    def serve(self):
+        workers = [threading.Thread(target=self._detect_loop, name="detect", daemon=True),
+                   threading.Thread(target=self._ocr_loop, name="ocr", daemon=True)]
+        for worker in workers:
+            worker.start()
+        print(f"[Server] Inference server ready (batch {self.max_batch}, "
+              f"window {self.window * 1000:.0f} ms).")
+        for cmd in self.server:
+            stream = str(cmd.args.get("stream", "default"))
+            if cmd.kind == DETECT:
+                self._refuse(self.detections.put(stream, (time.monotonic(), cmd)))
+            elif cmd.kind == OCR:
+                self._refuse(self.pages.put(stream, (time.monotonic(), cmd)))
+            elif cmd.kind == STATUS:
+                cmd.reply(**self.status())
+            elif cmd.kind == STOP:
+                cmd.reply()
+                break
+            else:
+                cmd.reply(ok=False, error=f"Unknown command {cmd.kind!r}")
+        self.stopping.set()
+        for worker in workers:
+            worker.join(timeout=5)
+        self.server.close()
+
+    def status(self):
+        batches, frames = self._batches.value, self._frames.value
+        return {"served": dict(self.served), "dropped": dict(self.detections.dropped),
+                "queued": self.detections.depth(), "pages_dropped": dict(self.pages.dropped),
+                "pages_queued": self.pages.depth(), "classes": self.detector.class_names(),
+                "mean_batch": frames / batches if batches else None}
+
+    @staticmethod
+    def _refuse(item):
+        if item is not None:
+            item[1].reply(ok=False, error="dropped: stream is behind or server is full")
+
+    def _detect_loop(self):
+        while not self.stopping.is_set():
+            batch = self.detections.take(self.max_batch, self.window,
+                                         key=lambda item: item[1].args.get("imgsz"))
+            if not batch:
+                continue
+            cmds = [cmd for _, cmd in batch]
+            imgsz = cmds[0].args.get("imgsz")
+            try:
+                with metrics.time("server.detect_batch"):
+                    results = self.detector.detect_objects_batch([c.args["frame"] for c in cmds],
+                                                                 imgsz=imgsz)
+            except Exception as e:
+                for cmd in cmds:
+                    cmd.reply(ok=False, error=str(e))
+                continue
+            self._batches.inc()
+            self._frames.inc(len(cmds))
+            now = time.monotonic()
+            for (queued_at, cmd), detections in zip(batch, results):
+                metrics.observe("server.queue_wait", now - queued_at)
+                stream = str(cmd.args.get("stream", "default"))
+                self.served[stream] = self.served.get(stream, 0) + 1
+                cmd.reply(detections=detections, batch=len(cmds))
+
+    def _ocr_loop(self):
+        from ocr import extract_lines
+
+        while not self.stopping.is_set():
+            for _, cmd in self.pages.take(1, 0.0):
+                try:
+                    with metrics.time("server.ocr_page"):
+                        lines = extract_lines(cmd.args["frame"])
+                except Exception as e:
+                    cmd.reply(ok=False, error=str(e))
+                    continue
+                stream = str(cmd.args.get("stream", "default"))
+                self.served[stream] = self.served.get(stream, 0) + 1
+                cmd.reply(lines=lines)
+
+
+# ─── Load test ────────────────────────────────────────────────────────────────
+def load_test(streams, fps, seconds, source="synthetic", imgsz=640, ocr_streams=1, ocr_interval=2.0):
+    """Stand-in stations: ``streams`` pointers sending frames at ``fps`` each,
+    and ``ocr_streams`` readers sending a page every ``ocr_interval`` seconds."""
+    from common.frame_source import open_source
+
+    capture = open_source(source, loop=True)
+    frames = []
+    for frame in capture:
+        frames.append(frame)
+        if len(frames) >= 30:
+            break
+    capture.release()
+    if not frames:
+        raise SystemExit(f"Frame source {source!r} produced no frames")
+
+    stats = {}
+
+    def station(name, request, interval):
+        client = InferenceClient(f"load-{name}")
+        if not client.connect():
+            stats[name] = None
+            return
+        latencies, misses = [], 0
+        deadline = time.monotonic() + seconds
+        next_at = time.monotonic()
+        i = 0
+        while time.monotonic() < deadline:
+            start = time.monotonic()
+            if request(client, frames[i % len(frames)]) is None:
+                misses += 1
+            else:
+                latencies.append(time.monotonic() - start)
+            i += 1
+            next_at += interval
+            time.sleep(max(0.0, next_at - time.monotonic()))
+        client.close()
+        stats[name] = (latencies, misses, i)
+
+    jobs = [(f"detect-{n}", lambda client, frame: client.detect(frame, imgsz), 1.0 / fps)
+            for n in range(streams)]
+    jobs += [(f"ocr-{n}", lambda client, frame: client.ocr(frame), ocr_interval)
+             for n in range(ocr_streams)]
+    threads = [threading.Thread(target=station, args=job) for job in jobs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for name, _, _ in jobs:
+        if stats[name] is None:
+            print(f"[Load] {name}: could not connect to the server")
+            continue
+        latencies, misses, sent = stats[name]
+        ms = np.asarray(latencies or [0.0]) * 1000
+        print(f"[Load] {name}: {len(latencies) / seconds:.1f}/s answered, {misses}/{sent} missed, "
+              f"p50 {np.percentile(ms, 50):.0f} ms, p95 {np.percentile(ms, 95):.0f} ms")
+    status = InferenceClient("load-status").status()
+    if status:
+        print(f"[Load] server mean batch {status['mean_batch']}, dropped {status['dropped']}, "
+              f"pages dropped {status['pages_dropped']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared detector/OCR server for many camera streams.")
+    sub = parser.add_subparsers(dest="mode")
+    serve = sub.add_parser("serve", help="run the server (default)")
+    serve.add_argument("--max-batch", type=int, default=MAX_BATCH)
+    serve.add_argument("--window-ms", type=float, default=BATCH_WINDOW * 1000)
+    load = sub.add_parser("load-test", help="drive a running server with stand-in streams")
+    load.add_argument("--streams", type=int, default=4)
+    load.add_argument("--fps", type=float, default=10.0)
+    load.add_argument("--seconds", type=float, default=20.0)
+    load.add_argument("--imgsz", type=int, default=640)
+    load.add_argument("--ocr-streams", type=int, default=1, help="reader stations sending pages")
+    load.add_argument("--ocr-interval", type=float, default=2.0, help="seconds between pages per reader")
+    load.add_argument("--source", default="synthetic",
+                      help="video file, image directory, camera index or synthetic[:WxH]")
+    args = parser.parse_args()
+
+    if args.mode == "load-test":
+        load_test(args.streams, args.fps, args.seconds, args.source, args.imgsz,
+                  args.ocr_streams, args.ocr_interval)
+    elif args.mode == "serve":
+        InferenceServer(args.max_batch, args.window_ms / 1000).serve()
+    else:
+        InferenceServer().serve()
+
+if __name__ == "__main__":
+    main()
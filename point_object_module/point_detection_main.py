@@ -1,92 +1,232 @@
 import os
+import sys
+import argparse
 import cv2
 import threading
 import time
-from scripts.integration import ObjectPointer
-from scripts.audio_feedback import AudioFeedback
 
 # Constants
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-STOP_FILE = os.path.abspath(os.path.join(BASE_DIR, "..", "stop_pointer.txt"))
+sys.path.insert(0, os.path.dirname(BASE_DIR))  # shared `common` package
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)  # imported from the resident host
+
+from scripts.integration import ObjectPointer
+from scripts.audio_feedback import AudioFeedback
+from common.tts import URGENT, HIGH, LOW
+from scripts.governor import Governor
+from scripts.handtracking import draw_hand
+from scripts.navigation import GuidanceStream, GUIDANCE_INTERVAL
+from common.control import ControlServer, STOP, STATUS
+from common.frame_bus import get_frame_bus, release_frame_bus
+from common.frame_source import default_source
+from common.metrics import get_metrics
+from common.frame_sink import open_sink, DEFAULT_FPS
+
 DETECTION_DELAY  = 1  # seconds
 
 # Globals
-cap               = cv2.VideoCapture(1)
-object_pointer    = ObjectPointer()
+cap               = None  # shared FrameBus for the frame source
+object_pointer    = None
 audio_feedback    = AudioFeedback()
-latest_frame      = None
 latest_detection  = None
 lock              = threading.Lock()
 last_label        = None
+last_track        = None
 last_time         = 0
-
-# Announce start
-audio_feedback.speak("Point object detection started.")
+control           = None
+governor          = None
+guidance          = GuidanceStream()
+sink              = None
+speak_guidance    = False
+metrics           = get_metrics()
 
 def detect_objects():
-    global latest_frame, latest_detection
-    while True:
-        with lock:
-            frame = latest_frame
+    global latest_detection
+    seq = -1
+    while not control.stop_requested.is_set():
+        # Read-only view into the bus; both models copy it during preprocessing
+        # Leave the cores to capture and speech between hand-tracking passes
+        governor.pace_hand_tracking(control.stop_requested)
+        seq, frame = cap.wait_next(seq, timeout=0.5)
         if frame is None:
-            time.sleep(0.01)
             continue
-        obj, tip = object_pointer.find_pointed_object(frame.copy())
+        captured_at = cap.timestamp(seq)
+        with metrics.time("pointer.find_pointed_object"):
+            obj, tip = object_pointer.find_pointed_object(frame)
+        metrics.inc("pointer.detections")
+        if captured_at is not None:
+            metrics.observe("pointer.latency", time.monotonic() - captured_at)
+        governor.note_result(tip is not None, obj)
+        # Landmarks are copied for the display loop, which draws them off this thread
+        hand = object_pointer.hand_tracker.pointing_landmarks()
+        hand = hand.copy() if hand is not None else None
         with lock:
-            latest_detection = (obj, tip)
+            latest_detection = (obj, tip, hand, seq, captured_at)
+
+def serve_commands():
+    for cmd in control:
+        if cmd.kind == STOP:
+            cmd.reply()  # control.stop_requested is already set
+            break
+        elif cmd.kind == STATUS:
+            cmd.reply(label=last_label, guidance=guidance.latest, governor=governor.state(),
+                      display_error=str(sink.failed) if sink.failed else None)
+        else:
+            cmd.reply(ok=False, error=f"Unknown command {cmd.kind!r}")
+
+def draw_overlay(frame, detection):
+    """Hand, fingertip and pointed object from a detection snapshot; on the sink's thread."""
+    pointed_object, fingertip, hand = detection[:3] if detection else (None,) * 3
+    if hand is not None:
+        draw_hand(frame, hand)
+    if fingertip:
+        cv2.circle(frame, fingertip, 10, (0, 255, 0), -1)
+    if pointed_object is not None:
+        x1, y1, x2, y2 = (int(v) for v in pointed_object['bbox'])
+        label = str(pointed_object['label'])
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (255, 0, 0), 2)
+        cv2.putText(frame, label, (x1, y1 - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
 
 def process_frames():
-    global latest_frame, last_label, last_time
+    global last_label, last_track, last_time
 
+    seq = -1
     try:
         while True:
             # Shutdown trigger
-            if os.path.exists(STOP_FILE):
-                os.remove(STOP_FILE)
+            if control.stop_requested.is_set():
                 break
 
-            ret, frame = cap.read()
-            if not ret:
+            seq, view = cap.wait_next(seq, timeout=1.0)
+            if view is None:
                 print("Error: could not read frame.")
                 break
 
             with lock:
-                latest_frame = frame.copy()
                 detection = latest_detection
 
-            # Unpack detection
-            pointed_object, fingertip = detection or (None, None)
+            # Unpack detection and record how stale it is relative to this frame
+            pointed_object, fingertip, _, det_seq, det_time = detection or (None,) * 5
+            if det_seq is not None:
+                metrics.set("pointer.detection_age_frames", seq - det_seq)
+                if det_time is not None:
+                    metrics.observe("pointer.detection_age", time.monotonic() - det_time)
+
+            # Rendering happens on the sink's thread; a busy sink drops this frame
+            sink.submit(view, detection, valid=lambda s=seq: cap.is_current(s))
 
-            # Draw fingertip
-            if fingertip:
-                cv2.circle(frame, fingertip, 10, (0, 255, 0), -1)
+            # Keep the guidance current; it is only spoken when asked for and rate-limited
+            instruction = guidance.update(view.shape, fingertip, pointed_object)
 
-            # Draw and speak object when stable
-            if pointed_object:
-                x1, y1, x2, y2 = pointed_object['bbox']
-                label = pointed_object['label']
-                cv2.rectangle(frame, (x1, y1), (x2, y2), (255, 0, 0), 2)
-                cv2.putText(frame, label, (x1, y1 - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 0, 0), 2)
+            # Speak object when stable
+            if pointed_object is None and last_track is not None:
+                audio_feedback.cancel("label")  # no longer pointed at
+                audio_feedback.cancel("guidance")
+                last_label = last_track = None
 
+            if pointed_object is not None:
+                label = str(pointed_object['label'])
+
+                # Stability is judged per tracked object, not per class name, so
+                # moving between two cups restarts the delay
+                track_id = int(pointed_object['track_id'])
+                track = track_id if track_id >= 0 else label
                 now = time.time()
-                if label == last_label:
+                if track == last_track:
                     if now - last_time >= DETECTION_DELAY:
-                        audio_feedback.speak(label)
+                        audio_feedback.speak(label, HIGH, key="label", max_age=DETECTION_DELAY)
                         last_time = now
+                    if instruction and speak_guidance:
+                        if audio_feedback.speak(instruction, LOW, key="guidance",
+                                                max_age=GUIDANCE_INTERVAL) is not None:
+                            guidance.mark_spoken(instruction)
+                            metrics.inc("pointer.guidance")
                 else:
+                    audio_feedback.cancel("label")
                     last_label = label
+                    last_track = track
                     last_time = now
 
-            cv2.imshow("Object Pointer", frame)
-            cv2.waitKey(1)
-
     finally:
+        sink.close()  # waits out the render thread: it may still be copying a bus view
+        audio_feedback.stop()
         audio_feedback.speak("Point object detection stopped")
-        time.sleep(2)  # Let the speech finish before closing windows
-        cap.release()
-        cv2.destroyAllWindows()
+        audio_feedback.flush(timeout=3)
+        release_frame_bus(cap.device)
+
+def prewarm_labels():
+    # Loads the detector early (it is needed for the first frame anyway)
+    try:
+        audio_feedback.prewarm(object_pointer.object_detector.class_names())
+    except Exception as e:
+        print(f"[Pointer] Could not prewarm labels: {e}")
+
+def main(commands=None, source=None, target_latency=None, cpu_budget=None, guide=False,
+         display=None, display_fps=DEFAULT_FPS):
+    """Run the pointer until a stop command arrives.
+
+    ``commands`` is the inbox to serve; standalone runs open their own
+    control socket, the resident host passes an in-process queue.
+    ``source`` is a frame_source spec; the configured camera by default.
+    ``target_latency`` (seconds) and ``cpu_budget`` (share of all cores)
+    steer the governor; both default to their environment variables.
+    ``guide`` speaks navigation instructions toward the pointed object.
+    ``display`` is "window", "none" (headless) or a recording path
+    (.avi, .mp4, .mjpg), refreshed at most ``display_fps`` times a second;
+    SONIC_VISION_DISPLAY, else a window, by default.
+    """
+    global cap, object_pointer, control, governor, sink, speak_guidance
+    global latest_detection, last_label, last_track, last_time
+    speak_guidance = guide
+    latest_detection = last_label = last_track = None
+    last_time = 0
+    try:
+        cap = get_frame_bus(source if source is not None else default_source())
+    except RuntimeError as e:
+        print(f"Error: {e}")
+        audio_feedback.speak("Unable to access the camera.", URGENT)
+        audio_feedback.flush(timeout=3)
+        return 1
+    control = commands or ControlServer("point")
+    if object_pointer is None:
+        object_pointer = ObjectPointer()  # models come from the shared host
+    governor = Governor(target_latency, cpu_budget)
+    object_pointer.governor = governor
+    sink = open_sink(display, "Object Pointer", draw_overlay, display_fps)
+
+    # Announce start
+    audio_feedback.speak("Point object detection started.")
+    audio_feedback.prewarm(["Point object detection stopped"])
+    threading.Thread(target=prewarm_labels, daemon=True).start()
+
+    # Start detection thread and frame loop
+    detector = threading.Thread(target=detect_objects, daemon=True)
+    detector.start()
+    threading.Thread(target=serve_commands, daemon=True).start()
+    try:
+        process_frames()
+    finally:
+        control.stop_requested.set()
+        detector.join(timeout=2)
+        if commands is None:
+            control.close()
 
-# Start detection thread and frame loop
-threading.Thread(target=detect_objects, daemon=True).start()
-process_frames()
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Point-at-an-object announcer.")
+    parser.add_argument("--source", default=None,
+                        help="camera index, video file, image directory or synthetic[:WxH]")
+    parser.add_argument("--target-latency", type=float, default=None,
+                        help="seconds from capture to pointed object (default 0.25)")
+    parser.add_argument("--cpu-budget", type=float, default=None,
+                        help="share of all CPU cores to stay under, 0-1 (default 0.6)")
+    parser.add_argument("--guide", action="store_true",
+                        help="also speak directions toward the pointed object")
+    parser.add_argument("--display", default=None,
+                        help="window, none (headless) or a recording file (.avi, .mp4, .mjpg)")
+    parser.add_argument("--display-fps", type=float, default=DEFAULT_FPS,
+                        help="refresh cap for the window, frame rate of recordings")
+    args = parser.parse_args()
+    sys.exit(main(source=args.source, target_latency=args.target_latency, cpu_budget=args.cpu_budget,
+                  guide=args.guide, display=args.display, display_fps=args.display_fps))
@@ -1,16 +1,28 @@
-import pyttsx3
-import threading
+from common.tts import get_speech_service, NORMAL
 
 class AudioFeedback:
-    def speak(self, text):
-        threading.Thread(target=self._speak, args=(text,), daemon=True).start()
-
-    def _speak(self, text):
-        try:
-            engine = pyttsx3.init()
-            engine.setProperty('rate', 150)
-            engine.say(text)
-            engine.runAndWait()
-            engine.stop()
-        except Exception as e:
-            print(f"[TTS Error]: {e}")
+    """Thin facade over the process-wide speech worker."""
+
+    def __init__(self, rate=150):
+        self.rate = rate
+        self.service = get_speech_service()
+
+    def speak(self, text, priority=NORMAL, key=None, max_age=None, group=None):
+        return self.service.speak(text, priority=priority, key=key, max_age=max_age,
+                                  rate=self.rate, group=group)
+
+    def prewarm(self, texts):
+        """Render phrases into the audio cache ahead of their first use."""
+        self.service.prewarm(texts, rate=self.rate)
+
+    def cancel(self, key):
+        self.service.cancel(key)
+
+    def cancel_group(self, group):
+        self.service.cancel_group(group)
+
+    def stop(self):
+        self.service.stop()
+
+    def flush(self, timeout=None):
+        return self.service.flush(timeout)
@@ -0,0 +1,192 @@
+import collections
+import os
+import time
+
+import numpy as np
+
+from common.metrics import get_metrics
+
+TARGET_LATENCY_ENV = "SONIC_VISION_TARGET_LATENCY"  # seconds, capture to pointed object
+CPU_BUDGET_ENV     = "SONIC_VISION_CPU_BUDGET"      # fraction of all cores, 0-1
+
+DEFAULT_TARGET_LATENCY = 0.25
+DEFAULT_CPU_BUDGET     = 0.6
+
+# Ladders the governor steps along; the defaults reproduce the fixed settings
+IMGSZ_LEVELS     = (320, 480, 640, 800, 960, 1120, 1280)  # full-frame detector input
+ROI_IMGSZ_LEVELS = (160, 192, 224, 256, 320, 384, 448)    # fingertip-crop input, same index
+DEFAULT_LEVEL    = IMGSZ_LEVELS.index(960)
+DETECT_HZ_LEVELS = (2, 4, 6, 10, 15, 30)  # keyframe rate cap; the tracker fills the gaps
+HAND_HZ_LEVELS   = (5, 10, 15, 20, 30)    # hand-tracking passes per second
+
+DECISION_INTERVAL = 1.0   # seconds between decisions
+MIN_SAMPLES       = 5     # latency samples needed before acting
+HEADROOM          = 0.7   # below this share of both budgets there is room to scale up
+HARD_CONFIDENCE   = 0.5   # pointing at something seen below this counts as a hard scene
+HARD_FRACTION     = 0.4   # share of hard passes that makes the scene hard
+EASY_FRACTION     = 0.1   # below this the extra resolution is given back (hysteresis)
+
+
+class Governor:
+    """Keeps the pointer inside a latency and CPU budget by trading quality.
+
+    Each decision reads the stage timers the pipeline already records
+    (hand tracking, detector inference, end-to-end latency) and the
+    process CPU time, then moves one step:
+
+    * over the latency target: lower the detector resolution, then the
+      hand-tracking rate;
+    * over the CPU budget: lower the detection rate, then the hand rate,
+      then the resolution;
+    * with headroom on both: raise the resolution if the scene is hard
+      (pointing but finding nothing, or only low-confidence boxes),
+      otherwise restore rates and resolution toward their defaults.
+
+    Every change is printed and mirrored in ``governor.*`` gauges.
+    """
+
+    def __init__(self, target_latency=None, cpu_budget=None, interval=DECISION_INTERVAL):
+        self.target_latency = target_latency or float(os.environ.get(TARGET_LATENCY_ENV, DEFAULT_TARGET_LATENCY))
+        self.cpu_budget     = cpu_budget or float(os.environ.get(CPU_BUDGET_ENV, DEFAULT_CPU_BUDGET))
+        self.interval       = interval
+        self.level          = DEFAULT_LEVEL
+        self.detect_level   = len(DETECT_HZ_LEVELS) - 1
+        self.hand_level     = len(HAND_HZ_LEVELS) - 1
+        self.decisions      = collections.deque(maxlen=50)
+        self._cores         = os.cpu_count() or 1
+        self._last_run      = {}
+        self._scene         = collections.deque(maxlen=60)  # True for hard passes
+        self._metrics       = get_metrics()
+        self._timers        = {name: self._metrics.timer(name) for name in
+                               ("pointer.latency", "pointer.hand_tracking", "detector.inference")}
+        self._seen          = {name: t.count for name, t in self._timers.items()}
+        self._decided_at    = time.monotonic()
+        self._cpu_at        = time.process_time()
+        self._publish()
+
+    # ─── Current settings ─────────────────────────────────────────────────────
+    @property
+    def imgsz(self):
+        return IMGSZ_LEVELS[self.level]
+
+    @property
+    def roi_imgsz(self):
+        return ROI_IMGSZ_LEVELS[self.level]
+
+    @property
+    def detect_hz(self):
+        return DETECT_HZ_LEVELS[self.detect_level]
+
+    @property
+    def hand_hz(self):
+        return HAND_HZ_LEVELS[self.hand_level]
+
+    def state(self):
+        return {"imgsz": self.imgsz, "roi_imgsz": self.roi_imgsz,
+                "detect_hz": self.detect_hz, "hand_hz": self.hand_hz}
+
+    # ─── Pacing ───────────────────────────────────────────────────────────────
+    def allow(self, stage, hz):
+        """True (and counts as a run) if ``stage`` may run now at ``hz``."""
+        now = time.monotonic()
+        if now - self._last_run.get(stage, 0.0) < 1.0 / hz:
+            return False
+        self._last_run[stage] = now
+        return True
+
+    def allow_detection(self):
+        return self.allow("detect", self.detect_hz)
+
+    def pace_hand_tracking(self, stop_event=None):
+        """Sleep until the next hand-tracking pass is due; gives the cores back."""
+        wait = self._last_run.get("hand", 0.0) + 1.0 / self.hand_hz - time.monotonic()
+        if wait > 0:
+            if stop_event is not None:
+                stop_event.wait(wait)
+            else:
+                time.sleep(wait)
+        self._last_run["hand"] = time.monotonic()
+
+    # ─── Feedback ─────────────────────────────────────────────────────────────
+    def note_result(self, pointing, obj):
+        """Record one pass for scene difficulty; decides when an interval is up."""
+        if pointing:
+            confidence = float(obj['confidence']) if obj is not None else 0.0
+            self._scene.append(confidence < HARD_CONFIDENCE)
+        if time.monotonic() - self._decided_at >= self.interval:
+            self.decide()
+
+    def _recent(self, name):
+        # Samples recorded since the last decision
+        timer = self._timers[name]
+        new, self._seen[name] = timer.count - self._seen[name], timer.count
+        return timer.recent(new)
+
+    def decide(self):
+        now = time.monotonic()
+        cpu_now = time.process_time()
+        wall = max(now - self._decided_at, 1e-6)
+        cpu = (cpu_now - self._cpu_at) / (wall * self._cores)
+        self._decided_at, self._cpu_at = now, cpu_now
+
+        latency = self._recent("pointer.latency")
+        hand = self._recent("pointer.hand_tracking")
+        inference = self._recent("detector.inference")
+        if len(latency) < MIN_SAMPLES:
+            return None
+        p90 = float(np.percentile(latency, 90))
+        hard_share = sum(self._scene) / len(self._scene) if self._scene else 0.0
+        hard = hard_share >= HARD_FRACTION
+        self._metrics.set("governor.cpu", cpu)
+        self._metrics.set("governor.latency_p90", p90)
+
+        before = self.state()
+        reason = None
+        if p90 > self.target_latency:
+            reason = f"latency p90 {p90 * 1000:.0f}ms > {self.target_latency * 1000:.0f}ms"
+            self._step_down(("level", "hand_level"))
+        elif cpu > self.cpu_budget:
+            reason = f"cpu {cpu:.0%} > {self.cpu_budget:.0%}"
+            self._step_down(("detect_level", "hand_level", "level"))
+        elif p90 < self.target_latency * HEADROOM and cpu < self.cpu_budget * HEADROOM:
+            if hard and self.level < len(IMGSZ_LEVELS) - 1:
+                reason = "hard scene with headroom"
+                self.level += 1
+            else:
+                reason = "headroom"
+                self._step_up(easy=hard_share <= EASY_FRACTION)
+
+        after = self.state()
+        if after == before:
+            return None
+        stages = (f"hand {np.mean(hand) * 1000:.0f}ms" if len(hand) else "hand -",
+                  f"inference {np.mean(inference) * 1000:.0f}ms" if len(inference) else "inference -")
+        changes = ", ".join(f"{k} {before[k]} -> {after[k]}" for k in after if after[k] != before[k])
+        decision = {"time": time.time(), "reason": reason, "changes": changes,
+                    "latency_p90": p90, "cpu": cpu, "hard_scene": hard, **after}
+        self.decisions.append(decision)
+        print(f"[Governor] {reason} ({', '.join(stages)}, cpu {cpu:.0%}): {changes}")
+        self._metrics.inc("governor.decisions")
+        self._publish()
+        return decision
+
+    def _step_down(self, order):
+        for attr in order:
+            if getattr(self, attr) > 0:
+                setattr(self, attr, getattr(self, attr) - 1)
+                return
+
+    def _step_up(self, easy):
+        # Restore what load took away, rates first (they cost CPU, not latency)
+        if self.detect_level < len(DETECT_HZ_LEVELS) - 1:
+            self.detect_level += 1
+        elif self.hand_level < len(HAND_HZ_LEVELS) - 1:
+            self.hand_level += 1
+        elif self.level < DEFAULT_LEVEL:
+            self.level += 1
+        elif self.level > DEFAULT_LEVEL and easy:
+            self.level -= 1  # easy scene again: drop the extra resolution
+
+    def _publish(self):
+        for key, value in self.state().items():
+            self._metrics.set(f"governor.{key}", value)
@@ -2,47 +2,155 @@ import cv2
 import mediapipe as mp
 import numpy as np
 
+from common.model_host import get_model_host
+from common.metrics import get_metrics
+from scripts.object_detection import MODEL_GROUP
+
+NUM_LANDMARKS   = 21
+ROI_SIZE        = 256  # crops are downscaled to this side; MediaPipe's own inputs are smaller
+ROI_MARGIN      = 0.6  # the crop extends the last hand box by this share on each side
+FULL_FRACTION   = 0.8  # crops wider than this share of the frame run full-frame instead
+REACQUIRE_EVERY = 30   # frames between full-frame passes while fewer than maxHands are tracked
+
+# Pointing check: fingertip landmarks and the joint each one is compared with
+_TIPS   = np.array([8, 12, 16, 20])  # index, middle, ring, pinky
+_JOINTS = np.array([7, 10, 14, 18])  # index DIP, then the other fingers' PIP
+
+def pointing_mask(landmarks):
+    """Per hand in an (N, 21, 2) array: index extended and the other fingers folded."""
+    y = landmarks[..., 1]
+    tips, joints = y[:, _TIPS], y[:, _JOINTS]
+    # Index tip above its DIP joint, other tips below their PIP joints (image y grows down)
+    return (tips[:, 0] <= joints[:, 0]) & np.all(tips[:, 1:] >= joints[:, 1:], axis=1)
+
+def draw_hand(img, landmarks, color=(0, 255, 255)):
+    """Draw one hand's (21, 2) landmarks; meant for the display thread, not inference."""
+    points = landmarks.astype(np.int32)
+    for a, b in mp.solutions.hands.HAND_CONNECTIONS:
+        cv2.line(img, tuple(points[a]), tuple(points[b]), color, 2)
+    for x, y in points:
+        cv2.circle(img, (int(x), int(y)), 3, (0, 0, 255), -1)
+
 class HandTracker:
-    def __init__(self, maxHands=1, detectionCon=0.7, trackCon=0.6, smoothing=0.7):
+    """MediaPipe hands with a region-of-interest follow-up.
+
+    While hands are tracked, the next frame is processed as one square
+    crop around all of them, downscaled to ROI_SIZE, so colour
+    conversion and inference cost the same whatever the camera
+    resolution or number of hands. The full frame is only processed when
+    the hands are lost (or now and then, to pick up more hands).
+    Landmarks live in a preallocated (maxHands, 21, 2) array in frame
+    pixels.
+    """
+
+    def __init__(self, maxHands=1, detectionCon=0.7, trackCon=0.6, smoothing=0.7, roi_tracking=True):
         self.mpHands = mp.solutions.hands
-        self.hands = self.mpHands.Hands(
-            max_num_hands=maxHands,
-            min_detection_confidence=detectionCon,
-            min_tracking_confidence=trackCon
-        )
-        self.mpDraw = mp.solutions.drawing_utils
-        self.tipIds = [4, 8, 12, 16, 20]  # Thumb & fingertips (index, middle, ring, pinky)
+        self.max_hands = maxHands
+        self.model_name = f"hands:{maxHands}:{detectionCon}:{trackCon}"
+        # Crops and full frames are separate streams to MediaPipe's tracker, so each gets a graph
+        self.roi_model_name = f"hands-roi:{maxHands}:{detectionCon}:{trackCon}"
+        for name in (self.model_name, self.roi_model_name):
+            get_model_host().register(name, lambda: self.mpHands.Hands(
+                max_num_hands=maxHands,
+                min_detection_confidence=detectionCon,
+                min_tracking_confidence=trackCon
+            ), unloader=lambda hands: hands.close(), group=MODEL_GROUP)
+        self.roi_tracking = roi_tracking
+        self.landmarks = np.zeros((maxHands, NUM_LANDMARKS, 2), dtype=np.float32)
+        self.num_hands = 0  # valid rows of self.landmarks
+        self.pointing_hand = None  # row of the last pointing hand
         self.smooth_fingertip = None  # For smoothing
         self.smoothing_factor = smoothing  # Adjustable smoothing
+        self._roi = None  # (x1, y1, x2, y2) around the hands of the last frame
+        self._since_full = 0
+        metrics = get_metrics()
+        self._full_passes = metrics.counter("hands.full_passes")
+        self._roi_passes = metrics.counter("hands.roi_passes")
+
+    @property
+    def hands(self):
+        return get_model_host().get(self.model_name)
+
+    @property
+    def roi_hands(self):
+        return get_model_host().get(self.roi_model_name)
 
-    def find_hands(self, img, draw=True):
-        imgRGB = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(imgRGB)
+    def find_hands(self, img):
+        """Fill ``self.landmarks`` for ``img`` and return how many hands were found.
 
-        if self.results.multi_hand_landmarks:
-            for handLms in self.results.multi_hand_landmarks:
-                if draw:
-                    self.mpDraw.draw_landmarks(img, handLms, self.mpHands.HAND_CONNECTIONS)
-        return self.results
+        ``img`` may be a read-only shared frame; it is never drawn on.
+        """
+        h, w = img.shape[:2]
+        crop = self._crop_box(w, h) if self.roi_tracking else None
+        count = 0
+        if crop is not None:
+            x1, y1, x2, y2 = crop
+            view = img[y1:y2, x1:x2]
+            if x2 - x1 > ROI_SIZE:
+                view = cv2.resize(view, (ROI_SIZE, ROI_SIZE), interpolation=cv2.INTER_AREA)
+            self._roi_passes.inc()
+            self._since_full += 1
+            count = self._process(self.roi_model_name, view, (x1, y1), (x2 - x1, y2 - y1))
+        if not count:  # lost (or nothing to follow): palm detection over the whole frame
+            self._full_passes.inc()
+            self._since_full = 0
+            count = self._process(self.model_name, img, (0, 0), (w, h))
+
+        self.num_hands = count
+        if count:
+            found = self.landmarks[:count].reshape(-1, 2)
+            self._roi = (*found.min(axis=0), *found.max(axis=0))
+        else:
+            self._roi = None
+        return count
+
+    def _process(self, model_name, image, origin, size):
+        """Run the named model on ``image`` and store landmarks mapped by ``origin`` and ``size``."""
+        rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        with get_model_host().use(model_name) as model:  # not closed by eviction mid-call
+            self.results = model.process(rgb)
+        hands = self.results.multi_hand_landmarks or ()
+        count = min(len(hands), self.max_hands)
+        flat = self.landmarks.reshape(self.max_hands, -1)
+        for i in range(count):
+            flat[i] = np.fromiter((c for lm in hands[i].landmark for c in (lm.x, lm.y)),
+                                  dtype=np.float32, count=2 * NUM_LANDMARKS)
+        found = self.landmarks[:count]
+        found *= np.asarray(size, dtype=np.float32)
+        found += np.asarray(origin, dtype=np.float32)
+        return count
+
+    def _crop_box(self, w, h):
+        """Square crop around the last hands, or None to process the full frame."""
+        if self._roi is None:
+            return None
+        if self.num_hands < self.max_hands and self._since_full >= REACQUIRE_EVERY:
+            return None  # look for hands that entered elsewhere
+        x1, y1, x2, y2 = self._roi
+        side = max(x2 - x1, y2 - y1) * (1 + 2 * ROI_MARGIN)
+        if side >= FULL_FRACTION * min(w, h):
+            return None
+        side = int(side)
+        cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+        left = int(np.clip(cx - side / 2, 0, w - side))
+        top = int(np.clip(cy - side / 2, 0, h - side))
+        return left, top, left + side, top + side
 
     def is_pointing(self, img):
         """Detect if the user is pointing and return the fingertip position."""
-        self.find_hands(img)
-        if not self.results.multi_hand_landmarks:
+        self.pointing_hand = None
+        count = self.find_hands(img)
+        if not count:
             return None
 
-        handLms = self.results.multi_hand_landmarks[0]
-        lmList = [(int(lm.x * img.shape[1]), int(lm.y * img.shape[0])) for lm in handLms.landmark]
-
-        index_tip, index_dip = lmList[8], lmList[7]
-        middle_mcp = lmList[9]  # Base of middle finger (palm reference)
-
         # Ensure the index finger is pointing (extended) while other fingers are folded
-        if not self._is_index_pointing(lmList):
+        pointing = np.flatnonzero(pointing_mask(self.landmarks[:count]))
+        if not len(pointing):
             return None
+        self.pointing_hand = int(pointing[0])
 
         # Apply exponential smoothing
-        fingertip = np.array(index_tip, dtype=np.float32)
+        fingertip = self.landmarks[self.pointing_hand, 8].copy()
         if self.smooth_fingertip is None:
             self.smooth_fingertip = fingertip
         else:
@@ -52,19 +160,25 @@ class HandTracker:
 
         return tuple(map(int, self.smooth_fingertip))
 
-    def _is_index_pointing(self, lmList):
-        """Checks if only the index finger is extended while others are folded."""
-        index_tip, index_dip = lmList[8], lmList[7]
-        middle_tip, middle_pip = lmList[12], lmList[10]
-        ring_tip, ring_pip = lmList[16], lmList[14]
-        pinky_tip, pinky_pip = lmList[20], lmList[18]
-
-        # Index finger must be straight (tip above DIP joint)
-        if index_tip[1] > index_dip[1]:
-            return False
+    def pointing_landmarks(self):
+        """(21, 2) landmarks of the last pointing hand (a view; copy to keep), or None."""
+        if self.pointing_hand is None:
+            return None
+        return self.landmarks[self.pointing_hand]
 
-        # Other fingers must be bent (tip below PIP joint)
-        if middle_tip[1] < middle_pip[1] or ring_tip[1] < ring_pip[1] or pinky_tip[1] < pinky_pip[1]:
-            return False
+    def hand_bbox(self):
+        """Bounding box (x1, y1, x2, y2) of the last pointing hand."""
+        hand = self.pointing_landmarks()
+        if hand is None:
+            return None
+        x1, y1, x2, y2 = (int(v) for v in (*hand.min(axis=0), *hand.max(axis=0)))
+        return x1, y1, x2, y2
 
-        return True
+    def pointing_direction(self):
+        """Unit vector from the index knuckle (5) to the fingertip (8)."""
+        hand = self.pointing_landmarks()
+        if hand is None:
+            return None
+        d = hand[8] - hand[5]
+        norm = np.linalg.norm(d)
+        return tuple(d / norm) if norm > 0 else None
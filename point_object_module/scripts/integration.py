@@ -1,27 +1,103 @@
+import numpy as np
+
 from scripts.handtracking import HandTracker
-from scripts.object_detection import ObjectDetector
+from scripts.object_detection import ObjectDetector, fingertip_roi, ray_scores, FULL_IMGSZ, ROI_IMGSZ
+from scripts.tracker import ObjectTracker, KeyframeScheduler
+from common.metrics import get_metrics
+from common.inference_client import use_inference_server
 
 class ObjectPointer:
-    def __init__(self):
+    def __init__(self, tracking=True, roi_mode=True, governor=None):
         self.hand_tracker = HandTracker()
-        self.object_detector = ObjectDetector()
+        if use_inference_server():
+            from scripts.remote_detection import RemoteDetector
+            self.object_detector = RemoteDetector()  # one model shared by every station
+        else:
+            self.object_detector = ObjectDetector()
+        # Detect on a crop around the fingertip before paying for the full frame
+        self.roi_mode = roi_mode
+        # Between keyframes, tracked boxes are propagated instead of re-detected
+        self.tracking = tracking
+        self.tracker = ObjectTracker()
+        self.scheduler = KeyframeScheduler()
+        # Optional Governor: picks detector resolution and caps the keyframe rate
+        self.governor = governor
+        metrics = get_metrics()
+        self._hand_timer = metrics.timer("pointer.hand_tracking")
+        self._hit_timer = metrics.timer("pointer.hit_test")
+        self._keyframes = metrics.counter("pointer.keyframes")
+        self._propagated = metrics.counter("pointer.propagated")
 
     def find_pointed_object(self, frame):
-        fingertip = self.hand_tracker.is_pointing(frame)
+        with self._hand_timer.time():
+            fingertip = self.hand_tracker.is_pointing(frame)
         if fingertip is None:
             return None, None  # No valid pointing detected
 
-        detected_objects = self.object_detector.detect_objects(frame)
-        if not detected_objects:
+        detected_objects = self.track_objects(frame, fingertip)
+        if not len(detected_objects):
             return None, fingertip  # No objects detected
 
-        pointed_object = self.get_pointed_object(fingertip, detected_objects)
+        with self._hit_timer.time():
+            pointed_object = self.get_pointed_object(
+                fingertip, detected_objects, direction=self.hand_tracker.pointing_direction(),
+                diagonal=float(np.hypot(*frame.shape[:2])))
         return pointed_object, fingertip
 
-    def get_pointed_object(self, fingertip, detected_objects):
-        for obj in detected_objects:
-            x1, y1, x2, y2 = obj['bbox']
-            if x1 <= fingertip[0] <= x2 and y1 <= fingertip[1] <= y2:
-                return obj  # If fingertip is inside bounding box, return object
-        
-        return None
+    def track_objects(self, frame, fingertip=None):
+        """Detections for this frame, from the detector on keyframes or the tracker otherwise."""
+        if not self.tracking:
+            return self.detect(frame, fingertip)
+
+        keyframe = self.scheduler.should_detect(self.tracker, fingertip) and \
+            (self.governor is None or self.governor.allow_detection())
+        full = keyframe and self.scheduler.wants_full_frame(self.tracker)
+        self.scheduler.mark(keyframe, full=full)
+        if keyframe:
+            self._keyframes.inc()
+            # Tracks outside a fingertip crop were not looked for, so they are not aged
+            return self.tracker.update(*self._detect(frame, fingertip, full))
+        self._propagated.inc()
+        return self.tracker.predict()
+
+    def detect(self, frame, fingertip=None):
+        return self._detect(frame, fingertip)[0]
+
+    def _detect(self, frame, fingertip=None, full=False):
+        """Detections and the region searched (None for the whole frame)."""
+        imgsz, roi_imgsz = (FULL_IMGSZ, ROI_IMGSZ) if self.governor is None else \
+            (self.governor.imgsz, self.governor.roi_imgsz)
+        if fingertip is None:
+            return self.object_detector.detect_objects(frame, imgsz=imgsz), None
+        # Every pass drops the pointing hand and what lies below the fingertip, crop or not
+        hand_bbox = self.hand_tracker.hand_bbox()
+        if full or not self.roi_mode:
+            return self.object_detector.detect_objects(frame, fingertip, hand_bbox, imgsz=imgsz), None
+        roi = fingertip_roi(frame.shape, fingertip, hand_bbox=hand_bbox,
+                            direction=self.hand_tracker.pointing_direction())
+        detections = self.object_detector.detect_in_roi(frame, roi, imgsz=roi_imgsz, fallback=False,
+                                                        fingertip=fingertip, hand_bbox=hand_bbox)
+        if len(detections):
+            return detections, roi
+        return self.object_detector.detect_objects(frame, fingertip, hand_bbox, imgsz=imgsz), None
+
+    def get_pointed_object(self, fingertip, detected_objects, direction=None, diagonal=None):
+        """The object the finger points at (a structured record), or None.
+
+        With a pointing ``direction`` every box is scored against the ray
+        from the fingertip (see ray_scores) and the best one wins, so
+        objects pointed at from a distance count too. Without one, only a
+        box containing the fingertip does.
+        """
+        boxes = detected_objects['bbox']
+        if direction is not None:
+            if diagonal is None:
+                diagonal = float(np.hypot(*(boxes[:, 2:].max(axis=0) - boxes[:, :2].min(axis=0))))
+            scores = ray_scores(fingertip, direction, boxes, detected_objects['confidence'],
+                                max(diagonal, 1.0))
+            best = int(np.argmax(scores))
+            return detected_objects[best] if np.isfinite(scores[best]) else None
+        fx, fy = fingertip
+        inside = (boxes[:, 0] <= fx) & (fx <= boxes[:, 2]) & (boxes[:, 1] <= fy) & (fy <= boxes[:, 3])
+        hits = np.flatnonzero(inside)
+        return detected_objects[hits[0]] if len(hits) else None
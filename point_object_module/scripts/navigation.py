@@ -1,5 +1,10 @@
+import time
+
 import numpy as np
 
+GUIDANCE_INTERVAL = 2.0  # seconds between spoken instructions
+REPEAT_INTERVAL   = 6.0  # an unchanged instruction is only repeated this often
+
 class Navigator:
     def __init__(self, frame_width, frame_height):
         self.frame_width = frame_width
@@ -26,3 +31,42 @@ class Navigator:
         # Estimate step count based on vertical offset
         steps = max(1, int(abs(vertical_offset) / (self.frame_height * 0.1)))
         return f"Take {steps} step{'s' if steps > 1 else ''} forward and slightly {direction}."
+
+
+class GuidanceStream:
+    """Navigator instructions toward the pointed object, rate-limited for speech.
+
+    ``update`` is fed every result; ``latest`` always holds the current
+    instruction, but one is only offered for speaking ``interval``
+    seconds after the last spoken one (``repeat`` seconds if unchanged).
+    The caller reports what it actually spoke with ``mark_spoken``, so
+    an offer it passes up does not use the slot.
+    """
+
+    def __init__(self, interval=GUIDANCE_INTERVAL, repeat=REPEAT_INTERVAL):
+        self.interval  = interval
+        self.repeat    = repeat
+        self.navigator = None
+        self.latest    = None
+        self._said     = None
+        self._said_at  = float("-inf")
+
+    def update(self, frame_shape, fingertip, obj, now=None):
+        """Return an instruction that may be spoken now, or None."""
+        if fingertip is None or obj is None:
+            self.latest = None
+            return None
+        h, w = frame_shape[:2]
+        if self.navigator is None or (self.navigator.frame_width, self.navigator.frame_height) != (w, h):
+            self.navigator = Navigator(w, h)
+        self.latest = self.navigator.get_navigation_instruction(fingertip, obj['bbox'])
+
+        now = time.monotonic() if now is None else now
+        since = now - self._said_at
+        if since < self.interval or (self.latest == self._said and since < self.repeat):
+            return None
+        return self.latest
+
+    def mark_spoken(self, instruction, now=None):
+        """Start the rate limit from ``instruction`` having been spoken."""
+        self._said, self._said_at = instruction, time.monotonic() if now is None else now
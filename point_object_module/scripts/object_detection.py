@@ -1,54 +1,211 @@
-import cv2
-from ultralytics import YOLO
+import os
+import numpy as np
+
+from common.model_host import get_model_host
+from common.metrics import get_metrics
+from common.inference import inference_config
+from scripts.yolo_runtime import load_detector
+
+MODULE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODEL_PATH = os.path.join(MODULE_DIR, "models", "yolov8n.pt")
+FULL_IMGSZ = 960  # Higher resolution improves small-object detection
+ROI_IMGSZ  = 320  # The crop is already zoomed in on the fingertip
+MODEL_GROUP = "point"  # the pointer pipeline's models are resident (and evicted) together
+
+# One row per detection; track_id is -1 until a tracker assigns one
+LABEL_DTYPE = "U32"
+DETECTION_DTYPE = np.dtype([
+    ('bbox', np.int32, (4,)),  # x1, y1, x2, y2
+    ('confidence', np.float32),
+    ('class_id', np.int32),
+    ('label', LABEL_DTYPE),
+    ('track_id', np.int32),
+])
+
+def empty_detections():
+    return np.empty(0, dtype=DETECTION_DTYPE)
+
+def box_iou(a, b):
+    """Pairwise IoU between (N, 4) and (M, 4) xyxy box arrays."""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-6), 0.0)
+
+def ray_scores(origin, direction, boxes, confidence, diagonal, max_miss=0.04,
+               reach_weight=0.5, miss_weight=5.0):
+    """Score (N, 4) boxes against a pointing ray at once; -inf where it is not hit.
+
+    A box containing ``origin`` scores its confidence. Otherwise the
+    score drops with how far along the ray the box starts (``reach``) and
+    by how much the ray passes beside it (``miss``), both as a share of
+    ``diagonal``; boxes behind the finger or missed by more than
+    ``max_miss`` are rejected.
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    o = np.asarray(origin, dtype=np.float32)
+    d = np.asarray(direction, dtype=np.float32)
+    n = np.array([-d[1], d[0]], dtype=np.float32)  # unit normal of the ray
+    half = (boxes[:, 2:] - boxes[:, :2]) / 2
+    rel = (boxes[:, :2] + boxes[:, 2:]) / 2 - o  # box centres relative to the fingertip
+    extent_d = half @ np.abs(d)  # half-width of each box along the ray...
+    extent_n = half @ np.abs(n)  # ...and across it
+    along = rel @ d
+    miss = np.maximum(np.abs(rel @ n) - extent_n, 0)  # gap between the ray's line and the box
+    reach = np.maximum(along - extent_d, 0)  # distance to the box's near side
+    inside = np.all(np.abs(rel) <= half, axis=1)
+    hit = inside | ((along + extent_d > 0) & (miss <= max_miss * diagonal))
+    score = confidence - (reach_weight * reach + miss_weight * miss) / diagonal
+    return np.where(hit, np.where(inside, confidence, score), -np.inf)
+
+def fingertip_roi(frame_shape, fingertip, hand_bbox=None, direction=None,
+                  scale=3.0, min_size=160, max_frac=0.8, extend=0.35):
+    """Square crop (x1, y1, x2, y2) around the fingertip.
+
+    The side grows with the apparent hand size (a closer hand means closer
+    objects) and the centre is pushed ``extend`` of a side along the
+    pointing direction, where the target usually is.
+    """
+    h, w = frame_shape[:2]
+    size = min_size
+    if hand_bbox is not None:
+        hx1, hy1, hx2, hy2 = hand_bbox
+        size = max(size, scale * max(hx2 - hx1, hy2 - hy1))
+    size = int(min(size, max_frac * min(w, h)))
+
+    cx, cy = fingertip
+    if direction is not None:
+        cx += direction[0] * extend * size
+        cy += direction[1] * extend * size
+
+    x1 = int(min(max(cx - size / 2, 0), w - size))
+    y1 = int(min(max(cy - size / 2, 0), h - size))
+    return x1, y1, x1 + size, y1 + size
 
 class ObjectDetector:
-    def __init__(self, model_path="./models/yolov8n.pt", confidence_threshold=0.4, exclude_classes=None):
-        self.model = YOLO(model_path)
+    def __init__(self, model_path=DEFAULT_MODEL_PATH, confidence_threshold=0.4, exclude_classes=None,
+                 inference=None):
+        # Runtime, INT8 and threads come from SONIC_VISION_BACKEND/_INT8/_THREADS by default
+        self.inference = inference or inference_config()
+        backend = self.inference.backend + ("-int8" if self.inference.int8 else "")
+        self.model_name = f"yolo:{backend}:{os.path.abspath(model_path)}"
+        get_model_host().register(self.model_name, lambda: load_detector(model_path, self.inference),
+                                  group=MODEL_GROUP)
         self.confidence_threshold = confidence_threshold
         self.exclude_classes = set(exclude_classes) if exclude_classes else set()
-
-    def detect_objects(self, frame, fingertip=None, hand_bbox=None):
-        results = self.model(frame, imgsz=960)  # Higher resolution improves small-object detection
-        detections = []
-
-        for result in results:
-            boxes = result.boxes.xyxy  # Bounding boxes
-            confidences = result.boxes.conf  # Confidence scores
-            class_ids = result.boxes.cls  # Class labels
-
-            for box, conf, cls in zip(boxes, confidences, class_ids):
-                if conf < self.confidence_threshold:
-                    continue  # Ignore weak detections
-
-                label = result.names[int(cls)]
-                if label in self.exclude_classes:
-                    continue  # Skip excluded objects
-
-                x1, y1, x2, y2 = map(int, box)
-
-                # Ignore objects inside or very close to the hand bounding box
-                if hand_bbox and self.is_inside_hand((x1, y1, x2, y2), hand_bbox):
-                    continue  
-
-                # Ensure detection is **above** the fingertip
-                if fingertip and y2 > fingertip[1]:  
-                    continue  
-
-                # Allow small objects to be detected
-                width, height = x2 - x1, y2 - y1
-                if width < 15 or height < 15:  # Fine-tuned for small objects
-                    continue  
-
-                detections.append({'bbox': (x1, y1, x2, y2), 'label': label, 'confidence': float(conf)})
+        self._names = None  # class-id -> label lookup array, built from the first result
+        metrics = get_metrics()
+        self._inference_timer = metrics.timer("detector.inference")
+        self._postprocess_timer = metrics.timer("detector.postprocess")
+        self._nms_timer = metrics.timer("detector.nms")
+        self._roi_hits = metrics.counter("detector.roi_hits")
+        self._roi_fallbacks = metrics.counter("detector.roi_fallbacks")
+
+    @property
+    def model(self):
+        # Loaded once per process on first use and shared by every detector
+        return get_model_host().get(self.model_name)
+
+    def class_names(self):
+        """Every label this detector can announce (loads the model)."""
+        with get_model_host().use(self.model_name) as model:
+            names = model.names.values()
+        return [name for name in names if name not in self.exclude_classes]
+
+    def detect_objects(self, frame, fingertip=None, hand_bbox=None, imgsz=FULL_IMGSZ):
+        with get_model_host().use(self.model_name) as model, self._inference_timer.time():
+            results = model(frame, imgsz=imgsz)
+        with self._postprocess_timer.time():
+            return self._postprocess(results, fingertip, hand_bbox)
+
+    def detect_objects_batch(self, frames, imgsz=FULL_IMGSZ):
+        """One inference call over several frames; one detection array per frame."""
+        if not len(frames):
+            return []
+        with get_model_host().use(self.model_name) as model, self._inference_timer.time():
+            results = model(list(frames), imgsz=imgsz)
+        with self._postprocess_timer.time():
+            return [self._postprocess([r], None, None) for r in results]
+
+    def detect_in_roi(self, frame, roi, imgsz=ROI_IMGSZ, fallback=True, fallback_imgsz=FULL_IMGSZ,
+                      fingertip=None, hand_bbox=None):
+        """Detect inside ``roi`` at low resolution, mapping boxes back to the frame.
+
+        The hand and fingertip filters apply inside the crop too, so the
+        pointing hand alone does not count as a hit. Falls back to a
+        full-frame pass when nothing else is left in the crop.
+        """
+        x1, y1, x2, y2 = roi
+        local_tip = (fingertip[0] - x1, fingertip[1] - y1) if fingertip else None
+        local_hand = (hand_bbox[0] - x1, hand_bbox[1] - y1, hand_bbox[2] - x1, hand_bbox[3] - y1) \
+            if hand_bbox else None
+        detections = self.detect_objects(frame[y1:y2, x1:x2], local_tip, local_hand, imgsz=imgsz)
+        if len(detections):
+            self._roi_hits.inc()
+            detections['bbox'] += np.array([x1, y1, x1, y1], dtype=np.int32)
+            return detections
+        self._roi_fallbacks.inc()  # counted even when the caller runs the full frame itself
+        if not fallback:
+            return detections
+        return self.detect_objects(frame, fingertip, hand_bbox, imgsz=fallback_imgsz)
+
+    def _postprocess(self, results, fingertip, hand_bbox):
+        parts = [self._filter(result, fingertip, hand_bbox) for result in results]
+        detections = np.concatenate(parts) if parts else empty_detections()
 
         # Apply Non-Maximum Suppression (NMS) to remove duplicate overlapping boxes
-        detections = self.apply_nms(detections)
-
-        return detections
-
-    def is_inside_hand(self, object_bbox, hand_bbox, margin=10):
-
-        x1, y1, x2, y2 = object_bbox
+        with self._nms_timer.time():
+            return self.apply_nms(detections)
+
+    def _filter(self, result, fingertip, hand_bbox):
+        """Confidence, class, hand, fingertip and size filters over one result's boxes."""
+        data = result.boxes.data  # (N, 6): x1, y1, x2, y2, conf, cls
+        data = data.cpu().numpy() if hasattr(data, "cpu") else data  # torch, or an exported graph
+        if not len(data):
+            return empty_detections()
+        boxes = data[:, :4].astype(np.int32)
+        conf = data[:, 4]
+        cls = data[:, 5].astype(np.int32)
+        names = self._class_names(result.names)
+
+        keep = conf >= self.confidence_threshold  # Ignore weak detections
+        if self.exclude_classes:
+            keep &= ~np.isin(names[cls], list(self.exclude_classes))  # Skip excluded objects
+
+        # Ignore objects inside or very close to the hand bounding box
+        if hand_bbox:
+            keep &= ~self.is_inside_hand(boxes, hand_bbox)
+
+        # Ensure detection is **above** the fingertip
+        if fingertip:
+            keep &= boxes[:, 3] <= fingertip[1]
+
+        # Allow small objects to be detected
+        keep &= ((boxes[:, 2] - boxes[:, 0]) >= 15) & ((boxes[:, 3] - boxes[:, 1]) >= 15)
+
+        out = np.empty(int(keep.sum()), dtype=DETECTION_DTYPE)
+        out['bbox'] = boxes[keep]
+        out['confidence'] = conf[keep]
+        out['class_id'] = cls[keep]
+        out['label'] = names[cls[keep]]
+        out['track_id'] = -1
+        return out
+
+    def _class_names(self, names):
+        if self._names is None or len(self._names) != len(names):
+            self._names = np.array([names[i] for i in range(len(names))], dtype=LABEL_DTYPE)
+        return self._names
+
+    def is_inside_hand(self, object_boxes, hand_bbox, margin=10):
+        """Mask of boxes with a corner inside the hand box (expanded by ``margin``)."""
+        boxes = np.asarray(object_boxes).reshape(-1, 4)
         hx1, hy1, hx2, hy2 = hand_bbox
 
         # Expand hand box slightly to ensure objects near the hand are also ignored
@@ -58,19 +215,20 @@ class ObjectDetector:
         hy2 += margin
 
         # Check if object is inside or overlapping the hand region
-        if hx1 <= x1 <= hx2 and hy1 <= y1 <= hy2:
-            return True
-        if hx1 <= x2 <= hx2 and hy1 <= y2 <= hy2:
-            return True
-
-        return False
+        top_left = (hx1 <= boxes[:, 0]) & (boxes[:, 0] <= hx2) & (hy1 <= boxes[:, 1]) & (boxes[:, 1] <= hy2)
+        bottom_right = (hx1 <= boxes[:, 2]) & (boxes[:, 2] <= hx2) & (hy1 <= boxes[:, 3]) & (boxes[:, 3] <= hy2)
+        return top_left | bottom_right
 
     def apply_nms(self, detections, iou_threshold=0.4):
-        if not detections:
-            return []
-
-        boxes = [d["bbox"] for d in detections]
-        confidences = [d["confidence"] for d in detections]
-
-        indices = cv2.dnn.NMSBoxes(boxes, confidences, self.confidence_threshold, iou_threshold)
-        return [detections[i] for i in indices.flatten()] if len(indices) > 0 else []
+        """Class-agnostic greedy NMS, highest confidence first."""
+        if len(detections) < 2:
+            return detections
+
+        order = np.argsort(-detections['confidence'], kind="stable")
+        boxes = detections['bbox']
+        keep = []
+        while len(order):
+            best, rest = order[0], order[1:]
+            keep.append(best)
+            order = rest[box_iou(boxes[best], boxes[rest])[0] <= iou_threshold]
+        return detections[keep]
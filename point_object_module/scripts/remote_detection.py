@@ -0,0 +1,73 @@
+import os
+import time
+
+import numpy as np
+
+from scripts.object_detection import ObjectDetector, empty_detections, DEFAULT_MODEL_PATH, FULL_IMGSZ
+from common.inference_client import InferenceClient, ServerUnavailable
+from common.metrics import get_metrics
+
+RETRY_AFTER = 10.0  # seconds on the local model before trying the server again
+
+
+class RemoteDetector(ObjectDetector):
+    """ObjectDetector whose inference runs in the shared inference server.
+
+    The server batches frames from every stream onto one model; ROI
+    crops, fallbacks and NMS work as for the local detector. A dropped
+    or unanswered request yields no detections for that frame. With no
+    server to ask (not running, or it rejects our key) detection falls
+    back to the local model, which is only loaded then.
+    """
+
+    def __init__(self, stream=None, model_path=DEFAULT_MODEL_PATH, confidence_threshold=0.4,
+                 exclude_classes=None, inference=None):
+        super().__init__(model_path, confidence_threshold, exclude_classes, inference)
+        self.client = InferenceClient(stream or f"point-{os.getpid()}")
+        self._classes = None
+        self._local_until = 0.0
+        self._misses = get_metrics().counter("detector.remote_misses")
+
+    def _use_local(self, error):
+        if not self._local_until:
+            print(f"[Detector] {error}; detecting locally.")
+        self._local_until = time.monotonic() + RETRY_AFTER
+
+    def class_names(self):
+        if self._classes is None and time.monotonic() >= self._local_until:
+            try:
+                status = self.client.status()
+                self._classes = status.get("classes") if status else None
+            except ServerUnavailable as e:
+                self._use_local(e)
+        if self._classes is None:
+            return super().class_names()
+        return [name for name in self._classes if name not in self.exclude_classes]
+
+    def detect_objects(self, frame, fingertip=None, hand_bbox=None, imgsz=FULL_IMGSZ):
+        if time.monotonic() < self._local_until:
+            return super().detect_objects(frame, fingertip, hand_bbox, imgsz)
+        try:
+            with self._inference_timer.time():
+                detections = self.client.detect(frame, imgsz)
+        except ServerUnavailable as e:
+            self._use_local(e)
+            return super().detect_objects(frame, fingertip, hand_bbox, imgsz)
+        if self._local_until:
+            print("[Detector] Inference server is back.")
+            self._local_until = 0.0
+        if detections is None:
+            self._misses.inc()
+            return empty_detections()
+        keep = detections['confidence'] >= self.confidence_threshold
+        if self.exclude_classes:
+            keep &= ~np.isin(detections['label'], list(self.exclude_classes))
+        if hand_bbox:
+            keep &= ~self.is_inside_hand(detections['bbox'], hand_bbox)
+        if fingertip:
+            keep &= detections['bbox'][:, 3] <= fingertip[1]
+        return detections[keep]
+
+    def detect_objects_batch(self, frames, imgsz=FULL_IMGSZ):
+        # The server does the batching, across streams
+        return [self.detect_objects(frame, imgsz=imgsz) for frame in frames]
@@ -0,0 +1,177 @@
+import itertools
+import time
+
+import numpy as np
+
+from scripts.object_detection import DETECTION_DTYPE, box_iou
+
+
+class Track:
+    def __init__(self, track_id, bbox, label, class_id, confidence):
+        self.track_id   = track_id
+        self.bbox       = np.asarray(bbox, dtype=np.float32)
+        self.velocity   = np.zeros(4, dtype=np.float32)  # per step, for each box edge
+        self.label      = label
+        self.class_id   = class_id
+        self.confidence = float(confidence)
+        self.hits       = 1
+        self.misses     = 0
+
+
+class ObjectTracker:
+    """IoU-matched tracks with a constant-velocity (alpha-beta) box filter.
+
+    ``update`` folds in a fresh detection pass; ``predict`` moves every
+    track along its velocity and decays its confidence, which is how boxes
+    are carried between keyframes without running the detector.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_misses=2, alpha=0.7, beta=0.3, decay=0.95):
+        self.iou_threshold = iou_threshold
+        self.max_misses    = max_misses
+        self.alpha         = alpha
+        self.beta          = beta
+        self.decay         = decay
+        self.tracks        = []
+        self._ids          = itertools.count(1)
+        self._steps        = 0  # predict() calls since the last update()
+
+    def reset(self):
+        self.tracks = []
+        self._steps = 0
+
+    def predict(self):
+        for t in self.tracks:
+            t.bbox = t.bbox + t.velocity
+            t.confidence *= self.decay
+        self._steps += 1
+        return self.detections()
+
+    def update(self, detections, region=None):
+        """Fold in a DETECTION_DTYPE array from the detector; returns tracked boxes.
+
+        With ``region`` (x1, y1, x2, y2) the detector only looked there:
+        unmatched tracks centred outside it coast without counting a miss.
+        """
+        steps = self._steps + 1  # includes this frame
+        self._steps = 0
+
+        boxes = detections['bbox'].astype(np.float32)
+        predicted = np.array([t.bbox + t.velocity for t in self.tracks],
+                             dtype=np.float32).reshape(-1, 4)
+        ious = box_iou(predicted, boxes)
+        if ious.size:
+            classes_t = np.array([t.class_id for t in self.tracks])
+            ious[classes_t[:, None] != detections['class_id'][None, :]] = 0.0  # never swap classes
+
+        matched_t, matched_d = set(), set()
+        # Greedy assignment, best overlap first
+        for flat in np.argsort(-ious, axis=None):
+            ti, di = np.unravel_index(flat, ious.shape)
+            if ious[ti, di] < self.iou_threshold:
+                break
+            if ti in matched_t or di in matched_d:
+                continue
+            matched_t.add(ti)
+            matched_d.add(di)
+            track = self.tracks[ti]
+            residual = boxes[di] - predicted[ti]
+            track.bbox = predicted[ti] + self.alpha * residual
+            track.velocity = track.velocity + self.beta * residual / steps
+            track.confidence = float(detections[di]['confidence'])
+            track.hits += 1
+            track.misses = 0
+
+        survivors = []
+        for i, track in enumerate(self.tracks):
+            if i not in matched_t:
+                track.bbox = predicted[i]
+                if region is None or self._inside(track.bbox, region):
+                    track.misses += 1
+                if track.misses > self.max_misses:
+                    continue
+            survivors.append(track)
+        for i, det in enumerate(detections):
+            if i not in matched_d:
+                survivors.append(Track(next(self._ids), det['bbox'], str(det['label']),
+                                       int(det['class_id']), det['confidence']))
+        self.tracks = survivors
+        return self.detections()
+
+    @staticmethod
+    def _inside(bbox, region):
+        cx, cy = (bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2
+        return region[0] <= cx <= region[2] and region[1] <= cy <= region[3]
+
+    def detections(self):
+        """Current tracks as a DETECTION_DTYPE array with track IDs filled in."""
+        out = np.empty(len(self.tracks), dtype=DETECTION_DTYPE)
+        if self.tracks:
+            out['bbox'] = np.array([t.bbox for t in self.tracks])
+            out['confidence'] = [t.confidence for t in self.tracks]
+            out['class_id'] = [t.class_id for t in self.tracks]
+            out['label'] = [t.label for t in self.tracks]
+            out['track_id'] = [t.track_id for t in self.tracks]
+        return out
+
+    def min_confidence(self):
+        return min((t.confidence for t in self.tracks), default=0.0)
+
+
+class KeyframeScheduler:
+    """Decides when the full detector must run instead of track propagation.
+
+    A keyframe is forced on the first frame, every ``interval`` frames,
+    after ``max_age`` seconds, when track confidence has decayed below
+    ``min_confidence``, or when the fingertip leaves every tracked box or
+    nothing is tracked (at most once per ``miss_interval`` frames, so
+    empty scenes stay cheap). Keyframes may search only a fingertip
+    crop; every ``full_every``-th one, and any taken while tracks have
+    faded, covers the whole frame so objects outside the crop are
+    refreshed or dropped.
+    """
+
+    def __init__(self, interval=6, max_age=1.0, min_confidence=0.35, miss_interval=3, full_every=4):
+        self.interval       = interval
+        self.max_age        = max_age
+        self.min_confidence = min_confidence
+        self.miss_interval  = miss_interval
+        self.full_every     = full_every
+        self._since_key     = None
+        self._key_time      = 0.0
+        self._since_full    = None  # keyframes since the last full-frame one
+
+    def should_detect(self, tracker, fingertip=None, now=None):
+        now = now or time.monotonic()
+        if self._since_key is None:
+            return True
+        if not tracker.tracks:
+            return self._since_key >= self.miss_interval  # empty scene: re-check, throttled
+        if self._since_key >= self.interval or now - self._key_time >= self.max_age:
+            return True
+        if tracker.min_confidence() < self.min_confidence:
+            return True
+        if fingertip is not None and self._since_key >= self.miss_interval:
+            fx, fy = fingertip
+            if not any(t.bbox[0] <= fx <= t.bbox[2] and t.bbox[1] <= fy <= t.bbox[3]
+                       for t in tracker.tracks):
+                return True
+        return False
+
+    def wants_full_frame(self, tracker):
+        """Whether the keyframe about to run should search the whole frame."""
+        if self._since_full is None or self._since_full + 1 >= self.full_every:
+            return True
+        return bool(tracker.tracks) and tracker.min_confidence() < self.min_confidence
+
+    def mark(self, keyframe, now=None, full=True):
+        if keyframe:
+            self._since_key = 0
+            self._key_time = now or time.monotonic()
+            self._since_full = 0 if full else (self._since_full or 0) + 1
+        elif self._since_key is not None:
+            self._since_key += 1
+
+    def reset(self):
+        self._since_key = None
+        self._since_full = None
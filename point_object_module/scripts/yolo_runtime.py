@@ -0,0 +1,138 @@
+import ast
+import os
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+from common.inference import OnnxRunner, onnx_metadata, quantize_onnx, set_torch_threads
+
+# Stand-ins for the ultralytics result fields ObjectDetector reads
+Boxes  = namedtuple("Boxes", "data")          # (N, 6) float32: x1, y1, x2, y2, conf, cls
+Result = namedtuple("Result", "boxes names")
+
+CONF_THRESHOLD = 0.25  # ultralytics' predict defaults, so backends agree
+IOU_THRESHOLD  = 0.7
+PAD_VALUE      = 114
+
+
+def _stale(path, source):
+    return not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(source)
+
+def export_model(model_path, backend, int8=False):
+    """Export the .pt weights next to themselves once; returns the graph to load.
+
+    "onnx" exports a dynamic-shape ONNX graph (INT8 by dynamic
+    quantization); "openvino" uses the ultralytics OpenVINO exporter,
+    whose INT8 mode calibrates activations as well.
+    """
+    base = os.path.splitext(model_path)[0]
+    suffix = "_int8" if int8 else ""
+    if backend == "openvino":
+        target = f"{base}{suffix}_openvino_model"
+        xml = os.path.join(target, os.path.basename(base) + ".xml")
+        if _stale(xml, model_path):
+            from ultralytics import YOLO
+            print(f"[Detector] Exporting {model_path} to OpenVINO{' INT8' if int8 else ''}...")
+            out = YOLO(model_path).export(format="openvino", int8=int8, dynamic=True)
+            if os.path.abspath(out) != os.path.abspath(target):
+                os.replace(out, target)
+        return xml
+
+    onnx_path = f"{base}.onnx"
+    if _stale(onnx_path, model_path):
+        from ultralytics import YOLO
+        print(f"[Detector] Exporting {model_path} to ONNX...")
+        out = YOLO(model_path).export(format="onnx", dynamic=True, simplify=True)
+        if os.path.abspath(out) != os.path.abspath(onnx_path):
+            os.replace(out, onnx_path)
+    if not int8:
+        return onnx_path
+    int8_path = f"{base}_int8.onnx"
+    if _stale(int8_path, onnx_path):
+        print(f"[Detector] Quantizing {onnx_path} to INT8...")
+        quantize_onnx(onnx_path, int8_path)
+    return int8_path
+
+def _class_names(path, metadata):
+    """Class names the exporter stored with the graph."""
+    if "names" not in metadata:
+        if path.endswith(".xml"):
+            import yaml  # ships with ultralytics, which wrote the file
+            meta_file = os.path.join(os.path.dirname(path), "metadata.yaml")
+            with open(meta_file, "r", encoding="utf-8") as f:
+                return yaml.safe_load(f)["names"]
+        metadata = onnx_metadata(path)
+    return ast.literal_eval(metadata["names"])
+
+def letterbox(frame, size):
+    """Fit ``frame`` into a size x size canvas; returns it with the scale and offset."""
+    h, w = frame.shape[:2]
+    scale = min(size / h, size / w)
+    nh, nw = max(1, round(h * scale)), max(1, round(w * scale))
+    top, left = (size - nh) // 2, (size - nw) // 2
+    canvas = np.full((size, size, 3), PAD_VALUE, dtype=np.uint8)
+    canvas[top:top + nh, left:left + nw] = cv2.resize(frame, (nw, nh), interpolation=cv2.INTER_LINEAR)
+    return canvas, scale, (left, top)
+
+
+class ExportedYolo:
+    """A YOLOv8 detection graph on ONNX Runtime or OpenVINO.
+
+    Called like an ultralytics model (``model(frame_or_list, imgsz=...)``)
+    and returns results with the same ``boxes.data`` and ``names`` fields,
+    so ObjectDetector's filtering is shared by every backend. Frames of a
+    batch are letterboxed to one square size and run in a single call.
+    """
+
+    def __init__(self, path, backend="onnx", threads=None,
+                 conf=CONF_THRESHOLD, iou=IOU_THRESHOLD):
+        self.runner = OnnxRunner(path, backend, threads)
+        self.names  = _class_names(path, self.runner.metadata)
+        self.conf   = conf
+        self.iou    = iou
+
+    def __call__(self, source, imgsz=640, **_):
+        frames = source if isinstance(source, (list, tuple)) else [source]
+        size = int(np.ceil(imgsz / 32) * 32)  # the graph's stride
+        boxed = [letterbox(frame, size) for frame in frames]
+        blob = cv2.dnn.blobFromImages([canvas for canvas, _, _ in boxed], 1 / 255.0, swapRB=True)
+        output = np.asarray(self.runner(blob)[0])  # (batch, 4 + classes, anchors)
+        return [self._decode(pred.T, scale, offset, frame.shape)
+                for pred, (_, scale, offset), frame in zip(output, boxed, frames)]
+
+    def _decode(self, pred, scale, offset, shape):
+        scores = pred[:, 4:]
+        cls = scores.argmax(axis=1)
+        conf = scores[np.arange(len(scores)), cls]
+        keep = conf >= self.conf
+        pred, cls, conf = pred[keep], cls[keep], conf[keep]
+
+        # Centre/size in canvas pixels -> corners in frame pixels
+        xy, wh = pred[:, :2], pred[:, 2:4]
+        boxes = np.concatenate([xy - wh / 2, xy + wh / 2], axis=1)
+        boxes -= np.array(offset * 2, dtype=np.float32)
+        boxes /= scale
+        h, w = shape[:2]
+        np.clip(boxes, 0, [w, h, w, h], out=boxes)
+
+        # Per-class NMS in one call: shift each class into its own region
+        if len(boxes):
+            shifted = boxes + (cls * max(w, h) * 2)[:, None]
+            rects = np.concatenate([shifted[:, :2], shifted[:, 2:] - shifted[:, :2]], axis=1)
+            idx = np.asarray(cv2.dnn.NMSBoxes(rects.tolist(), conf.tolist(), self.conf, self.iou),
+                             dtype=np.int64).reshape(-1)
+        else:
+            idx = np.empty(0, dtype=np.int64)
+        data = np.column_stack([boxes[idx], conf[idx], cls[idx]]).astype(np.float32)
+        return Result(Boxes(data), self.names)
+
+
+def load_detector(model_path, config):
+    """The detector model for ``config``: ultralytics on torch, or an exported graph."""
+    if config.backend == "torch":
+        set_torch_threads(config.threads)
+        from ultralytics import YOLO  # heavy (torch); deferred until first use
+        return YOLO(model_path)
+    path = export_model(model_path, config.backend, bool(config.int8))
+    return ExportedYolo(path, config.backend, config.threads)
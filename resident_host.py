@@ -0,0 +1,124 @@
+import argparse
+import os
+import sys
+import threading
+
+# ─── Make both modules importable from one warm process ───────────────────────
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+for module_dir in ("easyocr_module", "point_object_module"):
+    sys.path.insert(0, os.path.join(ROOT_DIR, module_dir))
+
+from common.control import ControlServer, CommandQueue, ACTIVATE, DEACTIVATE, STOP, STATUS
+from common.model_host import get_model_host, MAX_MODELS_ENV
+from common import frame_bus
+
+HOST_NAME    = "host"
+STOP_TIMEOUT = 5  # seconds
+
+
+def _pipeline_main(name):
+    # Imported on first activation so a reader-only session never loads YOLO
+    if name == "ocr":
+        import easyocr_main
+        return easyocr_main.main
+    if name == "point":
+        import point_detection_main
+        return point_detection_main.main
+    raise KeyError(name)
+
+
+class Pipeline:
+    def __init__(self, name):
+        self.name   = name
+        self.inbox  = CommandQueue()
+        self.thread = threading.Thread(target=self._run, name=f"pipeline-{name}", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        host = get_model_host()
+        host.pin(self.name)  # models registered under the pipeline's group stay while it runs
+        try:
+            _pipeline_main(self.name)(self.inbox)
+        except Exception as e:
+            print(f"[Host] Pipeline {self.name} crashed: {e}")
+        finally:
+            host.unpin(self.name)
+            self.inbox.close()
+
+    def is_alive(self):
+        return self.thread.is_alive()
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        self.inbox.post(STOP)
+        self.thread.join(timeout)
+        return not self.thread.is_alive()
+
+
+class ResidentHost:
+    """Keeps models warm across mode switches; pipelines are just threads.
+
+    The controller activates and deactivates the reader ("ocr") and pointer
+    ("point") pipelines over the control channel. Other commands carry a
+    ``pipeline`` argument and are forwarded to that pipeline's inbox.
+    """
+
+    def __init__(self):
+        self.server    = ControlServer(HOST_NAME)
+        self.pipelines = {}
+
+    def serve(self):
+        print("[Host] Resident model host ready.")
+        for cmd in self.server:
+            name = cmd.args.get("pipeline")
+
+            if cmd.kind == ACTIVATE:
+                self.activate(name)
+                cmd.reply(active=self.active())
+            elif cmd.kind == DEACTIVATE:
+                cmd.reply(ok=self.deactivate(name), active=self.active())
+            elif cmd.kind == STOP and name is None:
+                cmd.reply()
+                break
+            elif cmd.kind == STATUS and name is None:
+                host = get_model_host()
+                cmd.reply(active=self.active(), models=host.loaded(), load_times=host.load_times())
+            else:
+                pipeline = self.pipelines.get(name)
+                if pipeline and pipeline.is_alive():
+                    pipeline.inbox.put(cmd)  # the pipeline sends the ack
+                else:
+                    cmd.reply(ok=False, error=f"Pipeline {name!r} is not active")
+
+        for name in list(self.pipelines):
+            self.deactivate(name)
+        self.server.close()
+
+    def activate(self, name):
+        current = self.pipelines.get(name)
+        if current and current.is_alive():
+            return
+        self.pipelines[name] = Pipeline(name)
+
+    def deactivate(self, name):
+        pipeline = self.pipelines.pop(name, None)
+        if pipeline is None:
+            return False
+        return pipeline.stop()
+
+    def active(self):
+        return [n for n, p in self.pipelines.items() if p.is_alive()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resident model host for the reader and pointer.")
+    parser.add_argument("--max-models", type=int, default=None,
+                        help="keep at most N models loaded (least recently used are dropped)")
+    args = parser.parse_args()
+    if args.max_models:
+        os.environ[MAX_MODELS_ENV] = str(args.max_models)
+
+    frame_bus.KEEP_OPEN = True  # one capture thread per camera for the host's lifetime
+    ResidentHost().serve()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# Import the modules the way the resident host does: the shared `common` and
+# `chatbot` packages from the root, each module's own imports from its folder
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT_DIR, os.path.join(ROOT_DIR, "easyocr_module"), os.path.join(ROOT_DIR, "point_object_module")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,83 @@
+import os
+import stat
+import sys
+import tempfile
+import threading
+import uuid
+
+import pytest
+
+from common import control
+from common.control import AUTHKEY_ENV, CAPTURE, STATUS, STOP, CommandQueue, ControlClient, ControlServer
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets")
+
+
+@pytest.fixture
+def name(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))  # sockets and key file
+    monkeypatch.setenv(AUTHKEY_ENV, "test-key")
+    return f"test-{uuid.uuid4().hex[:8]}"
+
+
+def serve(server, **data):
+    def run():
+        for cmd in server:
+            cmd.reply(kind=cmd.kind, **cmd.args, **data)
+            if cmd.kind == STOP:
+                break
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_command_queue_post_and_stop():
+    queue = CommandQueue()
+    queue.post(CAPTURE, page=3)
+    assert not queue.stop_requested.is_set()
+    queue.post(STOP)
+    assert queue.stop_requested.is_set()
+    first = queue.get(timeout=1)
+    assert (first.kind, first.args) == (CAPTURE, {"page": 3})
+    first.reply()  # nobody waits on it; must not raise
+    assert queue.get(timeout=1).kind == STOP
+    assert queue.get(timeout=0.01) is None
+
+
+def test_round_trip(name):
+    server = ControlServer(name)
+    thread = serve(server, pid=os.getpid())
+    client = ControlClient(name)
+    try:
+        reply = client.request(STATUS, timeout=2.0, page=2)
+        assert reply["ok"] and reply["kind"] == STATUS and reply["page"] == 2
+        assert client.request(control.PING, timeout=2.0)["ok"]
+        assert client.request(STOP, timeout=2.0)["ok"]
+        thread.join(timeout=2)
+        assert server.stop_requested.is_set()
+    finally:
+        client.close()
+        server.close()
+
+
+def test_wrong_authkey_is_rejected(name, monkeypatch):
+    server = ControlServer(name)
+    serve(server)
+    monkeypatch.setenv(AUTHKEY_ENV, "another-key")
+    client = ControlClient(name)
+    try:
+        assert client.connect(timeout=1.0) is False
+        assert not client.connected
+        assert client.request(STATUS, timeout=1.0) is None
+    finally:
+        client.close()
+        server.close()
+
+
+
+def test_key_file_is_private_and_stable(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    monkeypatch.delenv(AUTHKEY_ENV, raising=False)
+    key = control._authkey()
+    assert key and control._authkey() == key
+    assert stat.S_IMODE(os.stat(control.key_path()).st_mode) == 0o600
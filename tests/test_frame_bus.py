@@ -0,0 +1,75 @@
+import sys
+import uuid
+
+import numpy as np
+import pytest
+
+from common.frame_bus import FrameBus, get_frame_bus, release_frame_bus
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX shared memory names")
+
+
+@pytest.fixture
+def spec():
+    # A unique synthetic source per test, so buses never collide
+    return f"synthetic:{64 + uuid.uuid4().int % 64}x48"
+
+
+def test_owner_publishes_read_only_views(spec):
+    bus = FrameBus(spec, slots=4)
+    try:
+        assert bus.owner and bus.shape[:2] == (48, int(spec.split(":")[1].split("x")[0]))
+        seq, frame = bus.wait_next(-1, timeout=2)
+        assert seq >= 0 and frame.shape == bus.shape
+        assert not frame.flags.writeable
+        later, _ = bus.wait_next(seq, timeout=2)
+        assert later > seq
+        assert bus.timestamp(later) is not None
+    finally:
+        bus.close()
+
+
+def test_views_go_stale_once_their_slot_is_reused(spec):
+    bus = FrameBus(spec, slots=3)
+    try:
+        seq, _ = bus.wait_next(-1, timeout=2)
+        assert bus.is_current(seq)
+        newer = seq
+        while newer < seq + 3:
+            newer, _ = bus.wait_next(newer, timeout=2)
+        assert not bus.is_current(seq)
+        assert bus.timestamp(seq) is None
+    finally:
+        bus.close()
+
+
+def test_second_bus_attaches_instead_of_reopening(spec):
+    owner = FrameBus(spec, slots=4)
+    try:
+        consumer = FrameBus(spec)
+        assert not consumer.owner
+        seq, frame = consumer.wait_next(-1, timeout=2)
+        assert seq >= 0
+        np.testing.assert_array_equal(frame.shape, owner.shape)
+        consumer.close()
+        assert not owner.closed
+    finally:
+        owner.close()
+
+
+def test_closed_bus_returns_no_frames(spec):
+    bus = FrameBus(spec, slots=4)
+    bus.close()
+    assert bus.closed
+    assert bus.wait_next(-1, timeout=0.1) == (-1, None)
+    bus.close()  # idempotent
+
+
+def test_registry_shares_one_bus_per_device(spec):
+    first = get_frame_bus(spec)
+    second = get_frame_bus(spec)
+    assert first is second
+    release_frame_bus(spec)
+    assert not first.closed  # still referenced
+    release_frame_bus(spec)
+    assert first.closed
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import numpy as np
+
+from common.frame_sink import FrameSink, MjpegSink, NullSink, open_sink
+from common.metrics import get_metrics
+
+
+class ListSink(FrameSink):
+    def __init__(self, delay=0.0, fail=False, **kwargs):
+        self.frames   = []
+        self.times    = []
+        self.delay    = delay
+        self.fail     = fail
+        self.released = threading.Event()
+        super().__init__(**kwargs)
+
+    def emit(self, frame):
+        if self.fail:
+            raise RuntimeError("no display")
+        time.sleep(self.delay)
+        self.frames.append(frame)
+        self.times.append(time.monotonic())
+
+    def release(self):
+        self.released.set()
+
+
+def frame(value):
+    f = np.full((4, 4, 3), value, dtype=np.uint8)
+    f.flags.writeable = False  # like a FrameBus view
+    return f
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def test_draws_overlay_on_a_copy():
+    def draw(img, overlay):
+        img[0, 0] = overlay
+
+    sink = ListSink(draw=draw, max_fps=100)
+    src = frame(1)
+    sink.submit(src, overlay=9)
+    assert wait_until(lambda: sink.frames)
+    sink.close()
+    assert sink.frames[0][0, 0, 0] == 9 and src[0, 0, 0] == 1
+
+
+def test_busy_sink_keeps_newest_frame():
+    dropped = get_metrics().counter("sink.dropped")
+    before = dropped.value
+    sink = ListSink(delay=0.05, max_fps=1000)
+    for i in range(10):
+        sink.submit(frame(i))
+        time.sleep(0.005)
+    assert wait_until(lambda: sink.frames and sink.frames[-1][0, 0, 0] == 9)
+    sink.close()
+    assert len(sink.frames) < 10
+    assert dropped.value - before >= 10 - len(sink.frames)
+
+
+def test_rate_cap():
+    sink = ListSink(max_fps=20)
+    for i in range(4):
+        sink.submit(frame(i))
+        wait_until(lambda: len(sink.frames) > i)
+    sink.close()
+    gaps = np.diff(sink.times)
+    assert len(gaps) == 3 and gaps.min() >= 0.04
+
+
+def test_torn_frame_is_skipped():
+    sink = ListSink(max_fps=100)
+    sink.submit(frame(1), valid=lambda: False)
+    assert wait_until(lambda: sink._pending is None)
+    sink.submit(frame(2), valid=lambda: True)
+    assert wait_until(lambda: sink.frames)
+    sink.close()
+    assert [f[0, 0, 0] for f in sink.frames] == [2]
+
+
+def test_failure_goes_headless():
+    failed = get_metrics().counter("sink.failed")
+    before = failed.value
+    sink = ListSink(fail=True, max_fps=100)
+    sink.submit(frame(1))
+    assert wait_until(lambda: sink.failed is not None)
+    assert isinstance(sink.failed, RuntimeError)
+    assert failed.value == before + 1
+    assert sink.released.wait(1.0)
+    sink.submit(frame(2))  # discarded, does not raise
+    assert sink._pending is None
+    sink.close()
+
+
+def test_close_waits_for_render_thread():
+    sink = ListSink(delay=0.1, max_fps=100)
+    sink.submit(frame(1))
+    wait_until(lambda: sink._pending is None)
+    sink.close()
+    assert not sink._thread.is_alive()
+    assert sink.released.is_set()
+
+
+def test_open_sink_specs(tmp_path, monkeypatch):
+    monkeypatch.setenv("SONIC_VISION_DISPLAY", "none")
+    assert type(open_sink()) is NullSink
+    assert type(open_sink("headless")) is NullSink
+
+    path = tmp_path / "out.mjpg"
+    sink = open_sink(str(path), max_fps=100)
+    assert isinstance(sink, MjpegSink)
+    sink.submit(np.zeros((8, 8, 3), dtype=np.uint8))
+    wait_until(lambda: sink._pending is None)
+    time.sleep(0.05)
+    sink.close()
+    assert path.read_bytes()[:2] == b"\xff\xd8"  # a JPEG
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+
+from common.metrics import get_metrics
+from scripts import governor as governor_module
+from scripts.governor import DEFAULT_LEVEL, DETECT_HZ_LEVELS, IMGSZ_LEVELS, MIN_SAMPLES, Governor
+
+
+@pytest.fixture
+def cpu(monkeypatch):
+    """Process CPU seconds as the governor sees them; tests move it by hand."""
+    clock = {"t": 0.0}
+    monkeypatch.setattr(governor_module.time, "process_time", lambda: clock["t"])
+    return clock
+
+
+def latencies(seconds, n=MIN_SAMPLES * 2):
+    timer = get_metrics().timer("pointer.latency")
+    for _ in range(n):
+        timer.observe(seconds)
+
+
+def test_waits_for_enough_samples(cpu):
+    governor = Governor(target_latency=0.25, cpu_budget=0.6)
+    latencies(1.0, n=MIN_SAMPLES - 1)
+    assert governor.decide() is None
+    assert governor.imgsz == IMGSZ_LEVELS[DEFAULT_LEVEL]
+
+
+def test_over_latency_lowers_resolution_first(cpu):
+    governor = Governor(target_latency=0.25, cpu_budget=0.6)
+    latencies(0.5)
+    decision = governor.decide()
+    assert decision and "latency" in decision["reason"]
+    assert governor.imgsz == IMGSZ_LEVELS[DEFAULT_LEVEL - 1]
+    assert governor.detect_hz == DETECT_HZ_LEVELS[-1]
+    assert get_metrics().gauge("governor.imgsz").value == governor.imgsz
+
+
+def test_over_cpu_budget_lowers_detection_rate_first(cpu):
+    governor = Governor(target_latency=0.25, cpu_budget=0.6)
+    latencies(0.05)
+    cpu["t"] += 1e6  # far more CPU than any wall time since the last decision
+    decision = governor.decide()
+    assert decision and "cpu" in decision["reason"]
+    assert governor.detect_hz == DETECT_HZ_LEVELS[-2]
+    assert governor.imgsz == IMGSZ_LEVELS[DEFAULT_LEVEL]
+
+
+def test_hard_scene_with_headroom_raises_resolution_then_gives_it_back(cpu):
+    governor = Governor(target_latency=0.25, cpu_budget=0.6)
+    for _ in range(30):
+        governor._scene.append(True)  # pointing, nothing confident found
+    latencies(0.05)
+    assert governor.decide()["reason"] == "hard scene with headroom"
+    assert governor.imgsz == IMGSZ_LEVELS[DEFAULT_LEVEL + 1]
+
+    governor._scene.clear()
+    for _ in range(30):
+        governor.note_result(True, {'confidence': 0.9})  # confident: easy again
+    latencies(0.05)
+    governor.decide()
+    assert governor.imgsz == IMGSZ_LEVELS[DEFAULT_LEVEL]
+
+
+def test_recovers_toward_defaults_with_headroom(cpu):
+    governor = Governor(target_latency=0.25, cpu_budget=0.6)
+    latencies(0.05)
+    cpu["t"] += 1e6
+    governor.decide()
+    assert governor.detect_hz < DETECT_HZ_LEVELS[-1]
+    latencies(0.05)
+    governor.decide()
+    assert governor.state()["detect_hz"] == DETECT_HZ_LEVELS[-1]
+
+
+def test_allow_paces_a_stage():
+    governor = Governor()
+    assert governor.allow("detect", 10)
+    assert not governor.allow("detect", 10)
+    time.sleep(0.11)
+    assert governor.allow("detect", 10)
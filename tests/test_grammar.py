@@ -0,0 +1,49 @@
+import pytest
+
+from chatbot.grammar import CommandGrammar, grammar_phrases, normalize_command, number_words
+
+
+@pytest.mark.parametrize("n, words", [(0, "zero"), (7, "seven"), (20, "twenty"), (42, "forty two"),
+                                      (100, "one hundred"), (121, "one hundred twenty one")])
+def test_number_words(n, words):
+    assert number_words(n) == words
+
+
+@pytest.mark.parametrize("text, command", [
+    ("Read Page Twenty One", "read page 21"),
+    ("read page one hundred five", "read page 105"),
+    ("read page hundred", "read page hundred"),
+    ("find seven dwarfs", "find 7 dwarfs"),
+    ("capture", "capture"),
+])
+def test_normalize_command(text, command):
+    assert normalize_command(text) == command
+
+
+def test_every_page_number_round_trips():
+    for n in range(1, 201):
+        assert normalize_command(f"read page {number_words(n)}") == f"read page {n}"
+
+
+def test_grammar_phrases():
+    phrases = grammar_phrases(max_page=3)
+    assert "capture" in phrases and "find" in phrases
+    assert [p for p in phrases if p.startswith("read page")] == [
+        "read page one", "read page two", "read page three"]
+    assert "translate page two to spanish" in phrases
+    assert normalize_command("translate page two to spanish") == "translate page 2 to spanish"
+
+
+def test_is_complete_waits_for_longer_phrases():
+    grammar = CommandGrammar()
+    assert grammar.is_complete("capture")
+    assert grammar.is_complete("  Stop   All ")
+    assert "stop" in grammar.phrases and not grammar.is_complete("stop")  # "stop reader" may follow
+    assert not grammar.is_complete("read page twenty")  # "twenty one" may follow
+    assert grammar.is_complete("read page twenty one")
+    assert not grammar.is_complete("translate page twenty one")  # the language follows
+    assert grammar.is_complete("translate page twenty one to french")
+    assert not grammar.is_complete("read page")
+    assert not grammar.is_complete("find")
+    assert not grammar.is_complete("make coffee")
+    assert grammar.is_open("find") and not grammar.is_open("find keys")
@@ -0,0 +1,111 @@
+import types
+
+import numpy as np
+import pytest
+
+pytest.importorskip("mediapipe")
+
+from common.model_host import ModelHost
+from scripts import handtracking
+from scripts.handtracking import HandTracker, pointing_mask
+
+
+class BlobHands:
+    """Stands in for MediaPipe: one pointing hand spread over the bright pixels."""
+
+    def __init__(self):
+        self.calls = []
+
+    def process(self, rgb):
+        self.calls.append(rgb.shape[:2])
+        ys, xs = np.nonzero(rgb[..., 0] > 200)
+        if not len(xs):
+            return types.SimpleNamespace(multi_hand_landmarks=None)
+        h, w = rgb.shape[:2]
+        x1, x2, y1, y2 = xs.min(), xs.max(), ys.min(), ys.max()
+        points = []
+        for i in range(handtracking.NUM_LANDMARKS):
+            fy = {8: 0.0, 7: 0.2, 12: 1.0, 16: 1.0, 20: 1.0}.get(i, 0.5)
+            points.append(types.SimpleNamespace(x=(x1 + (x2 - x1) * i / 20) / w,
+                                                y=(y1 + (y2 - y1) * fy) / h))
+        return types.SimpleNamespace(multi_hand_landmarks=[types.SimpleNamespace(landmark=points)])
+
+
+class BlobHost(ModelHost):
+    def register(self, name, loader, unloader=None, group=None):
+        hands = BlobHands()
+        super().register(name, lambda: hands, group=group)
+
+
+def make_tracker(monkeypatch, **kwargs):
+    host = BlobHost()
+    monkeypatch.setattr(handtracking, "get_model_host", lambda: host)
+    tracker = HandTracker(**kwargs)
+    tracker.full, tracker.roi = host.get(tracker.model_name), host.get(tracker.roi_model_name)
+    return tracker
+
+
+@pytest.fixture
+def tracker(monkeypatch):
+    return make_tracker(monkeypatch, smoothing=0.0)
+
+
+def frame_with_hand(x1, y1, x2, y2, shape=(480, 640)):
+    frame = np.zeros((*shape, 3), dtype=np.uint8)
+    frame[y1:y2 + 1, x1:x2 + 1] = 255
+    return frame
+
+
+def test_pointing_mask():
+    hands = np.zeros((2, handtracking.NUM_LANDMARKS, 2), dtype=np.float32)
+    hands[:, :, 1] = 50
+    hands[0, 8, 1], hands[0, 7, 1] = 10, 20     # index up
+    hands[0, [12, 16, 20], 1] = 80              # others folded
+    hands[1, [8, 12, 16, 20], 1] = 10           # open hand
+    assert pointing_mask(hands).tolist() == [True, False]
+
+
+def test_follows_hand_in_roi(tracker):
+    frame = frame_with_hand(300, 200, 340, 260)
+    assert tracker.is_pointing(frame) == (316, 200)
+    assert len(tracker.full.calls) == 1 and not tracker.roi.calls
+
+    # Next frame: only the crop around the hand is processed, in frame coordinates
+    assert tracker.is_pointing(frame) == (316, 200)
+    assert len(tracker.full.calls) == 1 and len(tracker.roi.calls) == 1
+    assert tracker.roi.calls[0][0] < 480 and tracker.roi.calls[0][1] < 640
+    assert tracker.hand_bbox() == (300, 200, 340, 260)
+    direction = tracker.pointing_direction()
+    assert direction is not None and direction[1] < 0
+
+
+def test_lost_in_roi_falls_back_to_full_frame(tracker):
+    tracker.is_pointing(frame_with_hand(300, 200, 340, 260))
+    moved = frame_with_hand(20, 20, 60, 80)
+    assert tracker.is_pointing(moved) == (36, 20)
+    assert len(tracker.roi.calls) == 1 and len(tracker.full.calls) == 2
+
+
+def test_large_hand_runs_full_frame(tracker):
+    frame = frame_with_hand(100, 50, 400, 450)
+    tracker.find_hands(frame)
+    tracker.find_hands(frame)
+    assert len(tracker.full.calls) == 2 and not tracker.roi.calls
+
+
+def test_no_hand_clears_roi(tracker):
+    tracker.find_hands(frame_with_hand(300, 200, 340, 260))
+    assert tracker.find_hands(np.zeros((480, 640, 3), dtype=np.uint8)) == 0
+    assert tracker.is_pointing(np.zeros((480, 640, 3), dtype=np.uint8)) is None
+    assert tracker.hand_bbox() is None and tracker.pointing_direction() is None
+
+
+def test_reacquires_missing_hands(monkeypatch):
+    tracker = make_tracker(monkeypatch, maxHands=2)
+    full, roi = tracker.full, tracker.roi
+    frame = frame_with_hand(300, 200, 340, 260)
+    for _ in range(handtracking.REACQUIRE_EVERY + 2):
+        tracker.find_hands(frame)
+    # One pass to find the hand, one after REACQUIRE_EVERY crops to look for a second
+    assert len(full.calls) == 2
+    assert len(roi.calls) == handtracking.REACQUIRE_EVERY
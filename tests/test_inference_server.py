@@ -0,0 +1,55 @@
+import threading
+import time
+
+from inference_server import FairQueue
+
+
+def test_round_robin_between_streams():
+    queue = FairQueue(per_stream=4)
+    for i in range(3):
+        queue.put("a", f"a{i}")
+    queue.put("b", "b0")
+    assert queue.take(limit=4, window=0.0) == ["a0", "b0", "a1", "a2"]
+    assert queue.depth() == {}
+
+
+def test_busy_stream_loses_oldest():
+    queue = FairQueue(per_stream=2)
+    assert queue.put("a", 1) is None
+    assert queue.put("a", 2) is None
+    assert queue.put("a", 3) == 1
+    assert queue.dropped == {"a": 1}
+    assert queue.take(limit=8, window=0.0) == [2, 3]
+
+
+def test_full_queue_refuses_new_work():
+    queue = FairQueue(per_stream=2, total=3)
+    queue.put("a", "a0")
+    queue.put("a", "a1")
+    queue.put("b", "b0")
+    assert queue.put("c", "c0") == "c0"
+    assert queue.dropped == {"c": 1}
+    assert queue.depth() == {"a": 2, "b": 1}
+
+
+def test_batch_shares_key():
+    queue = FairQueue()
+    queue.put("a", (640, "a0"))
+    queue.put("b", (320, "b0"))
+    queue.put("c", (640, "c0"))
+    first = queue.take(limit=8, window=0.0, key=lambda item: item[0])
+    assert first == [(640, "a0"), (640, "c0")]
+    assert queue.take(limit=8, window=0.0, key=lambda item: item[0]) == [(320, "b0")]
+
+
+def test_take_waits_for_window_and_times_out():
+    queue = FairQueue()
+    assert queue.take(limit=4, window=0.0, timeout=0.01) == []
+
+    queue.put("a", "a0")
+    late = threading.Timer(0.02, queue.put, ("b", "b0"))
+    late.start()
+    start = time.monotonic()
+    assert queue.take(limit=2, window=0.5) == ["a0", "b0"]
+    assert time.monotonic() - start < 0.4  # returns once the batch is full
+    late.join()
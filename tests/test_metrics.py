@@ -0,0 +1,79 @@
+import json
+import threading
+
+import numpy as np
+
+from common import metrics
+from common.metrics import WINDOW, MetricsDumper, MetricsRegistry, Timer
+
+
+def test_counter_is_exact_across_threads():
+    registry = MetricsRegistry()
+    counter = registry.counter("hits")
+
+    def hammer():
+        for _ in range(20000):
+            counter.inc()
+
+    threads = [threading.Thread(target=hammer) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert counter.value == 80000
+    assert registry.counter("hits") is counter
+
+
+def test_timer_ring_keeps_newest():
+    timer = Timer()
+    for i in range(WINDOW + 10):
+        timer.observe(float(i))
+    assert timer.count == WINDOW + 10
+    assert timer.recent(3).tolist() == [WINDOW + 9, WINDOW + 8, WINDOW + 7]
+    assert len(timer.recent()) == WINDOW
+    assert timer.recent(0).size == 0
+
+
+def test_timer_summary():
+    timer = Timer()
+    assert timer.summary() == {"count": 0}
+    for ms in range(1, 101):
+        timer.observe(ms / 1000.0)
+    summary = timer.summary()
+    assert summary["count"] == 100
+    assert np.isclose(summary["mean_ms"], 50.5)
+    assert np.isclose(summary["max_ms"], 100.0)
+    assert summary["p50_ms"] < summary["p95_ms"] < summary["p99_ms"]
+
+
+def test_snapshot_rates(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(metrics.time, "monotonic", lambda: clock[0])
+    registry = MetricsRegistry()
+    registry.inc("frames", 10)
+    registry.set("level", 3)
+    registry.observe("stage", 0.01)
+    clock[0] = 102.0
+    first = registry.snapshot()
+    assert first["counters"]["frames"] == {"count": 10, "rate_per_s": 5.0}
+    assert first["gauges"] == {"level": 3}
+    assert first["timers"]["stage"]["count"] == 1
+
+    registry.inc("frames", 4)
+    clock[0] = 104.0
+    assert registry.snapshot()["counters"]["frames"]["rate_per_s"] == 2.0
+
+
+def test_dumper_writes_json_lines(tmp_path):
+    registry = MetricsRegistry()
+    registry.inc("frames")
+    path = tmp_path / "metrics.jsonl"
+    dumper = MetricsDumper(registry, str(path), interval=60.0)
+    dumper.close()
+    lines = path.read_text().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])["counters"]["frames"]["count"] == 1
+
+
+def test_process_registry_is_shared():
+    assert metrics.get_metrics() is metrics.get_metrics()
@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+
+from common.model_host import ModelHost
+
+
+class Models:
+    """Loaders and unloaders that record what happened."""
+
+    def __init__(self):
+        self.loads    = []
+        self.unloaded = []
+
+    def register(self, host, name, group=None):
+        def load():
+            self.loads.append(name)
+            return {"name": name}
+        host.register(name, load, unloader=lambda model: self.unloaded.append(model["name"]),
+                      group=group)
+
+
+@pytest.fixture
+def models():
+    return Models()
+
+
+def test_loads_lazily_once(models):
+    host = ModelHost()
+    models.register(host, "yolo")
+    assert host.loaded() == [] and models.loads == []
+    assert host.get("yolo") is host.get("yolo")
+    assert models.loads == ["yolo"] and host.loaded() == ["yolo"]
+    assert set(host.load_times()) == {"yolo"}
+    with pytest.raises(KeyError):
+        host.get("missing")
+
+
+def test_least_recently_used_is_evicted(models):
+    host = ModelHost(max_models=2)
+    for name in ("a", "b", "c"):
+        models.register(host, name)
+    host.get("a")
+    host.get("b")
+    host.get("a")  # b is now the oldest
+    host.get("c")
+    assert host.loaded() == ["a", "c"]
+    assert models.unloaded == ["b"]
+
+
+def test_group_is_evicted_whole_and_never_for_itself(models):
+    host = ModelHost(max_models=2)
+    for name in ("yolo", "hands", "hands-roi"):
+        models.register(host, name, group="point")
+    models.register(host, "easyocr", group="ocr")
+
+    # A limit below the group size does not make the pointer's models evict each other
+    for _ in range(3):
+        for name in ("yolo", "hands", "hands-roi"):
+            host.get(name)
+    assert models.loads == ["yolo", "hands", "hands-roi"] and models.unloaded == []
+
+    host.get("easyocr")
+    assert host.loaded() == ["easyocr"]
+    assert sorted(models.unloaded) == ["hands", "hands-roi", "yolo"]
+
+    host.get("hands")
+    host.get("yolo")  # back over the limit: the reader's model goes, not the pointer's
+    assert host.loaded() == ["hands", "yolo"] and models.unloaded[-1] == "easyocr"
+
+
+def test_pinned_group_is_kept(models):
+    host = ModelHost(max_models=1)
+    models.register(host, "yolo", group="point")
+    models.register(host, "easyocr", group="ocr")
+    host.pin("point")
+    host.get("yolo")
+    host.get("easyocr")
+    assert host.loaded() == ["yolo", "easyocr"]  # over the limit rather than dropping it
+
+    host.unpin("point")  # evicts the least recent once nothing holds it
+    assert host.loaded() == ["easyocr"] and models.unloaded == ["yolo"]
+
+
+def test_model_in_use_is_not_closed(models):
+    host = ModelHost(max_models=1)
+    models.register(host, "hands")
+    models.register(host, "easyocr")
+    inside, done = threading.Event(), threading.Event()
+
+    def pointer():
+        with host.use("hands") as hands:
+            inside.set()
+            done.wait(2.0)
+            assert hands["name"] not in models.unloaded
+
+    thread = threading.Thread(target=pointer)
+    thread.start()
+    assert inside.wait(2.0)
+    host.get("easyocr")  # another thread loads while the hands graph is mid-call
+    assert "hands" not in models.unloaded
+    done.set()
+    thread.join()
+    assert models.unloaded == ["hands"]  # dropped only after the call returned
+
+
+def test_reuse_after_eviction_reloads(models):
+    host = ModelHost(max_models=1)
+    models.register(host, "a")
+    models.register(host, "b")
+    first = host.get("a")
+    host.get("b")
+    second = host.get("a")
+    assert first is not second
+    assert models.loads == ["a", "b", "a"]
@@ -0,0 +1,71 @@
+import numpy as np
+
+from scripts.navigation import GuidanceStream, Navigator
+from scripts.object_detection import ray_scores
+
+SHAPE = (480, 640, 3)
+
+
+def obj(x1, y1, x2, y2):
+    return {"bbox": (x1, y1, x2, y2)}
+
+
+def test_navigator_direction_and_steps():
+    nav = Navigator(640, 480)
+    assert nav.get_navigation_instruction((100, 400), (400, 100, 500, 200)) == \
+        "Take 5 steps forward and slightly to the right."
+    assert nav.get_navigation_instruction((500, 300), (100, 250, 200, 300)) == \
+        "Take 1 step forward and slightly to the left."
+    assert "straight" in nav.get_navigation_instruction((300, 400), (280, 100, 340, 200))
+
+
+def test_guidance_offers_until_spoken():
+    stream = GuidanceStream(interval=2.0, repeat=6.0)
+    target = obj(400, 100, 500, 200)
+    first = stream.update(SHAPE, (100, 400), target, now=10.0)
+    assert first is not None and stream.latest == first
+    # Not spoken yet: the offer stands on the next result
+    assert stream.update(SHAPE, (100, 400), target, now=10.5) == first
+
+    stream.mark_spoken(first, now=10.5)
+    assert stream.update(SHAPE, (100, 400), target, now=11.0) is None
+    assert stream.latest == first
+
+
+def test_guidance_rate_limits_changes_and_repeats():
+    stream = GuidanceStream(interval=2.0, repeat=6.0)
+    target = obj(400, 100, 500, 200)
+    said = stream.update(SHAPE, (100, 400), target, now=0.0)
+    stream.mark_spoken(said, now=0.0)
+
+    # A changed instruction waits for the interval, an unchanged one for the repeat
+    changed = obj(0, 100, 60, 200)
+    assert stream.update(SHAPE, (500, 400), changed, now=1.0) is None
+    assert stream.update(SHAPE, (500, 400), changed, now=2.5) is not None
+    assert stream.update(SHAPE, (100, 400), target, now=3.0) is None
+    assert stream.update(SHAPE, (100, 400), target, now=6.5) == said
+
+
+def test_guidance_clears_without_target():
+    stream = GuidanceStream()
+    stream.update(SHAPE, (100, 400), obj(400, 100, 500, 200), now=0.0)
+    assert stream.update(SHAPE, None, None, now=1.0) is None
+    assert stream.latest is None
+    assert stream.update(SHAPE, (100, 400), None, now=1.0) is None
+
+
+def test_ray_scores_hit_test():
+    boxes = np.array([
+        [90, 90, 110, 110],    # contains the fingertip
+        [300, 95, 340, 105],   # along the ray, near
+        [500, 95, 540, 105],   # along the ray, far
+        [0, 95, 40, 105],      # behind the finger
+        [300, 300, 340, 340],  # well off the ray
+    ], dtype=np.float32)
+    conf = np.array([0.6, 0.9, 0.9, 0.9, 0.9], dtype=np.float32)
+    scores = ray_scores((100, 100), (1.0, 0.0), boxes, conf, diagonal=800.0)
+
+    assert scores[0] == np.float32(0.6)
+    assert np.isfinite(scores[1]) and np.isfinite(scores[2])
+    assert scores[1] > scores[2]
+    assert scores[3] == -np.inf and scores[4] == -np.inf
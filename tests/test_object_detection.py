@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+
+from common.inference import InferenceConfig
+from common.model_host import ModelHost
+from scripts import object_detection
+from scripts.object_detection import DETECTION_DTYPE, ObjectDetector, box_iou, empty_detections
+from scripts.yolo_runtime import Boxes, Result
+
+NAMES = {0: "person", 1: "cup", 2: "book"}
+
+
+@pytest.fixture
+def detector():
+    # Constructing registers the model lazily; nothing is loaded by these tests
+    return ObjectDetector(confidence_threshold=0.4, exclude_classes=["person"],
+                          inference=InferenceConfig("torch", None, None))
+
+
+def result(*rows):
+    return Result(Boxes(np.array(rows, dtype=np.float32).reshape(-1, 6)), NAMES)
+
+
+def dets(*rows):
+    out = np.empty(len(rows), dtype=DETECTION_DTYPE)
+    for i, (bbox, confidence) in enumerate(rows):
+        out[i] = (bbox, confidence, 1, "cup", -1)
+    return out
+
+
+def test_box_iou():
+    ious = box_iou([[0, 0, 10, 10]], [[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30], [0, 0, 0, 0]])
+    assert ious.shape == (1, 4)
+    assert ious[0] == pytest.approx([1.0, 1 / 3, 0.0, 0.0])
+    assert box_iou(np.empty((0, 4)), [[0, 0, 1, 1]]).shape == (0, 1)
+
+
+def test_nms_keeps_the_most_confident_of_each_overlap(detector):
+    detections = dets(((0, 0, 100, 100), 0.6), ((5, 5, 105, 105), 0.9),
+                      ((300, 300, 400, 400), 0.5), ((0, 0, 100, 100), 0.3))
+    kept = detector.apply_nms(detections)
+    assert list(kept['confidence']) == pytest.approx([0.9, 0.5])
+
+
+def test_nms_leaves_distinct_boxes_alone(detector):
+    detections = dets(((0, 0, 50, 50), 0.5), ((60, 0, 110, 50), 0.7))
+    assert len(detector.apply_nms(detections)) == 2
+    assert len(detector.apply_nms(empty_detections())) == 0
+
+
+def test_filter_drops_weak_excluded_and_tiny_boxes(detector):
+    out = detector._postprocess([result(
+        [10, 10, 60, 60, 0.9, 1],     # cup: kept
+        [100, 10, 150, 60, 0.2, 2],   # too weak
+        [200, 10, 260, 80, 0.95, 0],  # person: excluded
+        [300, 10, 310, 60, 0.8, 2],   # 10 px wide: too small
+        [400, 10, 460, 60, 0.7, 2],   # book: kept
+    )], None, None)
+    assert out.dtype == DETECTION_DTYPE
+    assert list(out['label']) == ["cup", "book"]
+    assert list(out['class_id']) == [1, 2]
+    assert (out['track_id'] == -1).all()
+    assert out['bbox'][1].tolist() == [400, 10, 460, 60]
+
+
+def test_filter_uses_fingertip_and_hand(detector):
+    out = detector._postprocess([result(
+        [10, 10, 60, 60, 0.9, 1],       # above the fingertip: kept
+        [10, 300, 60, 360, 0.9, 1],     # below the fingertip
+        [145, 60, 200, 120, 0.9, 2],    # corner inside the hand (with its margin)
+    )], fingertip=(100, 200), hand_bbox=(150, 50, 250, 150))
+    assert out['bbox'].tolist() == [[10, 10, 60, 60]]
+
+
+def test_filter_handles_empty_results(detector):
+    assert len(detector._postprocess([result()], None, None)) == 0
+    assert len(detector._postprocess([], None, None)) == 0
+
+
+class FrameBoxes:
+    """Detector stand-in: returns the given frame-pixel rows, cut to whatever crop it sees."""
+
+    def __init__(self, rows, frame_shape, origin):
+        self.rows = np.array(rows, dtype=np.float32).reshape(-1, 6)
+        self.frame_shape = frame_shape
+        self.origin = origin  # of the crop the test asks for
+        self.calls = []
+
+    def __call__(self, image, imgsz):
+        self.calls.append((image.shape[:2], imgsz))
+        if image.shape[:2] == self.frame_shape:
+            return [result(*self.rows)]
+        x1, y1 = self.origin
+        h, w = image.shape[:2]
+        rows = self.rows.copy()
+        rows[:, [0, 2]] -= x1
+        rows[:, [1, 3]] -= y1
+        inside = (rows[:, 0] >= 0) & (rows[:, 1] >= 0) & (rows[:, 2] <= w) & (rows[:, 3] <= h)
+        return [result(*rows[inside])]
+
+
+@pytest.fixture
+def model(detector, monkeypatch):
+    host = ModelHost()
+    monkeypatch.setattr(object_detection, "get_model_host", lambda: host)
+    holder = {}
+    host.register(detector.model_name, lambda: holder["model"])
+    return holder
+
+
+def test_roi_drops_the_hand_and_falls_back(detector, model):
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    model["model"] = m = FrameBoxes([
+        [300, 300, 360, 380, 0.9, 1],  # the hand, the only box in the crop
+        [20, 20, 80, 80, 0.8, 2],      # a book far from the fingertip
+    ], frame.shape[:2], origin=(250, 200))
+    out = detector.detect_in_roi(frame, (250, 200, 450, 400), imgsz=160, fallback_imgsz=640,
+                                 fingertip=(330, 300), hand_bbox=(300, 300, 360, 380))
+    assert [shape for shape, _ in m.calls] == [(200, 200), (480, 640)]
+    assert out['bbox'].tolist() == [[20, 20, 80, 80]]
+
+
+def test_roi_hit_maps_back_to_frame(detector, model):
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    model["model"] = m = FrameBoxes([
+        [300, 300, 360, 380, 0.9, 1],  # the hand
+        [310, 210, 370, 270, 0.8, 2],  # a book above the fingertip
+    ], frame.shape[:2], origin=(250, 200))
+    out = detector.detect_in_roi(frame, (250, 200, 450, 400), fingertip=(330, 300),
+                                 hand_bbox=(300, 300, 360, 380))
+    assert len(m.calls) == 1
+    assert out['bbox'].tolist() == [[310, 210, 370, 270]]
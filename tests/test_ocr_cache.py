@@ -0,0 +1,98 @@
+import numpy as np
+import pytest
+
+import ocr_cache
+from ocr_cache import CaptureOcr, OcrCache, _cover, _merge, diff_image, dhash, shift_words
+
+
+def word(text, bbox):
+    return {"text": text, "confidence": 0.9, "bbox": bbox}
+
+
+def draw(image, bbox):
+    x0, y0, x1, y1 = bbox
+    image[y0:y1, x0:x1] = 0
+    return image
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Crops handed to the recognizer as (x0, y0, x1, y1) frame boxes; each reads as one word."""
+    crops = []
+
+    def read_words(image, origin=(0, 0), reader=None):
+        x0, y0 = origin
+        box = (x0, y0, x0 + image.shape[1], y0 + image.shape[0])
+        crops.append(box)
+        return [word("new", box)]
+
+    monkeypatch.setattr(ocr_cache, "read_words", read_words)
+    return crops
+
+
+def test_merge_is_transitive():
+    regions = _merge([(0, 0, 10, 10), (20, 0, 30, 10), (8, 0, 22, 10), (50, 50, 60, 60)])
+    assert sorted(regions) == [(0, 0, 30, 10), (50, 50, 60, 60)]
+
+
+def test_cover_grows_over_touched_words_until_stable():
+    # The first region touches word a; grown over it, it reaches region two via word b
+    regions = _cover([(0, 0, 10, 10), (40, 0, 50, 10)], [(8, 2, 20, 8), (18, 2, 42, 8), (70, 0, 80, 10)])
+    assert regions == [(0, 0, 50, 10)]
+
+
+def test_shift_words():
+    words = [word("a", (10, 10, 20, 20))]
+    assert shift_words(words, 0.2, -0.3) == words
+    assert shift_words(words, 5, -5)[0]["bbox"] == (15, 5, 25, 15)
+
+
+def test_cache_hits_a_re_capture_of_the_same_page():
+    page = np.full((480, 640), 255, np.uint8)
+    for i in range(8):
+        draw(page, (40, 40 + 40 * i, 400, 60 + 40 * i))
+    small, _ = diff_image(page)
+    cache = OcrCache()
+    cache.store(dhash(small), small, ["words"])
+    darker = (small * 0.8).astype(np.uint8)  # exposure changes do not count
+    words, shift = cache.lookup(dhash(darker), darker)
+    assert words == ["words"]
+    edited = draw(small.copy(), (420, 40, 600, 60))
+    assert cache.lookup(dhash(edited), edited) is None
+
+
+def test_incremental_recognition_keeps_only_words_outside_every_crop(reads):
+    page = np.full((480, 640), 255, np.uint8)
+    far, near, beside = (50, 50, 100, 65), (352, 200, 400, 215), (420, 200, 470, 215)
+    for bbox in (far, near, beside):
+        draw(page, bbox)
+    ocr = CaptureOcr(incremental=True)
+    small, factor = diff_image(page)
+    previous = [word("far", far), word("near", near), word("beside", beside)]
+    ocr._previous = (small, factor, previous)
+
+    # A new word 12 px left of "near": outside the changed area, inside its padding
+    current = draw(page.copy(), (300, 200, 340, 215))
+    small, factor = diff_image(current)
+    words = ocr._recognize(current, small, factor)
+
+    assert len(reads) == 1
+    crop = reads[0]
+    kept = [w["text"] for w in words if w["text"] != "new"]
+    assert kept == ["far", "beside"]
+    for w in previous:
+        x0, y0, x1, y1 = w["bbox"]
+        overlaps = x0 < crop[2] and crop[0] < x1 and y0 < crop[3] and crop[1] < y1
+        inside = crop[0] <= x0 and crop[1] <= y0 and x1 <= crop[2] and y1 <= crop[3]
+        # Every reused word is outside the crop; every re-read word is wholly inside it
+        assert (w["text"] in kept) != overlaps
+        assert not overlaps or inside
+
+
+def test_unchanged_capture_reuses_every_word(reads):
+    page = draw(np.full((480, 640), 255, np.uint8), (50, 50, 100, 65))
+    ocr = CaptureOcr(incremental=True)
+    small, factor = diff_image(page)
+    ocr._previous = (small, factor, [word("far", (50, 50, 100, 65))])
+    assert [w["text"] for w in ocr._recognize(page, small, factor)] == ["far"]
+    assert reads == []
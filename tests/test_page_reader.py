@@ -0,0 +1,129 @@
+import threading
+import time
+
+import pytest
+
+from common.page_reader import READING_GROUP, PageReader, split_sentences
+from common.page_store import PageStore
+
+
+def test_splits_after_sentence_punctuation():
+    text = "First one. Second?  Third!\nFourth; fifth: sixth"
+    assert split_sentences(text) == ["First one.", "Second?", "Third!", "Fourth;", "fifth:", "sixth"]
+
+
+def test_collapses_whitespace_and_drops_empty_text():
+    assert split_sentences("  a\n\n b\t c  ") == ["a b c"]
+    assert split_sentences("") == []
+    assert split_sentences("   ") == []
+
+
+def test_cuts_run_ons_at_word_boundaries():
+    text = " ".join(["word"] * 30)  # 149 characters, no punctuation
+    chunks = split_sentences(text, max_chars=40)
+    assert all(len(c) <= 40 for c in chunks)
+    assert " ".join(chunks) == text
+    assert all(not c.startswith(" ") and not c.endswith(" ") for c in chunks)
+
+
+def test_cuts_unbroken_text_at_the_limit():
+    assert split_sentences("x" * 25, max_chars=10) == ["x" * 10, "x" * 10, "x" * 5]
+
+
+class Utterance:
+    def __init__(self, text, group):
+        self.text        = text
+        self.group       = group
+        self.cancelled   = False
+        self.interrupted = False
+        self.done        = threading.Event()
+
+    def wait(self, timeout=None):
+        return self.done.wait(timeout)
+
+
+class FakeFeedback:
+    """Speech stand-in: queues utterances until the test finishes them."""
+
+    def __init__(self):
+        self.queued = []
+        self.spoken = []
+        self._lock  = threading.Lock()
+
+    def speak(self, text, priority=None, key=None, max_age=None, group=None):
+        with self._lock:
+            utt = Utterance(text, group)
+            self.spoken.append(text)
+            self.queued.append(utt)
+            return utt
+
+    def cancel_group(self, group):
+        with self._lock:
+            for utt in self.queued:
+                if utt.group == group and not utt.done.is_set():
+                    utt.cancelled = True
+                    utt.done.set()
+            self.queued = [u for u in self.queued if not u.done.is_set()]
+
+    def finish(self):
+        """Play the oldest queued utterance to the end."""
+        with self._lock:
+            utt = self.queued.pop(0)
+        utt.done.set()
+        return utt.text
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert predicate()
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PageStore(str(tmp_path / "pages.db"))
+    yield store
+    store.close()
+
+
+def lines(*texts):
+    return [{"text": t, "confidence": 0.9, "words": []} for t in texts]
+
+
+def test_reads_translated_page(store):
+    store.add_page(lines("Hello there. How are you?"))
+    store.add_page(lines("Second page."))
+    feedback = FakeFeedback()
+
+    def translate(sentences, lang):
+        return [None if s.startswith("How") else f"{lang}:{s}" for s in sentences]
+
+    reader = PageReader(store, feedback, translate=translate)
+    assert reader.read(1, lang="es")
+    wait_for(lambda: len(feedback.spoken) == 2)
+    assert feedback.spoken == ["es:Hello there.", "How are you?"]  # a failed sentence as captured
+    feedback.finish()
+    feedback.finish()
+    # Translated reading stops at the end of the page rather than translating the next one
+    wait_for(lambda: feedback.spoken[-1] == "End of page 1.")
+    assert not reader.reading
+    assert [u.text for u in feedback.queued if u.group == READING_GROUP] == []
+
+
+def test_sentence_cut_off_by_urgent_message_is_read_again(store):
+    store.add_page(lines("One. Two. Three."))
+    feedback = FakeFeedback()
+    reader = PageReader(store, feedback)
+    assert reader.read(1)
+    wait_for(lambda: feedback.spoken == ["One.", "Two."])
+    assert feedback.finish() == "One."
+    wait_for(lambda: feedback.spoken[-1] == "Three.")
+
+    with feedback._lock:
+        cut = feedback.queued.pop(0)  # "Two." is playing when an urgent message barges in
+    cut.interrupted = True
+    cut.done.set()
+    wait_for(lambda: feedback.spoken[-2:] == ["Two.", "Three."] and len(feedback.spoken) == 5)
+    assert reader.bookmark() == (1, 2)
+    reader.stop()
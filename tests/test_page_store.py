@@ -0,0 +1,64 @@
+import pytest
+
+from common.page_store import PageStore
+
+
+def page(*texts):
+    return [{"text": t, "confidence": 0.9,
+             "words": [{"text": w, "confidence": 0.9, "bbox": (i * 10, 0, i * 10 + 8, 10)}
+                       for i, w in enumerate(t.split())]} for t in texts]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = PageStore(str(tmp_path / "pages.db"))
+    yield store
+    store.close()
+
+
+def test_add_numbers_pages_and_keeps_lines(store):
+    assert store.add_page(page("The quick fox", "jumps over")) == 1
+    assert store.add_page(page("Second page")) == 2
+    assert store.count() == 2
+    assert store.page_lines(1) == ["The quick fox", "jumps over"]
+    assert store.page_text(2) == "Second page"
+    assert store.page_text(3) is None
+    assert [w["text"] for w in store.words(1, 1)] == ["The", "quick", "fox"]
+    assert store.words(1, 2)[1]["bbox"] == (10, 0, 18, 10)
+    assert store.page_info(1)["confidence"] == pytest.approx(0.9)
+
+
+def test_search_matches_every_word_by_prefix(store):
+    store.add_page(page("Chapter one", "The library opens at nine"))
+    store.add_page(page("The library closes at five"))
+    hits = store.search("librar clos")
+    assert [(h.page, h.line) for h in hits] == [(2, 1)]
+    assert {h.page for h in store.search("library")} == {1, 2}
+    assert store.search("museum") == []
+    assert store.search("  ") == []
+
+
+def test_meta_is_written_with_the_page(store):
+    store.add_page(page("text"), meta={"bulk:job": 1})
+    assert store.get_meta("bulk:job") == "1"
+    assert store.get_meta("missing", "none") == "none"
+
+
+def test_clear_removes_pages_index_and_meta(store):
+    store.add_page(page("hello world"), meta={"k": "v"})
+    store.clear()
+    assert store.count() == 0
+    assert store.search("hello") == []
+    assert store.get_meta("k") is None
+    assert store.add_page(page("again")) == 1
+
+
+
+def test_delete_pages_only_touches_that_source(store):
+    store.add_page(page("live capture"))
+    store.add_page(page("bulk apple"), source="bulk:a")
+    store.add_page(page("bulk pear"), source="bulk:a")
+    assert store.delete_pages("bulk:a") == 2
+    assert store.count() == 1
+    assert store.search("bulk") == []
+    assert [h.text for h in store.search("live")] == ["live capture"]
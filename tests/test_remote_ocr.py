@@ -0,0 +1,57 @@
+import pytest
+
+import remote_ocr
+from common.inference_client import ServerUnavailable
+from remote_ocr import RemoteOcr
+
+
+class LocalOcr:
+    def __init__(self):
+        self.frames = []
+
+    def extract_lines(self, frame):
+        self.frames.append(frame)
+        return [{"text": "local"}]
+
+
+@pytest.fixture
+def reader(monkeypatch):
+    reader = RemoteOcr(stream="test", local=LocalOcr())
+    reader.asked = []
+
+    def ocr(frame):
+        reader.asked.append(frame)
+        return reader.reply(frame)
+
+    monkeypatch.setattr(reader.client, "ocr", ocr)
+    return reader
+
+
+def test_pages_go_to_the_server(reader):
+    reader.reply = lambda frame: [{"text": "remote"}]
+    assert reader.extract_lines("page") == [{"text": "remote"}]
+    assert reader.local.frames == []
+
+
+def test_dropped_page_is_read_locally(reader):
+    reader.reply = lambda frame: None
+    assert reader.extract_lines("page") == [{"text": "local"}]
+    assert reader.asked == ["page"] and reader.local.frames == ["page"]
+
+
+def test_no_server_falls_back_then_retries(reader, monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr(remote_ocr.time, "monotonic", lambda: clock[0])
+
+    def unavailable(frame):
+        raise ServerUnavailable("no inference server")
+
+    reader.reply = unavailable
+    assert reader.extract_lines("one") == [{"text": "local"}]
+    assert reader.extract_lines("two") == [{"text": "local"}]
+    assert reader.asked == ["one"]  # not asked again until RETRY_AFTER
+
+    clock[0] += remote_ocr.RETRY_AFTER
+    reader.reply = lambda frame: [{"text": "remote"}]
+    assert reader.extract_lines("three") == [{"text": "remote"}]
+    assert reader.asked == ["one", "three"]
@@ -0,0 +1,110 @@
+import numpy as np
+
+from scripts.object_detection import DETECTION_DTYPE
+from scripts.tracker import KeyframeScheduler, ObjectTracker
+
+
+def dets(*rows):
+    """(bbox, label, class_id, confidence) tuples -> DETECTION_DTYPE array."""
+    out = np.empty(len(rows), dtype=DETECTION_DTYPE)
+    for i, (bbox, label, class_id, confidence) in enumerate(rows):
+        out[i] = (bbox, confidence, class_id, label, -1)
+    return out
+
+
+def test_moving_object_keeps_its_track_id():
+    tracker = ObjectTracker()
+    first = tracker.update(dets(((100, 100, 200, 200), "cup", 41, 0.9)))
+    track_id = int(first['track_id'][0])
+    for step in range(1, 5):
+        x = 100 + 10 * step
+        out = tracker.update(dets(((x, 100, x + 100, 200), "cup", 41, 0.9)))
+        assert len(out) == 1 and int(out['track_id'][0]) == track_id
+
+
+def test_tracks_never_swap_classes():
+    tracker = ObjectTracker()
+    tracker.update(dets(((100, 100, 200, 200), "cup", 41, 0.9)))
+    out = tracker.update(dets(((102, 100, 202, 200), "bowl", 45, 0.9)))
+    assert sorted(out['label']) == ["bowl", "cup"]
+    assert len(set(out['track_id'])) == 2
+
+
+def test_each_detection_matches_at_most_one_track():
+    tracker = ObjectTracker()
+    tracker.update(dets(((0, 0, 100, 100), "book", 73, 0.8), ((300, 0, 400, 100), "book", 73, 0.8)))
+    ids = {int(d['track_id']): tuple(d['bbox']) for d in tracker.detections()}
+    out = tracker.update(dets(((305, 0, 405, 100), "book", 73, 0.8), ((5, 0, 105, 100), "book", 73, 0.8)))
+    for d in out:
+        assert abs(int(d['bbox'][0]) - ids[int(d['track_id'])][0]) <= 5
+
+
+def test_unmatched_tracks_coast_then_expire():
+    tracker = ObjectTracker(max_misses=2)
+    tracker.update(dets(((100, 100, 200, 200), "cup", 41, 0.9)))
+    assert len(tracker.update(dets())) == 1
+    assert len(tracker.update(dets())) == 1
+    assert len(tracker.update(dets())) == 0
+
+
+def test_predict_follows_velocity_and_decays_confidence():
+    tracker = ObjectTracker(decay=0.5)
+    tracker.update(dets(((100, 100, 200, 200), "cup", 41, 0.8)))
+    tracker.update(dets(((120, 100, 220, 200), "cup", 41, 0.8)))
+    before = tracker.detections()['bbox'][0].copy()
+    after = tracker.predict()
+    assert after['bbox'][0][0] > before[0]
+    assert after['confidence'][0] == np.float32(0.4)
+
+
+def test_keyframe_scheduler():
+    tracker = ObjectTracker()
+    scheduler = KeyframeScheduler(interval=3, max_age=10.0, min_confidence=0.35, miss_interval=2)
+    assert scheduler.should_detect(tracker, now=1.0)  # first frame
+    tracker.update(dets(((100, 100, 200, 200), "cup", 41, 0.9)))
+    scheduler.mark(True, now=1.0)
+    assert not scheduler.should_detect(tracker, fingertip=(500, 500), now=1.1)  # throttled
+    scheduler.mark(False, now=1.1)
+    scheduler.mark(False, now=1.2)
+    assert not scheduler.should_detect(tracker, fingertip=(150, 150), now=1.2)
+    assert scheduler.should_detect(tracker, fingertip=(500, 500), now=1.2)  # off every box
+    scheduler.mark(False, now=1.3)
+    assert scheduler.should_detect(tracker, fingertip=(150, 150), now=1.3)  # every interval
+    assert scheduler.should_detect(tracker, now=11.5)  # too old
+
+
+def test_keyframe_scheduler_rechecks_empty_scenes_throttled():
+    tracker = ObjectTracker()
+    scheduler = KeyframeScheduler(miss_interval=3)
+    scheduler.mark(True, now=1.0)
+    results = []
+    for i in range(4):
+        results.append(scheduler.should_detect(tracker, now=1.0 + i / 10))
+        scheduler.mark(False, now=1.0 + i / 10)
+    assert results == [False, False, False, True]
+
+
+def test_tracks_outside_the_searched_region_are_not_aged():
+    tracker = ObjectTracker(max_misses=1)
+    tracker.update(dets(((0, 0, 50, 50), "cup", 41, 0.9), ((400, 400, 450, 450), "book", 73, 0.9)))
+    roi = (300, 300, 500, 500)
+    for _ in range(3):
+        out = tracker.update(dets(), region=roi)
+    assert list(out['label']) == ["cup"]  # the book was searched for and missed
+
+    assert len(tracker.update(dets())) == 1
+    assert len(tracker.update(dets())) == 0  # a full-frame miss does age it
+
+
+def test_keyframe_scheduler_full_frame_cadence():
+    tracker = ObjectTracker()
+    scheduler = KeyframeScheduler(full_every=3, min_confidence=0.35)
+    fulls = []
+    for i in range(7):
+        full = scheduler.wants_full_frame(tracker)
+        scheduler.mark(True, now=1.0 + i, full=full)
+        fulls.append(full)
+    assert fulls == [True, False, False, True, False, False, True]
+
+    tracker.update(dets(((0, 0, 50, 50), "cup", 41, 0.2)))  # faded tracks: search everywhere
+    assert scheduler.wants_full_frame(tracker)
@@ -0,0 +1,86 @@
+import pytest
+
+from translator import Backend, FallbackBackend, IdentityBackend, TranslationCache, TranslationService
+
+
+class CountingBackend(Backend):
+    name = "counting"
+
+    def __init__(self):
+        self.batches = []
+
+    def translate_batch(self, sentences, target):
+        self.batches.append(list(sentences))
+        return [f"{target}:{s}" for s in sentences]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = TranslationCache(str(tmp_path / "translations.db"))
+    yield cache
+    cache.close()
+
+
+def test_cached_sentences_are_not_sent_again(cache):
+    backend = CountingBackend()
+    service = TranslationService(backend, cache)
+    assert service.translate("Hello there. How are you?", "hi") == "hi:Hello there. hi:How are you?"
+    assert service.translate("How are you? Fine.", "hi") == "hi:How are you? hi:Fine."
+    assert backend.batches == [["Hello there.", "How are you?"], ["Fine."]]
+
+
+def test_cache_is_per_target_language(cache):
+    backend = CountingBackend()
+    service = TranslationService(backend, cache)
+    service.translate_sentences(["Good morning."], "hi")
+    assert service.translate_sentences(["Good morning."], "ta") == ["ta:Good morning."]
+    assert len(backend.batches) == 2
+    assert cache.lookup(["Good morning.", "Unknown."], "hi") == {"Good morning.": "hi:Good morning."}
+
+
+def test_duplicates_are_translated_once_and_batched(cache):
+    backend = CountingBackend()
+    service = TranslationService(backend, cache, batch_size=2)
+    sentences = ["A.", "B.", "A.", "C."]
+    assert service.translate_sentences(sentences, "hi") == ["hi:A.", "hi:B.", "hi:A.", "hi:C."]
+    assert backend.batches == [["A.", "B."], ["C."]]
+
+
+def test_cache_survives_reopening(tmp_path):
+    path = str(tmp_path / "translations.db")
+    first = TranslationCache(path)
+    TranslationService(CountingBackend(), first).translate_sentences(["Hello."], "hi")
+    first.close()
+    backend = CountingBackend()
+    second = TranslationCache(path)
+    assert TranslationService(backend, second).translate_sentences(["Hello."], "hi") == ["hi:Hello."]
+    assert backend.batches == []
+    second.close()
+
+
+def test_identity_results_are_not_cached(cache):
+    TranslationService(IdentityBackend(), cache).translate_sentences(["Hello."], "hi")
+    assert cache.lookup(["Hello."], "hi") == {}
+
+
+class FlakyBackend(CountingBackend):
+    """Fails on sentences containing "fail", like a per-sentence API error."""
+
+    def translate_batch(self, sentences, target):
+        return [None if "fail" in s else t for s, t in zip(sentences, super().translate_batch(sentences, target))]
+
+
+def test_failed_sentences_are_not_cached(cache):
+    backend = FlakyBackend()
+    service = TranslationService(backend, cache)
+    assert service.translate_sentences(["Good.", "Will fail."], "hi") == ["hi:Good.", None]
+    assert cache.lookup(["Good.", "Will fail."], "hi") == {"Good.": "hi:Good."}
+    assert service.translate("Good. Will fail.", "hi") == "hi:Good. Will fail."
+    assert backend.batches[-1] == ["Will fail."]  # asked again, not served from the cache
+
+
+def test_fallback_retries_failed_sentences():
+    primary, fallback = FlakyBackend(), CountingBackend()
+    backend = FallbackBackend(primary, fallback)
+    assert backend.translate_batch(["Good.", "Will fail."], "hi") == ["hi:Good.", "hi:Will fail."]
+    assert fallback.batches == [["Will fail."]]
@@ -0,0 +1,140 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pyttsx3")
+
+from common import tts
+from common.metrics import get_metrics
+from common.tts import HIGH, LOW, NORMAL, URGENT, SpeechService
+
+WORD_SECONDS = 0.01
+
+
+class FakeEngine:
+    """pyttsx3 stand-in: "speaks" a word per WORD_SECONDS and honours stop()."""
+
+    def __init__(self):
+        self.spoken    = []  # (text, finished)
+        self.started   = threading.Event()
+        self.release   = threading.Event()  # the first utterance holds until set
+        self._queue    = []
+        self._callback = None
+        self._stopped  = False
+
+    def setProperty(self, name, value):
+        pass
+
+    def getProperty(self, name):
+        return "voice"
+
+    def connect(self, name, callback):
+        self._callback = callback
+
+    def say(self, text):
+        self._queue.append(text)
+
+    def stop(self):
+        self._stopped = True
+
+    def runAndWait(self):
+        queue, self._queue, self._stopped = self._queue, [], False
+        for text in queue:
+            first = not self.started.is_set()
+            self.started.set()
+            words, i = text.split(), 0
+            while i < len(words) or (first and not self.release.is_set()):
+                self._callback("started-word", i, 4)
+                if self._stopped:
+                    break
+                time.sleep(WORD_SECONDS)
+                i += 1
+            self.spoken.append((text, not self._stopped))
+
+
+@pytest.fixture
+def service(monkeypatch):
+    engine = FakeEngine()
+    monkeypatch.setattr(tts, "default_cache", lambda: None)
+    monkeypatch.setattr(tts.pyttsx3, "init", lambda: engine)
+    service = SpeechService(max_pending=3)
+    service.engine = engine
+    yield service
+    engine.release.set()
+    service.close()
+
+
+def busy(service):
+    """Start a long utterance and wait until it is playing."""
+    utt = service.speak("hold " * 20)
+    assert service.engine.started.wait(2)
+    return utt
+
+
+def texts(service):
+    return [text for text, _ in service.engine.spoken]
+
+
+def test_higher_priority_is_spoken_first(service):
+    busy(service)
+    service.speak("low", LOW)
+    service.speak("normal", NORMAL)
+    last = service.speak("high", HIGH)
+    service.engine.release.set()
+    assert service.flush(5)
+    assert texts(service)[1:] == ["high", "normal", "low"]
+    assert last.done.is_set()
+
+
+def test_same_key_keeps_only_the_latest(service):
+    busy(service)
+    first = service.speak("cup", key="label")
+    second = service.speak("book", key="label")
+    assert first.cancelled and not second.cancelled
+    service.engine.release.set()
+    assert service.flush(5)
+    assert texts(service)[1:] == ["book"]
+
+
+def test_urgent_barges_in(service):
+    barge_ins = get_metrics().counter("tts.barge_in").value
+    playing = busy(service)
+    service.speak("queued")
+    service.speak("urgent", URGENT)
+    assert service.flush(5)
+    assert service.engine.spoken[0] == (playing.text, False)  # cut off
+    assert playing.interrupted
+    assert texts(service)[1:] == ["urgent", "queued"]
+    assert get_metrics().counter("tts.barge_in").value == barge_ins + 1
+
+
+def test_full_queue_evicts_less_important_or_rejects(service):
+    busy(service)
+    kept = [service.speak(f"normal {i}") for i in range(3)]
+    assert service.speak("another normal") is None
+    assert service.speak("high", HIGH) is not None
+    assert kept[-1].cancelled  # newest of the least important goes first
+    service.engine.release.set()
+    assert service.flush(5)
+    assert texts(service)[1:] == ["high", "normal 0", "normal 1"]
+
+
+def test_stale_utterances_are_dropped(service):
+    busy(service)
+    stale = service.speak("stale", max_age=0.01)
+    time.sleep(0.05)
+    service.engine.release.set()
+    assert service.flush(5)
+    assert stale.cancelled and "stale" not in texts(service)
+
+
+def test_cancel_group_cuts_the_playing_one(service):
+    playing = service.speak("hold " * 20, group="page")
+    assert service.engine.started.wait(2)
+    pending = service.speak("next sentence", group="page")
+    service.cancel_group("page")
+    assert service.flush(5)
+    assert pending.cancelled
+    assert service.engine.spoken == [(playing.text, False)]
+    assert not playing.interrupted  # cancelled on purpose, not to be repeated
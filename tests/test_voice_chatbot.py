@@ -0,0 +1,94 @@
+import queue
+import time
+import types
+
+import pytest
+
+pytest.importorskip("speech_recognition")
+
+from chatbot import voice_chatbot
+from chatbot.grammar import CommandGrammar
+from chatbot.voice_chatbot import (SPEECH_AUDIO, SPEECH_END, SPEECH_START, CommandListener)
+from common.metrics import get_metrics
+
+
+class ScriptedRecognizer:
+    """Partial hypotheses in order, one per chunk; ``finish`` returns the last."""
+
+    def __init__(self, partials, streaming=True):
+        self.partials  = list(partials)
+        self.streaming = streaming
+        self.grammar   = CommandGrammar() if streaming else None
+        self.heard     = None
+
+    def start(self, sample_rate, sample_width):
+        self.heard = None
+
+    def accept(self, chunk):
+        self.heard = self.partials.pop(0)
+        return self.heard if self.streaming else None
+
+    def finish(self):
+        return self.heard
+
+
+def listener_for(recognizer):
+    stream = types.SimpleNamespace(events=queue.Queue())
+    return stream, CommandListener(stream, recognizer)
+
+
+def speak(stream, chunks, end_at):
+    stream.events.put((SPEECH_START, (16000, 2), time.monotonic()))
+    for _ in range(chunks):
+        stream.events.put((SPEECH_AUDIO, b"\0\0", time.monotonic()))
+    stream.events.put((SPEECH_END, None, end_at))
+
+
+def test_early_dispatch_is_timed_from_the_end_of_speech():
+    timer = get_metrics().timer("voice.dispatch_delay")
+    seen = timer.count
+    stream, listener = listener_for(ScriptedRecognizer(["capture", "capture", "capture"]))
+    end_at = time.monotonic() + 0.5  # the speaker trails on after the command is complete
+    speak(stream, 3, end_at)
+    assert listener.commands.get(timeout=2) == "capture"
+    deadline = time.monotonic() + 2
+    while timer.count == seen and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert timer.count == seen + 1
+    assert timer.recent(1)[0] < 0  # ahead of the end of the utterance
+    assert listener.commands.empty()  # dispatched once
+
+
+def test_dispatch_at_end_of_speech():
+    timer = get_metrics().timer("voice.dispatch_delay")
+    stream, listener = listener_for(ScriptedRecognizer(["stop", "stop all"], streaming=False))
+    speak(stream, 2, time.monotonic())
+    assert listener.commands.get(timeout=2) == "stop all"
+    time.sleep(0.05)
+    assert timer.recent(1)[0] >= 0
+
+
+def test_microphone_error_reopens_only_the_stream(monkeypatch):
+    made = []
+
+    class FakeStream:
+        def __init__(self, device_index, phrase_limit):
+            self.events, self.error, self.reopened = queue.Queue(), None, 0
+            made.append(self)
+
+        def reopen(self):
+            self.error = None
+            self.reopened += 1
+
+    recognizers = []
+    monkeypatch.setattr(voice_chatbot, "MicrophoneStream", FakeStream)
+    monkeypatch.setattr(voice_chatbot, "create_recognizer",
+                        lambda: recognizers.append(ScriptedRecognizer([])) or recognizers[-1])
+    monkeypatch.setattr(voice_chatbot, "_stream", None)
+    monkeypatch.setattr(voice_chatbot, "_listener", None)
+
+    listener = voice_chatbot.get_command_listener()
+    made[0].error = OSError("device unplugged")
+    assert voice_chatbot.get_command_listener() is listener
+    assert len(made) == 1 and made[0].reopened == 1
+    assert len(recognizers) == 1  # the recognizer (a loaded model) is kept